@@ -0,0 +1 @@
+"""Offline benchmark suite with a synthetic corpus and local stand-ins"""
@@ -0,0 +1,109 @@
+"""Deterministic synthetic Confluence corpus with labeled queries
+
+Every page covers one topic for one service. Service names are shared by
+several topics and topic vocabulary by many services, so a query has to
+match both to find its page. Each page also mentions a contact team and a
+ticket code only in its body, used for harder queries that the title
+cannot answer.
+"""
+
+import random
+from dataclasses import dataclass
+
+from docs_chatter.confluence.client import ConfluencePage
+
+TOPICS = {
+    "휴가": ["연차", "반차", "휴가 신청서", "승인권자", "잔여 일수", "대체 휴무", "병가", "경조사 휴가"],
+    "배포": ["릴리스 브랜치", "카나리", "롤백", "배포 승인", "스테이징", "헬스 체크", "배포 창구", "핫픽스"],
+    "온보딩": ["입사 첫 주", "계정 발급", "멘토", "교육 과정", "장비 수령", "사내 위키", "보안 서약", "조직 소개"],
+    "보안": ["접근 권한", "비밀번호 정책", "취약점 점검", "보안 사고", "암호화", "감사 로그", "VPN", "2단계 인증"],
+    "장애 대응": ["온콜", "장애 등급", "포스트모템", "알림 채널", "에스컬레이션", "복구 목표 시간", "상황실", "영향 범위"],
+    "비용": ["클라우드 비용", "예산 승인", "비용 태그", "예약 인스턴스", "월간 리포트", "비용 알림", "청구서", "절감 계획"],
+    "데이터": ["데이터 보존", "백업 주기", "스키마 변경", "개인정보 마스킹", "데이터 카탈로그", "적재 파이프라인", "품질 검사", "접근 요청"],
+    "모니터링": ["대시보드", "지표 수집", "로그 검색", "트레이싱", "SLO", "경보 임계치", "용량 계획", "가용성"],
+}
+
+SYLLABLES_A = ["가람", "나래", "다온", "라온", "마루", "바다", "새벽", "아라", "초롱", "하늘", "한울", "누리"]
+SYLLABLES_B = ["페이", "톡", "북", "링크", "허브", "스토어", "맵", "캐시", "박스", "노트"]
+TEAMS = ["플랫폼팀", "결제팀", "인프라팀", "데이터팀", "보안팀", "모바일팀", "검색팀", "운영팀", "인사팀", "재무팀"]
+
+FILLER = [
+    "자세한 내용은 아래 절차를 따릅니다.",
+    "변경 사항은 매 분기 검토합니다.",
+    "문의 사항은 담당 채널에 남겨주세요.",
+    "예외가 필요한 경우 사전에 협의합니다.",
+    "관련 양식은 사내 위키에서 받을 수 있습니다.",
+]
+
+
+@dataclass
+class LabeledQuery:
+    """A question and the ids of pages that answer it"""
+
+    query: str
+    relevant: list[str]
+    kind: str  # "title" or "body"
+
+
+def build_corpus(pages: int = 500, space_keys: tuple[str, ...] = ("BENCH",), seed: int = 0):
+    """Generate pages and labeled queries
+
+    Returns:
+        Tuple of (pages, queries)
+    """
+    rng = random.Random(seed)
+    services = [f"{a}{b}" for a in SYLLABLES_A for b in SYLLABLES_B]
+    rng.shuffle(services)
+    topics = list(TOPICS)
+    codes = rng.sample(range(10000, 100000), pages)
+
+    corpus: list[ConfluencePage] = []
+    queries: list[LabeledQuery] = []
+    subjects: dict[tuple[str, str], list[str]] = {}
+    for i in range(pages):
+        space_key = space_keys[i % len(space_keys)]
+        # Each service appears under several topics
+        service = services[i // len(topics) % len(services)]
+        topic = topics[i % len(topics)]
+        # Distinct pages per (service, topic) once services wrap around
+        edition = i // (len(topics) * len(services))
+        page_id = f"{space_key.lower()}-{i}"
+        team = rng.choice(TEAMS)
+        code = f"{topic[:1]}{codes[i]}"
+        title = f"{service} {topic} 안내" + (f" {edition + 1}판" if edition else "")
+
+        paragraphs = []
+        fact_at = rng.randrange(2, 8)
+        for j in range(rng.randrange(fact_at + 1, 14)):
+            terms = rng.sample(TOPICS[topic], 3)
+            sentence = (
+                f"{service} 서비스의 {terms[0]} 기준은 {terms[1]}와 함께 확인하며, "
+                f"{terms[2]} 관련 요청은 {topic} 담당자가 처리합니다. {rng.choice(FILLER)}"
+            )
+            if j == fact_at:
+                sentence += f" {service} {topic} 문의는 {team}에서 받으며 요청 코드는 {code}입니다."
+            paragraphs.append(sentence)
+
+        html = f"<h1>{title}</h1>" + "".join(f"<p>{p}</p>" for p in paragraphs)
+        corpus.append(
+            ConfluencePage(
+                id=page_id,
+                title=title,
+                space_key=space_key,
+                url=f"https://bench.example.com/wiki/{page_id}",
+                html_content=html,
+                last_modified=f"2024-01-{1 + i % 28:02d}T00:00:00.000Z",
+                author="Benchmark",
+                version=1,
+            )
+        )
+
+        subjects.setdefault((service, topic), []).append(page_id)
+        queries.append(LabeledQuery(f"요청 코드 {code}는 어느 팀에 문의하나요?", [page_id], "body"))
+
+    for (service, topic), page_ids in subjects.items():
+        term = rng.choice(TOPICS[topic])
+        queries.append(LabeledQuery(f"{service}의 {term} 절차가 궁금합니다", page_ids, "title"))
+
+    rng.shuffle(queries)
+    return corpus, queries
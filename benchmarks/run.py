@@ -0,0 +1,346 @@
+#!/usr/bin/env python
+"""Offline benchmark suite: indexing throughput, query latency and retrieval quality
+
+Indexes a synthetic labeled corpus (benchmarks/corpus.py) with BatchIndexer
+into an in-memory OpenSearch stand-in (or, with --store embedded, the
+embedded vector store in a temporary directory), using hashing embeddings and
+the fake LLM server (benchmarks/stack.py), so no external service is needed.
+Then:
+
+- retrieval: recall@k and MRR of HybridRetriever, before and after the
+  lexical reranker, over the labeled queries
+- query: RAGChain.aquery latency percentiles at each concurrency level
+
+Results are written as JSON. --compare prints every metric against an
+earlier report and marks changes beyond --tolerance in the wrong direction.
+
+    python benchmarks/run.py --pages 500 --output bench.json
+    python benchmarks/run.py --pages 500 --compare bench.json --fail-on-regression
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "src"), str(ROOT)]
+
+# Required settings; the stand-ins never use them. Subprocesses inherit these.
+for name in (
+    "CONFLUENCE_URL",
+    "CONFLUENCE_USERNAME",
+    "CONFLUENCE_API_TOKEN",
+    "CONFLUENCE_SPACE_KEYS",
+    "COHERE_API_KEY",
+    "ANTHROPIC_API_KEY",
+    "SLACK_BOT_TOKEN",
+    "SLACK_APP_TOKEN",
+    "SLACK_SIGNING_SECRET",
+):
+    os.environ.setdefault(name, "offline")
+
+from docs_chatter.config import settings
+
+# Metric name endings where a smaller value is better
+LOWER_IS_BETTER = ("_ms", "_seconds", "_mb")
+# Metric name parts where a larger value is better; other metrics are informational
+HIGHER_IS_BETTER = ("recall@", "mrr", "_per_second", "_qps")
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+def max_rss_mb() -> float:
+    """Peak resident set size of this process"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def bench_indexing(pages, store, embeddings, pipeline: bool, rebuild: bool = False) -> dict:
+    """Index the corpus with BatchIndexer and report throughput"""
+    from benchmarks.stack import CorpusFetcher, attach
+    from docs_chatter.batch.indexer import BatchIndexer
+
+    indexer = BatchIndexer(pipeline=pipeline)
+    attach(indexer.store, store, embeddings)
+    indexer.confluence = indexer.fetcher = CorpusFetcher(pages)
+
+    rss_before = max_rss_mb()
+    start = time.perf_counter()
+    stats = indexer.run_rebuild_index() if rebuild else indexer.run_full_index()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "mode": "pipeline" if pipeline else "sequential",
+        "rebuild": rebuild,
+        "pages": stats["pages_processed"],
+        "chunks": stats["chunks_indexed"],
+        "errors": stats["errors"],
+        "elapsed_seconds": elapsed,
+        "pages_per_second": stats["pages_processed"] / elapsed,
+        "chunks_per_second": stats["chunks_indexed"] / elapsed,
+        "embed_requests": stats.get("embed_requests", 0),
+        "bulk_requests": stats.get("bulk_requests", 0),
+        # Includes the in-memory index itself
+        "max_rss_mb": max_rss_mb(),
+        "rss_growth_mb": max_rss_mb() - rss_before,
+    }
+
+
+def ranking_metrics(rankings: list[tuple[list[str], list[str]]], ks: list[int]) -> dict:
+    """Mean recall@k and MRR of (ranked page ids, relevant page ids) pairs"""
+    result = {}
+    for k in ks:
+        result[f"recall@{k}"] = statistics.fmean(
+            len(set(ranked[:k]) & set(relevant)) / len(relevant) for ranked, relevant in rankings
+        )
+    result["mrr"] = statistics.fmean(
+        next((1 / rank for rank, page_id in enumerate(ranked, 1) if page_id in relevant), 0.0)
+        for ranked, relevant in rankings
+    )
+    return result
+
+
+def bench_retrieval(queries, store, embeddings, ks: list[int]) -> dict:
+    """Recall@k and MRR of the retriever and the reranked candidates"""
+    from benchmarks.stack import attach
+    from docs_chatter.rag.reranker import LexicalReranker
+    from docs_chatter.rag.retriever import HybridRetriever
+
+    retriever = HybridRetriever()
+    attach(retriever.store, store, embeddings)
+    reranker = LexicalReranker()
+
+    retrieved, reranked, latencies = {}, {}, []
+    for query in queries:
+        start = time.perf_counter()
+        pages = retriever.retrieve(query.query)
+        latencies.append((time.perf_counter() - start) * 1000)
+        retrieved.setdefault(query.kind, []).append(
+            ([page["page_id"] for page in pages], query.relevant)
+        )
+        reranked.setdefault(query.kind, []).append(
+            ([page["page_id"] for page in reranker.rerank(query.query, pages)], query.relevant)
+        )
+
+    report = {
+        "queries": len(queries),
+        "latency_p50_ms": percentile(latencies, 0.5),
+        "latency_p95_ms": percentile(latencies, 0.95),
+    }
+    for name, rankings in (("retriever", retrieved), ("reranked", reranked)):
+        report[name] = ranking_metrics(sum(rankings.values(), []), ks)
+        for kind, kind_rankings in sorted(rankings.items()):
+            report[name][kind] = ranking_metrics(kind_rankings, ks)
+    return report
+
+
+async def bench_query(queries, store, embeddings, levels: list[int], questions: int) -> dict:
+    """RAGChain.aquery latency percentiles and throughput per concurrency level"""
+    from benchmarks.stack import attach
+    from docs_chatter.rag.chain import RAGChain
+
+    chain = RAGChain()
+    vector_store = chain.retriever.store
+    attach(vector_store, store, embeddings)
+    chain.relevance_evaluator.cache = None
+    chain.answer_cache = None
+
+    report = {}
+    offset = 0
+    for level in levels:
+        # Fresh questions and caches so levels do not warm each other up
+        batch = [queries[(offset + i) % len(queries)].query for i in range(questions)]
+        offset += questions
+        vector_store.search_cache.clear()
+        vector_store.embeddings.query_cache.clear()
+
+        semaphore = asyncio.Semaphore(level)
+        latencies: list[float] = []
+        stages: dict[str, list[float]] = {}
+
+        async def ask(query: str):
+            async with semaphore:
+                start = time.perf_counter()
+                result = await chain.aquery(query)
+                latencies.append((time.perf_counter() - start) * 1000)
+                for name, stage in result.get("trace", {}).get("stages", {}).items():
+                    stages.setdefault(name, []).append(stage["seconds"] * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(ask(query) for query in batch))
+        elapsed = time.perf_counter() - start
+
+        report[f"concurrency_{level}"] = {
+            "questions": len(batch),
+            "p50_ms": percentile(latencies, 0.5),
+            "p95_ms": percentile(latencies, 0.95),
+            "p99_ms": percentile(latencies, 0.99),
+            "mean_ms": statistics.fmean(latencies),
+            "throughput_qps": len(batch) / elapsed,
+            "stage_mean_ms": {name: statistics.fmean(values) for name, values in stages.items()},
+        }
+    return report
+
+
+def flatten(report: dict, prefix: str = "") -> dict[str, float]:
+    """Numeric leaves of a report keyed by dotted path"""
+    values = {}
+    for key, value in report.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            values.update(flatten(value, f"{path}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[path] = value
+    return values
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    """Print each metric against the baseline and return regressed metric names"""
+    old = flatten({k: v for k, v in baseline.items() if k != "meta"})
+    new = flatten({k: v for k, v in current.items() if k != "meta"})
+    regressions = []
+
+    print(f"\n{'metric':<60} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name in sorted(old.keys() & new.keys()):
+        before, after = old[name], new[name]
+        change = (after - before) / abs(before) if before else 0.0
+        if name.endswith(LOWER_IS_BETTER):
+            worse = change
+        elif any(marker in name for marker in HIGHER_IS_BETTER):
+            worse = -change
+        else:
+            worse = 0.0
+        flag = ""
+        if worse > tolerance:
+            flag = "  WORSE"
+            regressions.append(name)
+        print(f"{name:<60} {before:>12.4g} {after:>12.4g} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument("--pages", type=int, default=500, help="Synthetic corpus size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--suites",
+        default="retrieval,query",
+        help="Comma-separated suites to run after indexing: retrieval, query",
+    )
+    parser.add_argument("--pipeline", action="store_true", help="Index in pipelined mode")
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Index with a blue/green rebuild into a new index version",
+    )
+    parser.add_argument(
+        "--store",
+        choices=["memory", "embedded"],
+        default="memory",
+        help="In-memory OpenSearch stand-in or the embedded vector store",
+    )
+    parser.add_argument("--embed-latency", type=float, default=0.0, help="Seconds per embed request")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Seconds per LLM request")
+    parser.add_argument("--k", default="1,5,10", help="Comma-separated k for recall@k")
+    parser.add_argument("--queries", type=int, default=300, help="Labeled queries to evaluate")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--questions", type=int, default=32, help="Questions per concurrency level")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed relative change")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    suites = {suite.strip() for suite in args.suites.split(",") if suite.strip()}
+
+    from benchmarks.corpus import build_corpus
+    from benchmarks.stack import HashingEmbeddings, InMemoryOpenSearch, start_fake_llm
+
+    # Measure the code, not local caches left over from earlier runs
+    settings.embedding_cache_path = ""
+    settings.index_manifest_path = ""
+    settings.relevance_cache_path = ""
+    settings.cache_backend = "memory"
+    settings.anthropic_base_url = start_fake_llm(args.llm_latency)
+    if args.store == "embedded":
+        settings.vector_store = "embedded"
+        settings.embedded_store_path = tempfile.mkdtemp(prefix="docs-chatter-bench-")
+
+    pages, queries = build_corpus(args.pages, seed=args.seed)
+    queries = queries[: args.queries]
+    store = InMemoryOpenSearch()
+    embeddings = HashingEmbeddings(latency=args.embed_latency)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "args": vars(args),
+        }
+    }
+
+    print(f"Indexing {len(pages)} pages...")
+    report["indexing"] = bench_indexing(pages, store, embeddings, args.pipeline, args.rebuild)
+    print(json.dumps(report["indexing"], indent=2))
+
+    if "retrieval" in suites:
+        print(f"Evaluating retrieval on {len(queries)} queries...")
+        ks = [int(k) for k in args.k.split(",")]
+        report["retrieval"] = bench_retrieval(queries, store, embeddings, ks)
+        print(json.dumps(report["retrieval"], indent=2))
+
+    if "query" in suites:
+        levels = [int(level) for level in args.concurrency.split(",")]
+        print(f"Measuring RAG query latency at concurrency {levels}...")
+        report["query"] = asyncio.run(
+            bench_query(queries, store, embeddings, levels, args.questions)
+        )
+        print(json.dumps(report["query"], indent=2))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        print(f"Report written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(baseline, report, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} metrics regressed beyond {args.tolerance:.0%}")
+            if args.fail_on_regression:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,470 @@
+"""In-process stand-ins for OpenSearch, Cohere, Confluence and Anthropic
+
+They implement just enough of each client for the indexer, retriever and
+RAG chain to run unchanged and offline. Results are deterministic, so
+reports from different runs are comparable.
+"""
+
+import json
+import math
+import threading
+import time
+import zlib
+from collections import Counter
+from collections.abc import Iterator
+from fnmatch import fnmatch
+from http.server import ThreadingHTTPServer
+
+import numpy as np
+from opensearchpy import NotFoundError
+
+from docs_chatter.confluence.client import ConfluencePage
+from docs_chatter.rag.reranker import tokenize
+from docs_chatter.vectorstore.base import VectorStore
+from docs_chatter.vectorstore.fusion import fuse
+from docs_chatter.vectorstore.opensearch import OpenSearchClient
+
+# Fields searched by multi_match queries
+TEXT_FIELDS = ("title", "content")
+
+
+class HashingEmbeddings:
+    """Deterministic bag-of-tokens embeddings standing in for Cohere
+
+    Tokens (words and character bigrams) are hashed into a fixed number of
+    signed buckets, so texts sharing words get similar vectors.
+    """
+
+    def __init__(self, dimension: int = 1024, latency: float = 0.0):
+        self.dimension = dimension
+        self.latency = latency  # seconds per request, to mimic the API round trip
+        self.requests = 0
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.requests += 1
+        time.sleep(self.latency)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        self.requests += 1
+        time.sleep(self.latency)
+        return self._embed(text)
+
+    def _embed(self, text: str) -> list[float]:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for token, count in Counter(tokenize(text)).items():
+            h = zlib.crc32(token.encode("utf-8"))
+            sign = 1.0 if h & 0x80000000 else -1.0
+            vector[h % self.dimension] += sign * (1.0 + math.log(count))
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+
+class CorpusFetcher:
+    """Page source for BatchIndexer serving a prepared corpus"""
+
+    def __init__(self, pages: list[ConfluencePage]):
+        self.pages = pages
+
+    def iter_all_pages(self) -> Iterator[ConfluencePage]:
+        yield from self.pages
+
+    def iter_updated_pages(self, since: str) -> Iterator[ConfluencePage]:
+        for page in self.pages:
+            if page.last_modified >= since:
+                yield page
+
+
+class _Index:
+    """Documents of one index with a BM25 inverted index and a vector matrix"""
+
+    def __init__(self, body: dict):
+        self.mappings = dict(body.get("mappings", {}))
+        self.docs: dict[str, dict] = {}
+        self.postings: dict[str, dict[str, int]] = {}
+        self.lengths: dict[str, int] = {}
+        self._ids: list[str] = []
+        self._matrix: np.ndarray | None = None
+
+    def put(self, doc_id: str, source: dict) -> None:
+        self.remove(doc_id)
+        self.docs[doc_id] = source
+        tokens = tokenize(" ".join(str(source.get(field, "")) for field in TEXT_FIELDS))
+        for token, count in Counter(tokens).items():
+            self.postings.setdefault(token, {})[doc_id] = count
+        self.lengths[doc_id] = len(tokens)
+        self._matrix = None
+
+    def remove(self, doc_id: str) -> bool:
+        source = self.docs.pop(doc_id, None)
+        if source is None:
+            return False
+        tokens = tokenize(" ".join(str(source.get(field, "")) for field in TEXT_FIELDS))
+        for token in set(tokens):
+            postings = self.postings.get(token)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self.postings[token]
+        self.lengths.pop(doc_id, None)
+        self._matrix = None
+        return True
+
+    def bm25(self, query: str, k1: float = 1.2, b: float = 0.75) -> dict[str, float]:
+        if not self.docs:
+            return {}
+        average = sum(self.lengths.values()) / len(self.lengths) or 1.0
+        scores: dict[str, float] = {}
+        for term in dict.fromkeys(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (len(self.docs) - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                norm = k1 * (1 - b + b * self.lengths[doc_id] / average)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+        return scores
+
+    def knn(self, field: str, vector: list[float], k: int) -> dict[str, float]:
+        """Exact nearest neighbours scored like OpenSearch's l2 space: 1 / (1 + d^2)"""
+        if self._matrix is None:
+            self._ids = [doc_id for doc_id, doc in self.docs.items() if field in doc]
+            self._matrix = np.array(
+                [self.docs[doc_id][field] for doc_id in self._ids], dtype=np.float32
+            ).reshape(len(self._ids), -1)
+        if not self._ids:
+            return {}
+        distances = ((self._matrix - np.asarray(vector, dtype=np.float32)) ** 2).sum(axis=1)
+        top = np.argsort(distances)[:k]
+        return {self._ids[i]: float(1 / (1 + distances[i])) for i in top}
+
+
+class _Indices:
+    def __init__(self, store: "InMemoryOpenSearch"):
+        self.store = store
+
+    def exists(self, index: str) -> bool:
+        return index in self.store.indexes or index in self.store.aliases
+
+    def create(self, index: str, body: dict | None = None):
+        self.store.indexes[index] = _Index(body or {})
+        return {"acknowledged": True, "index": index}
+
+    def get(self, index: str, **kwargs):
+        names = []
+        for pattern in index.split(","):
+            if "*" in pattern:
+                names.extend(name for name in self.store.indexes if fnmatch(name, pattern))
+            else:
+                names.append(self.store.resolve(pattern))
+        return {name: {"mappings": self.store.get(name).mappings} for name in names}
+
+    def delete(self, index: str, **kwargs):
+        for name in index.split(","):
+            self.store.indexes.pop(name, None)
+            self.store.aliases = {
+                alias: target for alias, target in self.store.aliases.items() if target != name
+            }
+        return {"acknowledged": True}
+
+    def refresh(self, index: str | None = None):
+        # Writes are searchable immediately
+        return {}
+
+    def get_mapping(self, index: str):
+        return self.get(index)
+
+    def put_mapping(self, index: str, body: dict):
+        self.store.get(index).mappings.update(body)
+        return {"acknowledged": True}
+
+    def put_settings(self, index: str, body: dict):
+        return {"acknowledged": True}
+
+    def forcemerge(self, index: str, **kwargs):
+        return {"_shards": {"failed": 0}}
+
+    def get_index_template(self, name: str):
+        if name not in self.store.templates:
+            raise NotFoundError(404, "resource_not_found_exception", {"name": name})
+        return {"index_templates": [{"name": name, "index_template": self.store.templates[name]}]}
+
+    def put_index_template(self, name: str, body: dict):
+        self.store.templates[name] = body
+        return {"acknowledged": True}
+
+    def update_aliases(self, body: dict):
+        with self.store._lock:
+            for action in body["actions"]:
+                op, params = next(iter(action.items()))
+                if op == "add":
+                    self.store.aliases[params["alias"]] = params["index"]
+                elif op == "remove":
+                    self.store.aliases.pop(params["alias"], None)
+                else:
+                    self.delete(params["index"])
+        return {"acknowledged": True}
+
+
+class _SearchPipelines:
+    def __init__(self, store: "InMemoryOpenSearch"):
+        self.store = store
+
+    def put(self, id: str, body: dict):
+        self.store.pipelines[id] = body
+        return {"acknowledged": True}
+
+
+class InMemoryOpenSearch:
+    """Stand-in for the opensearch-py client used by OpenSearchClient
+
+    Supports the index, alias, template, bulk, get and search calls the project makes,
+    one at a time under a lock. Hybrid queries are fused as the search pipeline
+    asks (normalization or RRF), and without one min-max normalize the
+    lexical (BM25) and k-NN scores and average them.
+    """
+
+    def __init__(self):
+        self.indexes: dict[str, _Index] = {}
+        self.aliases: dict[str, str] = {}
+        self.pipelines: dict[str, dict] = {}
+        self.templates: dict[str, dict] = {}
+        self.indices = _Indices(self)
+        self.search_pipeline = _SearchPipelines(self)
+        self.requests = Counter()
+        self._lock = threading.RLock()
+
+    def resolve(self, index: str) -> str:
+        return self.aliases.get(index, index)
+
+    def get(self, index: str) -> _Index:
+        index = self.resolve(index)
+        if index not in self.indexes:
+            raise NotFoundError(404, "index_not_found_exception", {"index": index})
+        return self.indexes[index]
+
+    def count(self, index: str, **kwargs):
+        with self._lock:
+            return {"count": len(self.get(index).docs)}
+
+    def bulk(self, body, refresh: bool = False, **kwargs):
+        with self._lock:
+            return self._bulk(body)
+
+    def _bulk(self, body):
+        self.requests["bulk"] += 1
+        lines = (
+            [json.loads(line) for line in body.splitlines() if line.strip()]
+            if isinstance(body, str)
+            else list(body)
+        )
+        items = []
+        i = 0
+        while i < len(lines):
+            op, meta = next(iter(lines[i].items()))
+            index = self.indexes.setdefault(self.resolve(meta["_index"]), _Index({}))
+            if op == "delete":
+                found = index.remove(meta["_id"])
+                items.append({op: {"_id": meta["_id"], "status": 200 if found else 404}})
+                i += 1
+                continue
+
+            document = lines[i + 1]
+            i += 2
+            if op == "update":
+                if meta["_id"] not in index.docs:
+                    items.append(
+                        {op: {"status": 404, "error": {"type": "document_missing_exception"}}}
+                    )
+                    continue
+                index.put(meta["_id"], {**index.docs[meta["_id"]], **document["doc"]})
+                items.append({op: {"_id": meta["_id"], "status": 200}})
+            else:
+                index.put(meta["_id"], document)
+                items.append({op: {"_id": meta["_id"], "status": 201}})
+
+        return {"errors": any("error" in item[next(iter(item))] for item in items), "items": items}
+
+    def delete(self, index: str, id: str, ignore=None, **kwargs):
+        with self._lock:
+            found = self.get(index).remove(id)
+        if not found and 404 not in (ignore or []):
+            raise NotFoundError(404, "not_found", {"_id": id})
+        return {"result": "deleted"}
+
+    def delete_by_query(self, index: str, body: dict, **kwargs):
+        with self._lock:
+            self.requests["delete_by_query"] += 1
+            target = self.get(index)
+            matched = [
+                doc_id for doc_id, doc in target.docs.items() if self._matches(doc, body["query"])
+            ]
+            for doc_id in matched:
+                target.remove(doc_id)
+        return {"deleted": len(matched)}
+
+    def mget(self, index: str, body: dict, **kwargs):
+        with self._lock:
+            return self._mget(index, body)
+
+    def _mget(self, index: str, body: dict):
+        self.requests["mget"] += 1
+        target = self.get(index)
+        requests = body.get("docs") or [{"_id": doc_id} for doc_id in body["ids"]]
+        docs = []
+        for request in requests:
+            source = target.docs.get(request["_id"])
+            if source is None:
+                docs.append({"_id": request["_id"], "found": False})
+                continue
+            docs.append(
+                {
+                    "_id": request["_id"],
+                    "found": True,
+                    "_source": self._select(source, request.get("_source")),
+                }
+            )
+        return {"docs": docs}
+
+    def search(self, index: str, body: dict, search_pipeline: str | None = None, **kwargs):
+        with self._lock:
+            self.requests["search"] += 1
+            pipeline = self.pipelines.get(search_pipeline) if search_pipeline else None
+            return self._search(index, body, kwargs.get("size", 10), pipeline)
+
+    def msearch(self, body: list[dict], **kwargs):
+        with self._lock:
+            self.requests["msearch"] += 1
+            responses = []
+            for header, request in zip(body[::2], body[1::2]):
+                try:
+                    responses.append(self._search(header["index"], request, 10))
+                except Exception as e:
+                    responses.append({"error": {"type": type(e).__name__, "reason": str(e)}})
+            return {"responses": responses}
+
+    def _search(self, index: str, body: dict, default_size: int, pipeline: dict | None = None):
+        target = self.get(index)
+        query = body.get("query", {"match_all": {}})
+        size = body.get("size", default_size)
+
+        if "hybrid" in query:
+            # Each sub-query contributes its top hits, as in OpenSearch
+            results = []
+            for sub_query in query["hybrid"]["queries"]:
+                sub_scores = self._score(target, sub_query)
+                top = sorted(sub_scores, key=sub_scores.get, reverse=True)[:size]
+                results.append({doc_id: sub_scores[doc_id] for doc_id in top})
+            if pipeline:
+                scores = self._pipeline_combine(results, pipeline)
+            else:
+                scores = self._combine(results)
+        elif "knn" in query or "multi_match" in query:
+            scores = self._score(target, query)
+        else:
+            # Filters (term/terms/match_all); scans return every match at once
+            scores = {doc_id: 1.0 for doc_id, doc in target.docs.items() if self._matches(doc, query)}
+            size = len(scores)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:size]
+        hits = [
+            {
+                "_index": index,
+                "_id": doc_id,
+                "_score": score,
+                "_source": self._select(target.docs[doc_id], body.get("_source")),
+            }
+            for doc_id, score in ranked
+        ]
+        return {
+            "_scroll_id": "in-memory",
+            "_shards": {"total": 1, "successful": 1, "skipped": 0, "failed": 0},
+            "hits": {"total": {"value": len(hits)}, "hits": hits},
+        }
+
+    def scroll(self, **kwargs):
+        return {
+            "_scroll_id": "in-memory",
+            "_shards": {"total": 1, "successful": 1, "skipped": 0, "failed": 0},
+            "hits": {"hits": []},
+        }
+
+    def clear_scroll(self, **kwargs):
+        return {}
+
+    @staticmethod
+    def _score(target: _Index, query: dict) -> dict[str, float]:
+        if "multi_match" in query:
+            return target.bm25(query["multi_match"]["query"])
+        if "knn" in query:
+            field, params = next(iter(query["knn"].items()))
+            return target.knn(field, params["vector"], params["k"])
+        raise ValueError(f"Unsupported query: {list(query)}")
+
+    @staticmethod
+    def _pipeline_combine(results: list[dict[str, float]], pipeline: dict) -> dict[str, float]:
+        processor = pipeline["phase_results_processors"][0]
+        if "score-ranker-processor" in processor:
+            combination = processor["score-ranker-processor"]["combination"]
+            weights = combination.get("parameters", {}).get("weights", [1.0] * len(results))
+            ranked = [sorted(scores, key=scores.get, reverse=True) for scores in results]
+            combined: dict[str, float] = {}
+            for doc_ids, weight in zip(ranked, weights):
+                for rank, doc_id in enumerate(doc_ids, 1):
+                    score = weight / (combination["rank_constant"] + rank)
+                    combined[doc_id] = combined.get(doc_id, 0.0) + score
+            return combined
+
+        processor = processor["normalization-processor"]
+        return fuse(
+            results,
+            processor["normalization"]["technique"],
+            processor["combination"]["parameters"]["weights"],
+        )
+
+    @staticmethod
+    def _combine(results: list[dict[str, float]]) -> dict[str, float]:
+        combined: dict[str, float] = {}
+        for scores in results:
+            if not scores:
+                continue
+            low, high = min(scores.values()), max(scores.values())
+            for doc_id, score in scores.items():
+                normalized = (score - low) / (high - low) if high > low else 1.0
+                combined[doc_id] = combined.get(doc_id, 0.0) + normalized / len(results)
+        return combined
+
+    @staticmethod
+    def _matches(doc: dict, query: dict) -> bool:
+        if "term" in query:
+            field, value = next(iter(query["term"].items()))
+            return doc.get(field) == value
+        if "terms" in query:
+            field, values = next(iter(query["terms"].items()))
+            return doc.get(field) in values
+        return "match_all" in query
+
+    @staticmethod
+    def _select(source: dict, fields: list[str] | None) -> dict:
+        if not fields:
+            return source
+        return {field: source[field] for field in fields if field in source}
+
+
+def attach(vector_store: VectorStore, store: InMemoryOpenSearch, embeddings: HashingEmbeddings):
+    """Point a vector store at the stand-in embeddings and, for OpenSearch, the in-memory store"""
+    if isinstance(vector_store, OpenSearchClient):
+        vector_store.client = store
+    vector_store.embeddings._embeddings = embeddings
+
+
+def start_fake_llm(latency: float, token_latency: float = 0.0) -> str:
+    """Serve scripts/fake_llm.py from a background thread and return its base URL"""
+    from scripts.fake_llm import FakeLLMHandler
+
+    FakeLLMHandler.latency = latency
+    FakeLLMHandler.token_latency = token_latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeLLMHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-llm", daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
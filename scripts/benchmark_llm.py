@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""Measure relevance grading latency and thread usage under concurrent load
+
+Runs ``--questions`` concurrent questions, each grading ``--docs`` synthetic
+documents, against the Anthropic API or a local fake server
+(scripts/fake_llm.py). ``--invoke thread`` replays the previous
+``asyncio.to_thread(llm.invoke)`` path for comparison.
+
+    python scripts/fake_llm.py --latency 0.3 &
+    python scripts/benchmark_llm.py --base-url http://localhost:8091 --questions 20 --docs 30
+    python scripts/benchmark_llm.py --base-url http://localhost:8091 --questions 20 --docs 30 --invoke thread
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import threading
+import time
+
+# Add src to path
+sys.path.insert(0, str(__file__).replace("scripts/benchmark_llm.py", "src"))
+
+from docs_chatter.config import settings
+
+
+class ThreadSampler:
+    """Record the peak number of live threads"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+async def run(questions: int, docs: int):
+    from docs_chatter.rag.relevance import RelevanceEvaluator
+
+    evaluator = RelevanceEvaluator(confident_score=0)
+    evaluator.cache = None
+
+    async def question(q: int) -> float:
+        documents = [
+            {
+                "page_id": f"{q}-{i}",
+                "title": f"문서 {q}-{i}",
+                "parent_content": f"질문 {q}의 후보 문서 {i} 내용입니다. " * 20,
+                "max_score": 1 / (i + 1),
+            }
+            for i in range(docs)
+        ]
+        start = time.perf_counter()
+        await evaluator.evaluate_batch(f"질문 {q}", documents)
+        return time.perf_counter() - start
+
+    with ThreadSampler() as sampler:
+        start = time.perf_counter()
+        latencies = sorted(await asyncio.gather(*(question(q) for q in range(questions))))
+        total = time.perf_counter() - start
+
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"questions={questions} docs/question={docs} llm calls={evaluator.usage['calls']}")
+    print(f"wall time: {total:.2f}s")
+    print(f"question latency p50: {statistics.median(latencies):.2f}s, p95: {p95:.2f}s")
+    print(f"peak threads: {sampler.peak}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LLM relevance grading under load")
+    parser.add_argument("--base-url", help="Anthropic API base URL (e.g. the fake LLM server)")
+    parser.add_argument("--questions", type=int, default=10, help="Concurrent questions")
+    parser.add_argument("--docs", type=int, default=30, help="Documents graded per question")
+    parser.add_argument(
+        "--invoke",
+        choices=["native", "thread"],
+        default="native",
+        help="native: ainvoke; thread: asyncio.to_thread(llm.invoke) (default: native)",
+    )
+    args = parser.parse_args()
+
+    if args.base_url:
+        settings.anthropic_base_url = args.base_url
+
+    if args.invoke == "thread":
+        import docs_chatter.rag.relevance as relevance
+
+        async def threaded_ainvoke(llm, messages):
+            return await asyncio.to_thread(llm.invoke, messages)
+
+        relevance.ainvoke = threaded_ainvoke
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(args.questions, args.docs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""Compare pointwise and listwise relevance grading
+
+Retrieves documents once per query, then grades the same documents with
+each mode and reports latency, LLM calls, token usage and how often the
+two modes agree on which documents pass the relevance threshold. The
+relevance cache is disabled so every run hits the LLM.
+
+    python scripts/benchmark_relevance.py "휴가 신청 방법" "배포 절차"
+    python scripts/benchmark_relevance.py --queries-file queries.txt --batch-size 8
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+
+# Add src to path
+sys.path.insert(0, str(__file__).replace("scripts/benchmark_relevance.py", "src"))
+
+from docs_chatter.config import settings
+from docs_chatter.rag.relevance import RelevanceEvaluator
+from docs_chatter.rag.retriever import HybridRetriever
+
+
+async def grade(evaluator: RelevanceEvaluator, query: str, documents: list[dict]) -> tuple[float, set]:
+    """Grade documents and return (elapsed seconds, ids above the threshold)"""
+    start = time.perf_counter()
+    results = await evaluator.evaluate_batch(query, documents, max_docs=len(documents))
+    elapsed = time.perf_counter() - start
+    return elapsed, {(doc.get("page_id"), doc.get("chunk_index")) for doc in results}
+
+
+async def run(queries: list[str], batch_size: int):
+    retriever = HybridRetriever()
+    evaluators = {
+        "pointwise": RelevanceEvaluator(mode="pointwise"),
+        "listwise": RelevanceEvaluator(mode="listwise", batch_size=batch_size),
+    }
+    for evaluator in evaluators.values():
+        evaluator.cache = None
+
+    latencies = {mode: [] for mode in evaluators}
+    agreements = []
+
+    for query in queries:
+        documents = retriever.retrieve(query)
+        if not documents:
+            print(f"skip (no documents): {query}")
+            continue
+
+        passed = {}
+        for mode, evaluator in evaluators.items():
+            elapsed, passed[mode] = await grade(evaluator, query, documents)
+            latencies[mode].append(elapsed)
+
+        union = passed["pointwise"] | passed["listwise"]
+        agreement = len(passed["pointwise"] & passed["listwise"]) / len(union) if union else 1.0
+        agreements.append(agreement)
+        print(
+            f"{query[:40]:<40} docs={len(documents):>3} "
+            f"pointwise={latencies['pointwise'][-1]:.2f}s listwise={latencies['listwise'][-1]:.2f}s "
+            f"agreement={agreement:.0%}"
+        )
+
+    if not agreements:
+        return
+
+    print()
+    print(f"{'mode':<10} {'p50 (s)':>8} {'max (s)':>8} {'calls':>6} {'in tokens':>10} {'out tokens':>10}")
+    for mode, evaluator in evaluators.items():
+        usage = evaluator.usage
+        print(
+            f"{mode:<10} {statistics.median(latencies[mode]):>8.2f} {max(latencies[mode]):>8.2f} "
+            f"{usage['calls']:>6} {usage['input_tokens']:>10} {usage['output_tokens']:>10}"
+        )
+    print(f"\nmean agreement (threshold {settings.relevance_threshold}): {statistics.mean(agreements):.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark relevance grading modes")
+    parser.add_argument("queries", nargs="*", help="Queries to benchmark")
+    parser.add_argument("--queries-file", help="File with one query per line")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.relevance_batch_size,
+        help=f"Documents per listwise request (default: {settings.relevance_batch_size})",
+    )
+    args = parser.parse_args()
+
+    queries = list(args.queries)
+    if args.queries_file:
+        with open(args.queries_file, encoding="utf-8") as f:
+            queries.extend(line.strip() for line in f if line.strip())
+    if not queries:
+        parser.error("no queries given")
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(queries, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
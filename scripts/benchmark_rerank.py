@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""Measure local reranking latency and recall against LLM grading
+
+For each query, every retrieved page is graded by the LLM (the existing
+pipeline) to get the set of relevant pages. The lexical reranker is then
+timed on the same candidates, and recall@M reports how many of those
+relevant pages survive the top-M cut. The relevance cache is disabled.
+
+    python scripts/benchmark_rerank.py "휴가 신청 방법" "배포 절차" --top-m 10
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+
+# Add src to path
+sys.path.insert(0, str(__file__).replace("scripts/benchmark_rerank.py", "src"))
+
+from docs_chatter.config import settings
+from docs_chatter.rag.relevance import RelevanceEvaluator
+from docs_chatter.rag.reranker import LexicalReranker
+from docs_chatter.rag.retriever import HybridRetriever
+
+
+async def run(queries: list[str], top_m: int, confidence: float):
+    retriever = HybridRetriever()
+    reranker = LexicalReranker(top_m=top_m)
+    evaluator = RelevanceEvaluator()
+    evaluator.cache = None
+
+    rerank_ms, llm_ms, recalls, skip_precisions = [], [], [], []
+    graded_docs = kept_docs = skipped_docs = 0
+
+    for query in queries:
+        documents = retriever.retrieve(query)
+        if not documents:
+            print(f"skip (no documents): {query}")
+            continue
+
+        start = time.perf_counter()
+        graded = await evaluator.evaluate_batch(query, documents, max_docs=len(documents))
+        llm_ms.append((time.perf_counter() - start) * 1000)
+        relevant = {doc["page_id"] for doc in graded}
+
+        start = time.perf_counter()
+        kept = reranker.rerank(query, documents)
+        rerank_ms.append((time.perf_counter() - start) * 1000)
+
+        kept_ids = {doc["page_id"] for doc in kept}
+        recall = len(relevant & kept_ids) / len(relevant) if relevant else 1.0
+        recalls.append(recall)
+        graded_docs += len(documents)
+        kept_docs += len(kept)
+
+        confident = {doc["page_id"] for doc in kept if confidence and doc["lexical_coverage"] >= confidence}
+        skipped_docs += len(confident)
+        if confident:
+            skip_precisions.append(len(confident & relevant) / len(confident))
+
+        print(
+            f"{query[:40]:<40} docs={len(documents):>3} relevant={len(relevant):>3} "
+            f"kept={len(kept):>3} recall={recall:.0%} confident={len(confident):>3} "
+            f"rerank={rerank_ms[-1]:.1f}ms llm={llm_ms[-1]:.0f}ms"
+        )
+
+    if not recalls:
+        return
+
+    print()
+    print(f"rerank latency p50: {statistics.median(rerank_ms):.1f}ms, max: {max(rerank_ms):.1f}ms")
+    print(f"LLM grading latency p50 (all candidates): {statistics.median(llm_ms):.0f}ms")
+    print(f"mean recall@{top_m}: {statistics.mean(recalls):.0%}")
+    print(f"LLM grading calls avoided by top-M cut: {1 - kept_docs / graded_docs:.0%}")
+    if confidence:
+        precision = statistics.mean(skip_precisions) if skip_precisions else 0.0
+        print(
+            f"confident (coverage >= {confidence}): {skipped_docs} pages, "
+            f"precision vs LLM: {precision:.0%}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the local lexical reranker")
+    parser.add_argument("queries", nargs="*", help="Queries to benchmark")
+    parser.add_argument("--queries-file", help="File with one query per line")
+    parser.add_argument("--top-m", type=int, default=settings.rerank_top_m)
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=settings.rerank_skip_llm_confidence,
+        help="Query-term coverage at which LLM grading would be skipped (0 to ignore)",
+    )
+    args = parser.parse_args()
+
+    queries = list(args.queries)
+    if args.queries_file:
+        with open(args.queries_file, encoding="utf-8") as f:
+            queries.extend(line.strip() for line in f if line.strip())
+    if not queries:
+        parser.error("no queries given")
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(queries, args.top_m, args.confidence))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""Local stand-in Confluence server for testing the fetchers offline
+
+Serves synthetic pages under the Confluence Cloud REST paths used by
+ConfluenceClient and AsyncConfluenceClient:
+
+    GET /wiki/rest/api/content?spaceKey=...&start=...&limit=...
+    GET /wiki/rest/api/content/search?cql=...&start=...&limit=...
+    GET /wiki/rest/api/content/<id>
+
+Point CONFLUENCE_URL at it (e.g. http://localhost:8090) to run the batch
+indexer against it.
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def build_corpus(space_keys: list[str], pages_per_space: int) -> dict[str, list[dict]]:
+    """Generate deterministic pages for each space"""
+    corpus = {}
+    for space_key in space_keys:
+        pages = []
+        for i in range(pages_per_space):
+            page_id = f"{space_key.lower()}-{i}"
+            paragraphs = "".join(
+                f"<p>{space_key} 문서 {i}의 {j}번째 단락입니다. 휴가 신청, 배포 절차, 온보딩 안내.</p>"
+                for j in range(1 + i % 10)
+            )
+            pages.append(
+                {
+                    "id": page_id,
+                    "type": "page",
+                    "title": f"{space_key} Page {i}",
+                    "space": {"key": space_key},
+                    "body": {"storage": {"value": f"<h1>{space_key} Page {i}</h1>{paragraphs}"}},
+                    "version": {
+                        "number": 1,
+                        "when": f"2024-01-{1 + i % 28:02d}T00:00:00.000Z",
+                        "by": {"displayName": "Fake User"},
+                    },
+                }
+            )
+        corpus[space_key] = pages
+    return corpus
+
+
+class FakeConfluenceHandler(BaseHTTPRequestHandler):
+    corpus: dict[str, list[dict]] = {}
+    latency: float = 0.0
+    error_rate: float = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+
+        # Inject transient failures to exercise retry/backoff
+        if self.error_rate and random.random() < self.error_rate:
+            status = random.choice([429, 503])
+            self.send_response(status)
+            if status == 429:
+                self.send_header("Retry-After", "1")
+            self.end_headers()
+            return
+
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if url.path == "/wiki/rest/api/content":
+            pages = self.corpus.get(params.get("spaceKey", ""), [])
+            self._send_window(pages, params, total=False)
+        elif url.path == "/wiki/rest/api/content/search":
+            pages = self._search(params.get("cql", ""))
+            self._send_window(pages, params, total=True)
+        elif match := re.fullmatch(r"/wiki/rest/api/content/([\w-]+)", url.path):
+            page = self._find(match.group(1))
+            if page is None:
+                self._send_json(404, {"message": "not found"})
+            else:
+                self._send_json(200, page)
+        else:
+            self._send_json(404, {"message": "not found"})
+
+    def _search(self, cql: str) -> list[dict]:
+        space = re.search(r'space\s*=\s*"([^"]+)"', cql)
+        since = re.search(r'lastModified\s*>=\s*"([^"]+)"', cql)
+        pages = self.corpus.get(space.group(1), []) if space else []
+        if since:
+            pages = [p for p in pages if p["version"]["when"] >= since.group(1)]
+        return pages
+
+    def _find(self, page_id: str) -> dict | None:
+        for pages in self.corpus.values():
+            for page in pages:
+                if page["id"] == page_id:
+                    return page
+        return None
+
+    def _send_window(self, pages: list[dict], params: dict, total: bool):
+        start = int(params.get("start", 0))
+        limit = int(params.get("limit", 25))
+        results = pages[start : start + limit]
+        body = {"results": results, "start": start, "limit": limit, "size": len(results)}
+        if total:
+            body["totalSize"] = len(pages)
+        self._send_json(200, body)
+
+    def _send_json(self, status: int, body: dict):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a stand-in Confluence server")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--spaces", default="SPACE1,SPACE2", help="Comma-separated space keys")
+    parser.add_argument("--pages", type=int, default=200, help="Pages per space")
+    parser.add_argument("--latency", type=float, default=0.05, help="Per-request latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 429/503 responses")
+    args = parser.parse_args()
+
+    FakeConfluenceHandler.corpus = build_corpus(
+        [s.strip() for s in args.spaces.split(",") if s.strip()], args.pages
+    )
+    FakeConfluenceHandler.latency = args.latency
+    FakeConfluenceHandler.error_rate = args.error_rate
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), FakeConfluenceHandler)
+    print(f"Fake Confluence listening on http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
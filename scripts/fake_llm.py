@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+"""Local stand-in for the Anthropic Messages API
+
+Serves ``POST /v1/messages`` (plain or streamed) with deterministic
+responses shaped like the prompts used by the RAG chain:
+
+- pointwise relevance prompts get ``Relevance: <score>``
+- listwise relevance prompts get a JSON array of scores
+- anything else gets a short answer
+
+Scores are derived from a hash of each document, so repeated runs agree.
+Point ANTHROPIC_BASE_URL at it (e.g. http://localhost:8091).
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_score(text: str) -> int:
+    """Deterministic 0-100 score for a document"""
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16) % 101
+
+
+def fake_reply(system: str, user: str) -> str:
+    """Build a response text for the given prompts"""
+    if "JSON" in system:
+        documents = re.split(r"\[문서 (\d+)\]", user)[1:]
+        items = [
+            {"doc": int(number), "score": fake_score(body)}
+            for number, body in zip(documents[::2], documents[1::2])
+        ]
+        return json.dumps(items)
+    if "Relevance:" in system:
+        return f"Relevance: {fake_score(user)}\nReason: fake"
+    return "참고 문서를 바탕으로 한 가짜 답변입니다. " * 10
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency: float = 0.0
+    token_latency: float = 0.0
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        if self.path.rstrip("/") != "/v1/messages":
+            self._send_json(404, {"type": "error", "error": {"type": "not_found_error"}})
+            return
+
+        system = request.get("system", "")
+        if isinstance(system, list):
+            system = "".join(block.get("text", "") for block in system)
+        user = "".join(
+            message["content"]
+            if isinstance(message["content"], str)
+            else "".join(block.get("text", "") for block in message["content"])
+            for message in request.get("messages", [])
+            if message.get("role") == "user"
+        )
+
+        text = fake_reply(system, user)
+        input_tokens = (len(system) + len(user)) // 3
+        output_tokens = max(1, len(text) // 3)
+
+        if request.get("stream"):
+            self._send_stream(request, text, input_tokens, output_tokens)
+            return
+
+        time.sleep(self.latency + self.token_latency * output_tokens)
+
+        self._send_json(
+            200,
+            {
+                "id": "msg_fake",
+                "type": "message",
+                "role": "assistant",
+                "model": request.get("model", "fake"),
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens},
+            },
+        )
+
+    def _send_stream(self, request: dict, text: str, input_tokens: int, output_tokens: int):
+        """Send the response as server-sent events, one small piece at a time"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def send(event: str, data: dict):
+            payload = json.dumps(data, ensure_ascii=False)
+            self.wfile.write(f"event: {event}\ndata: {payload}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        time.sleep(self.latency)
+        send(
+            "message_start",
+            {
+                "type": "message_start",
+                "message": {
+                    "id": "msg_fake",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": request.get("model", "fake"),
+                    "content": [],
+                    "stop_reason": None,
+                    "stop_sequence": None,
+                    "usage": {"input_tokens": input_tokens, "output_tokens": 1},
+                },
+            },
+        )
+        send(
+            "content_block_start",
+            {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}},
+        )
+        for i in range(0, len(text), 3):
+            time.sleep(self.token_latency)
+            send(
+                "content_block_delta",
+                {
+                    "type": "content_block_delta",
+                    "index": 0,
+                    "delta": {"type": "text_delta", "text": text[i : i + 3]},
+                },
+            )
+        send("content_block_stop", {"type": "content_block_stop", "index": 0})
+        send(
+            "message_delta",
+            {
+                "type": "message_delta",
+                "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens},
+            },
+        )
+        send("message_stop", {"type": "message_stop"})
+
+    def _send_json(self, status: int, body: dict):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a stand-in Anthropic Messages API")
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--latency", type=float, default=0.3, help="Base latency per request in seconds")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Extra latency per output token")
+    args = parser.parse_args()
+
+    FakeLLMHandler.latency = args.latency
+    FakeLLMHandler.token_latency = args.token_latency
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), FakeLLMHandler)
+    server.daemon_threads = True
+    print(f"Fake LLM listening on http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
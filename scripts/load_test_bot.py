@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+"""Load-test the Slack bot with fake Slack events
+
+Drives ``SlackBot`` handlers with synthetic app_mention events from several
+users through a thread pool, like Bolt's listener executor, without
+connecting to Slack. Message posts and edits are recorded instead of sent;
+with --processes, worker processes edit messages through a local fake Slack
+Web API. Use with scripts/fake_llm.py, and --fake-retrieval to skip
+OpenSearch and Cohere:
+
+    python scripts/fake_llm.py --latency 0.3 --token-latency 0.01 &
+    python scripts/load_test_bot.py --base-url http://localhost:8091 --fake-retrieval \\
+        --users 10 --questions 5
+    python scripts/load_test_bot.py --base-url http://localhost:8091 --fake-retrieval \\
+        --users 40 --questions 5 --processes 4
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+# Add src to path
+sys.path.insert(0, str(__file__).replace("scripts/load_test_bot.py", "src"))
+
+from docs_chatter.config import settings
+
+
+class FakeClient:
+    """Records chat.update calls per message"""
+
+    def __init__(self, recorder: "Recorder"):
+        self.recorder = recorder
+
+    def chat_update(self, channel: str, ts: str, text: str):
+        time.sleep(0.05)  # Slack API round trip
+        self.recorder.update(ts, text)
+
+
+class FakeApp:
+    """Minimal stand-in for slack_bolt.App that collects event handlers"""
+
+    def __init__(self, recorder: "Recorder"):
+        self.client = FakeClient(recorder)
+        self.handlers = {}
+
+    def event(self, name: str):
+        def register(func):
+            self.handlers[name] = func
+            return func
+
+        return register
+
+
+class Recorder:
+    """Timestamps of each question's placeholder, first answer text and final edit"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.posted: dict[str, float] = {}
+        self.first_text: dict[str, float] = {}
+        self.final: dict[str, float] = {}
+        self.rejected = 0
+        self.edits = 0
+
+    def post(self) -> str:
+        with self.lock:
+            ts = str(len(self.posted))
+            self.posted[ts] = time.perf_counter()
+            return ts
+
+    def update(self, ts: str, text: str):
+        now = time.perf_counter()
+        with self.lock:
+            self.edits += 1
+            if text.startswith("요청이 많아"):
+                self.rejected += 1
+                self.final[ts] = now
+            elif "참고 문서:" in text or text.startswith("오류") or "찾을 수 없습니다" in text:
+                self.final[ts] = now
+            elif not text.endswith("...") and ts not in self.first_text:
+                self.first_text[ts] = now
+
+
+class FakeSlackAPIHandler(BaseHTTPRequestHandler):
+    """Slack Web API stand-in answering chat.update for worker processes"""
+
+    recorder: Recorder
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length).decode("utf-8")
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            params = json.loads(body or "{}")
+        else:
+            params = {k: v[0] for k, v in parse_qs(body).items()}
+
+        if self.path.endswith("/chat.update"):
+            time.sleep(0.05)  # Slack API round trip
+            self.recorder.update(params.get("ts", ""), params.get("text", ""))
+
+        payload = json.dumps({"ok": True}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def fake_documents(query: str) -> list[dict]:
+    """Synthetic retrieval results"""
+    return [
+        {
+            "page_id": f"page-{i}",
+            "title": f"문서 {i}",
+            "url": f"https://example.com/{i}",
+            "parent_content": f"{query}에 대한 문서 {i}의 내용입니다. " * 30,
+            "chunks": [],
+            "max_score": 1 / (i + 1),
+        }
+        for i in range(15)
+    ]
+
+
+def fake_chain():
+    """RAGChain with synthetic retrieval, importable by worker processes"""
+    from docs_chatter.rag.chain import RAGChain
+
+    rag_chain = RAGChain()
+    rag_chain.retriever.retrieve = fake_documents
+    # Cache lookups embed the question, which needs Cohere
+    rag_chain.answer_cache = None
+    return rag_chain
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the Slack bot with fake events")
+    parser.add_argument("--base-url", help="Anthropic API base URL (e.g. the fake LLM server)")
+    parser.add_argument("--fake-retrieval", action="store_true", help="Use synthetic documents")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--questions", type=int, default=5, help="Questions per user")
+    parser.add_argument("--listener-threads", type=int, default=10, help="Bolt listener threads")
+    parser.add_argument("--processes", type=int, default=0, help="Worker processes (0: in-process)")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    args = parser.parse_args()
+
+    recorder = Recorder()
+
+    # Worker processes read settings from the environment
+    if args.base_url:
+        os.environ["ANTHROPIC_BASE_URL"] = settings.anthropic_base_url = args.base_url
+    os.environ["RELEVANCE_CACHE_PATH"] = settings.relevance_cache_path = ""
+    if args.processes:
+        FakeSlackAPIHandler.recorder = recorder
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FakeSlackAPIHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        os.environ["SLACK_API_URL"] = f"http://127.0.0.1:{server.server_port}/api/"
+    logging.basicConfig(level=logging.WARNING)
+
+    from docs_chatter.slack.bot import SlackBot
+
+    app = FakeApp(recorder)
+    bot = SlackBot(
+        app=app,
+        worker_processes=args.processes,
+        chain_factory=fake_chain if args.fake_retrieval else None,
+    )
+    handle = app.handlers["app_mention"]
+
+    def say(text: str, channel: str, thread_ts: str) -> dict:
+        return {"ts": recorder.post()}
+
+    events = [
+        {"user": f"U{u}", "channel": "C1", "ts": f"{u}.{q}", "text": f"<@UBOT> 질문 {u}-{q}"}
+        for q in range(args.questions)
+        for u in range(args.users)
+    ]
+
+    handler_times = []
+
+    def dispatch(event: dict):
+        start = time.perf_counter()
+        handle(event=event, say=say)
+        handler_times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.listener_threads) as listeners:
+        list(listeners.map(dispatch, events))
+    dispatched = time.perf_counter() - start
+
+    deadline = time.perf_counter() + args.timeout
+    while len(recorder.final) < len(events) and time.perf_counter() < deadline:
+        time.sleep(0.1)
+    total = time.perf_counter() - start
+
+    first = [recorder.first_text[ts] - recorder.posted[ts] for ts in recorder.first_text]
+    final = [
+        recorder.final[ts] - recorder.posted[ts]
+        for ts in recorder.final
+        if ts in recorder.first_text
+    ]
+
+    print(
+        f"questions={len(events)} users={args.users} processes={args.processes} "
+        f"workers/process={settings.slack_workers}"
+    )
+    print(f"all events dispatched in {dispatched:.2f}s (handler p95 {percentile(handler_times, 0.95) * 1000:.0f}ms)")
+    print(f"completed={len(recorder.final)} rejected={recorder.rejected} edits={recorder.edits} wall={total:.2f}s")
+    if first:
+        print(f"time to first answer text p50={statistics.median(first):.2f}s p95={percentile(first, 0.95):.2f}s")
+    if final:
+        print(f"time to final answer p50={statistics.median(final):.2f}s p95={percentile(final, 0.95):.2f}s")
+        print(f"throughput: {len(final) / total:.2f} questions/s")
+    print(f"dispatcher: {bot.dispatcher.stats}")
+    bot.dispatcher.stop()
+    if bot.worker_pool is not None:
+        bot.worker_pool.stop()
+
+
+if __name__ == "__main__":
+    main()
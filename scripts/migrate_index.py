@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""Migrate the chunk index to the configured k-NN engine, space type and compression"""
+
+import argparse
+import json
+import logging
+import sys
+
+# Add src to path
+sys.path.insert(0, str(__file__).replace("scripts/migrate_index.py", "src"))
+
+from docs_chatter.config import settings
+from docs_chatter.vectorstore.migration import migrate_index
+
+
+def setup_logging(verbose: bool = False):
+    """Setup logging configuration"""
+    level = logging.DEBUG if verbose else logging.INFO
+    logging.basicConfig(
+        level=level,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler()],
+    )
+
+
+def main():
+    # The mapping comes from the KNN_* settings, so the indexer and the bot,
+    # which encode vectors for it, read the same values from .env
+    parser = argparse.ArgumentParser(
+        description="Reindex chunks into a new index with the KNN_* mapping and switch over"
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between reindex / model training progress checks",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the new vector mapping without changing anything",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Enable verbose logging",
+    )
+
+    args = parser.parse_args()
+
+    setup_logging(args.verbose)
+    logger = logging.getLogger(__name__)
+
+    try:
+        logger.info(
+            f"Migrating {settings.opensearch_index} to {settings.knn_engine} "
+            f"{settings.knn_space_type} vectors ({settings.knn_compression} compression)"
+        )
+        summary = migrate_index(poll_interval=args.poll_interval, dry_run=args.dry_run)
+        logger.info(f"Migration {'planned' if args.dry_run else 'completed'}:")
+        print(json.dumps(summary, indent=2))
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
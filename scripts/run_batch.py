@@ -26,15 +26,53 @@ def main():
     parser = argparse.ArgumentParser(description="Index Confluence documents")
     parser.add_argument(
         "--mode",
-        choices=["full", "incremental"],
+        choices=["full", "incremental", "rebuild", "rollback"],
         default="incremental",
-        help="Indexing mode (default: incremental)",
+        help=(
+            "Indexing mode (default: incremental). rebuild writes every page into a new "
+            "index version and switches to it; rollback serves the previous version again"
+        ),
     )
     parser.add_argument(
         "--since",
         type=str,
         help="For incremental mode: date since when to fetch updates (ISO format). Default: yesterday",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reindex pages even if their content is unchanged",
+    )
+    parser.add_argument(
+        "--catch-up",
+        action="store_true",
+        help="For rollback mode: run a full index after switching back",
+    )
+    parser.add_argument(
+        "--async-fetch",
+        action="store_true",
+        help="Fetch Confluence pages with the parallel async client",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Run convert, embed and bulk stages concurrently",
+    )
+    parser.add_argument(
+        "--convert-workers",
+        type=int,
+        help="Pipeline: number of HTML conversion processes",
+    )
+    parser.add_argument(
+        "--embed-workers",
+        type=int,
+        help="Pipeline: number of concurrent embedding threads",
+    )
+    parser.add_argument(
+        "--bulk-max-bytes",
+        type=int,
+        help="Max size of a single bulk request body in bytes",
+    )
     parser.add_argument(
         "--verbose",
         "-v",
@@ -48,11 +86,22 @@ def main():
     logger = logging.getLogger(__name__)
 
     try:
-        indexer = BatchIndexer()
+        indexer = BatchIndexer(
+            pipeline=args.pipeline,
+            convert_workers=args.convert_workers,
+            embed_workers=args.embed_workers,
+            bulk_max_bytes=args.bulk_max_bytes,
+            async_fetch=args.async_fetch,
+        )
 
         if args.mode == "full":
             logger.info("Running full index...")
-            stats = indexer.run_full_index()
+            stats = indexer.run_full_index(force=args.force)
+        elif args.mode == "rebuild":
+            logger.info("Running blue/green rebuild...")
+            stats = indexer.run_rebuild_index()
+        elif args.mode == "rollback":
+            stats = indexer.run_rollback(catch_up=args.catch_up)
         else:
             since = args.since
             if not since:
@@ -60,7 +109,7 @@ def main():
                 since = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
 
             logger.info(f"Running incremental index since {since}...")
-            stats = indexer.run_incremental_index(since)
+            stats = indexer.run_incremental_index(since, force=args.force)
 
         logger.info(f"Indexing completed: {stats}")
 
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""Measure HNSW recall vs latency on a sample of the chunk index and size the cluster"""
+
+import argparse
+import json
+import logging
+import sys
+
+# Add src to path
+sys.path.insert(0, str(__file__).replace("scripts/tune_index.py", "src"))
+
+from docs_chatter.config import settings
+from docs_chatter.vectorstore.opensearch import OpenSearchClient
+from docs_chatter.vectorstore.tuning import tune_index
+
+
+def setup_logging(verbose: bool = False):
+    """Setup logging configuration"""
+    level = logging.DEBUG if verbose else logging.INFO
+    logging.basicConfig(
+        level=level,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler()],
+    )
+
+
+def int_list(value: str) -> list[int]:
+    """Parse a comma separated list of integers"""
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Choose shards, replicas and HNSW parameters for the chunk index"
+    )
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=10000,
+        help="Chunk vectors loaded into each trial index",
+    )
+    parser.add_argument(
+        "--queries",
+        type=int,
+        default=200,
+        help="Held-out chunk vectors used as queries",
+    )
+    parser.add_argument("--k", type=int, default=10, help="Neighbours compared for recall@k")
+    parser.add_argument(
+        "--m",
+        type=int_list,
+        default=[8, 16, 32],
+        help="HNSW m candidates, comma separated",
+    )
+    parser.add_argument(
+        "--ef-construction",
+        type=int_list,
+        default=[100, 256],
+        help="HNSW ef_construction candidates, comma separated",
+    )
+    parser.add_argument(
+        "--ef-search",
+        type=int_list,
+        default=[50, 100, 200, 400],
+        help="HNSW ef_search candidates, comma separated",
+    )
+    parser.add_argument(
+        "--target-recall",
+        type=float,
+        default=0.95,
+        help="Lowest acceptable recall@k; the fastest candidate reaching it wins",
+    )
+    parser.add_argument(
+        "--shard-size-gb",
+        type=float,
+        default=30.0,
+        help="Largest primary shard size to plan for",
+    )
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="Store the chosen layout in the index template and update live replicas/ef_search",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Enable verbose logging",
+    )
+
+    args = parser.parse_args()
+
+    setup_logging(args.verbose)
+    logger = logging.getLogger(__name__)
+
+    try:
+        store = OpenSearchClient()
+        logger.info(f"Tuning {settings.opensearch_index}")
+        report = tune_index(
+            store,
+            sample=args.sample,
+            queries=args.queries,
+            k=args.k,
+            m_values=args.m,
+            ef_construction_values=args.ef_construction,
+            ef_search_values=args.ef_search,
+            target_recall=args.target_recall,
+            shard_size_gb=args.shard_size_gb,
+        )
+        print(json.dumps(report, indent=2))
+
+        layout = report["layout"]
+        if not report["target_met"]:
+            logger.warning(f"No candidate reached recall {args.target_recall}; using the best one")
+        logger.info("Settings for .env:")
+        print(f"OPENSEARCH_SHARDS={layout['shards']}")
+        print(f"OPENSEARCH_REPLICAS={layout['replicas']}")
+        print(f"KNN_M={layout['m']}")
+        print(f"KNN_EF_CONSTRUCTION={layout['ef_construction']}")
+        print(f"KNN_EF_SEARCH={layout['ef_search']}")
+
+        if args.apply:
+            store.put_index_template(layout)
+            store.apply_search_settings()
+            # Shards and graph parameters are fixed when an index is created
+            logger.info(
+                "Applied replicas and ef_search; run run_batch.py --mode rebuild "
+                "to apply shards, m and ef_construction"
+            )
+    except Exception as e:
+        logger.error(f"Tuning failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
 from .indexer import BatchIndexer
+from .manifest import PageManifest
 
-__all__ = ["BatchIndexer"]
+__all__ = ["BatchIndexer", "PageManifest"]
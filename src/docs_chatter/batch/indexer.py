@@ -1,124 +1,593 @@
 """Batch indexer for Confluence documents"""
 
 import logging
+import queue
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
 
+from docs_chatter.batch.manifest import (
+    ManifestEntry,
+    PageManifest,
+    chunk_hash,
+    content_hash,
+)
+from docs_chatter.config import settings
+from docs_chatter.confluence.async_client import AsyncConfluenceClient
 from docs_chatter.confluence.client import ConfluenceClient, ConfluencePage
 from docs_chatter.confluence.converter import HTMLConverter
-from docs_chatter.rag.chunker import DocumentChunker
-from docs_chatter.vectorstore.opensearch import OpenSearchClient
+from docs_chatter.rag.chunker import DocumentChunk, DocumentChunker
+from docs_chatter.vectorstore.bulk import BulkAccumulator
+from docs_chatter.vectorstore.base import VectorStore, create_vector_store
 
 logger = logging.getLogger(__name__)
 
+# Per-process chunker used by conversion workers
+_worker_chunker: DocumentChunker | None = None
 
-class BatchIndexer:
-    """Batch process to index Confluence documents into OpenSearch"""
 
-    def __init__(self):
+def _prepare_page(
+    page: ConfluencePage,
+    chunker: DocumentChunker | None = None,
+) -> tuple[str, list[DocumentChunk]]:
+    """Convert and chunk a page
+
+    Runs in a conversion worker process in pipelined mode.
+
+    Returns:
+        Tuple of (content hash, chunks)
+    """
+    global _worker_chunker
+    if chunker is None:
+        if _worker_chunker is None:
+            _worker_chunker = DocumentChunker()
+        chunker = _worker_chunker
+
+    markdown = HTMLConverter.to_markdown(page.html_content)
+    plain_text = HTMLConverter.to_plain_text(page.html_content)
+
+    chunks = chunker.chunk_document(
+        page_id=page.id,
+        title=page.title,
+        url=page.url,
+        plain_text=plain_text,
+        markdown=markdown,
+    )
+    return content_hash(page.title, plain_text), chunks
+
+
+@dataclass
+class PagePlan:
+    """Index changes needed to bring a page up to date"""
+
+    page: ConfluencePage
+    entry: ManifestEntry
+    parent: DocumentChunk  # carries the page markdown
+    embed: list[DocumentChunk] = field(default_factory=list)  # new or changed chunks
+    update: list[DocumentChunk] = field(default_factory=list)  # unchanged chunks
+    stale_ids: list[str] = field(default_factory=list)
+    replace: bool = False  # existing chunks unknown; delete any not rewritten
+
+
+class BatchIndexer:
+    """Batch process to index Confluence documents into the vector store"""
+
+    def __init__(
+        self,
+        pipeline: bool = False,
+        convert_workers: int | None = None,
+        embed_workers: int | None = None,
+        bulk_max_bytes: int | None = None,
+        async_fetch: bool = False,
+    ):
         self.confluence = ConfluenceClient()
+        # Page listing source: the async client fetches windows/spaces in parallel
+        self.fetcher = AsyncConfluenceClient() if async_fetch else self.confluence
         self.converter = HTMLConverter()
         self.chunker = DocumentChunker()
-        self.opensearch = OpenSearchClient()
+        self.store = create_vector_store()
+
+        # Change detection (disabled when no manifest path is configured)
+        self.manifest = (
+            PageManifest(settings.index_manifest_path, self.store.index_name)
+            if settings.index_manifest_path
+            else None
+        )
+        self._fresh_index = False
+
+        # Pipelined mode settings
+        self.pipeline = pipeline
+        self.convert_workers = convert_workers or settings.index_convert_workers
+        self.embed_workers = embed_workers or settings.index_embed_workers
+        self.bulk_max_bytes = bulk_max_bytes or settings.index_bulk_max_bytes
 
-    def run_full_index(self) -> dict:
-        """Run full indexing of all configured spaces"""
+    def run_full_index(self, force: bool = False) -> dict:
+        """Run full indexing of all configured spaces
+
+        Args:
+            force: Reindex every page even if its content is unchanged
+        """
         logger.info("Starting full index...")
         start_time = datetime.now()
 
         # Ensure index exists
-        self.opensearch.create_index()
+        self._ensure_index()
 
-        # Fetch all pages
-        pages = self.confluence.get_all_pages()
-        logger.info(f"Found {len(pages)} pages to index")
+        # Stream pages as they are fetched
+        pages = self.fetcher.iter_all_pages()
 
         # Process and index
-        stats = self._process_pages(pages)
+        stats = self._process_pages(pages, force=force)
 
         elapsed = (datetime.now() - start_time).total_seconds()
         stats["elapsed_seconds"] = elapsed
+        stats["embedding_cache"] = self.store.embeddings.cache_stats
         logger.info(f"Full index completed in {elapsed:.2f}s: {stats}")
 
         return stats
 
-    def run_incremental_index(self, since: str) -> dict:
+    def run_rebuild_index(self) -> dict:
+        """Rebuild every page into new index versions and switch to them (blue/green)
+
+        Pages are written into fresh versioned indexes tuned for bulk loading
+        while the live indexes keep serving queries. Once the rebuild passes
+        validation, the index aliases move to it atomically; previous
+        versions are kept for ``run_rollback`` up to INDEX_KEEP_VERSIONS.
+        """
+        logger.info("Starting blue/green rebuild...")
+        start_time = datetime.now()
+
+        live, live_manifest = self.store, self.manifest
+        staging = live.create_staging()
+        self.store = staging
+        # Recorded under the staging index name until it goes live
+        self.manifest = (
+            PageManifest(settings.index_manifest_path, staging.index_name)
+            if live_manifest
+            else None
+        )
+        self._fresh_index = True
+
+        try:
+            stats = self._process_pages(self.fetcher.iter_all_pages(), force=True)
+            stats["index"] = staging.index_name
+            self._validate_rebuild(live, staging, stats)
+            live.switch_to(staging)
+        except Exception:
+            live.discard(staging)
+            if self.manifest:
+                self.manifest.clear()
+            raise
+        finally:
+            if self.manifest:
+                self.manifest.close()
+            self.store, self.manifest = live, live_manifest
+
+        # The staging version is live from here on and must never be discarded
+        if self.manifest:
+            self.manifest.adopt(staging.index_name)
+        self.store.prune_versions()
+
+        elapsed = (datetime.now() - start_time).total_seconds()
+        stats["elapsed_seconds"] = elapsed
+        stats["embedding_cache"] = self.store.embeddings.cache_stats
+        logger.info(f"Rebuild completed in {elapsed:.2f}s: {stats}")
+
+        return stats
+
+    def _validate_rebuild(self, live: VectorStore, staging: VectorStore, stats: dict) -> None:
+        """Refuse to switch to a rebuild that failed too often or lost too many chunks"""
+        fetched = stats["pages_fetched"]
+        if fetched and stats["errors"] / fetched > settings.index_rebuild_max_error_rate:
+            raise RuntimeError(f"Rebuild failed for {stats['errors']} of {fetched} pages")
+
+        chunks = staging.count_chunks()
+        if not chunks:
+            raise RuntimeError("Rebuild produced an empty index")
+
+        live_chunks = live.count_chunks()
+        if chunks < live_chunks * settings.index_rebuild_min_ratio:
+            raise RuntimeError(
+                f"Rebuild has {chunks} chunks, fewer than "
+                f"{settings.index_rebuild_min_ratio:.0%} of the live {live_chunks}"
+            )
+        stats["live_chunks"] = live_chunks
+
+    def run_rollback(self, catch_up: bool = False) -> dict:
+        """Serve the previous index version again
+
+        The restored version misses edits made since it was built, and an
+        incremental run only refetches its date window. A full run is needed
+        to catch up; the manifest is cleared so it rewrites every page.
+
+        Args:
+            catch_up: Run the full index right after switching back
+        """
+        version = self.store.rollback()
+        if self.manifest:
+            self.manifest.clear()
+
+        if not catch_up:
+            logger.warning(
+                f"Rolled back to {version}; run a full index to pick up "
+                "pages changed since it was built"
+            )
+            return {"version": version}
+
+        logger.info(f"Rolled back to {version}, catching up with a full index")
+        stats = self.run_full_index()
+        stats["version"] = version
+        return stats
+
+    def run_incremental_index(self, since: str, force: bool = False) -> dict:
         """Run incremental indexing since a given date
 
         Args:
             since: ISO format date string (e.g., "2024-01-01")
+            force: Reindex every updated page even if its content is unchanged
         """
         logger.info(f"Starting incremental index since {since}...")
         start_time = datetime.now()
 
         # Ensure index exists
-        self.opensearch.create_index()
-
-        # Fetch updated pages from all spaces
-        pages = []
-        from docs_chatter.config import settings
-
-        for space_key in settings.space_keys_list:
-            updated = self.confluence.get_updated_pages_since(space_key, since)
-            pages.extend(updated)
-
-        logger.info(f"Found {len(pages)} updated pages")
-
-        # Delete existing chunks for updated pages
-        for page in pages:
-            self.opensearch.delete_by_page_id(page.id)
+        if self._ensure_index():
+            # Pages outside the window would be left without parent documents
+            logger.warning("Parent index was just created, indexing all pages instead")
+            pages = self.fetcher.iter_all_pages()
+        else:
+            # Stream updated pages from all spaces
+            pages = self.fetcher.iter_updated_pages(since)
 
         # Process and index
-        stats = self._process_pages(pages)
+        stats = self._process_pages(pages, force=force)
 
         elapsed = (datetime.now() - start_time).total_seconds()
         stats["elapsed_seconds"] = elapsed
+        stats["embedding_cache"] = self.store.embeddings.cache_stats
         logger.info(f"Incremental index completed in {elapsed:.2f}s: {stats}")
 
         return stats
 
-    def _process_pages(self, pages: list[ConfluencePage]) -> dict:
-        """Process pages: convert, chunk, and index"""
+    def _ensure_index(self) -> bool:
+        """Create the indexes if needed, resetting the manifest for a new index
+
+        Returns:
+            True if the parent index was added next to an existing chunk index,
+            so every page must be rewritten to get its parent document
+        """
+        self._fresh_index = self.store.create_index()
+        new_parents = self.store.create_parent_index()
+
+        # Pages recorded in the manifest must be rewritten into new indexes
+        if (self._fresh_index or new_parents) and self.manifest:
+            self.manifest.clear()
+        return new_parents and not self._fresh_index
+
+    def _process_pages(self, pages: Iterable[ConfluencePage], force: bool = False) -> dict:
+        """Process pages: convert, chunk, and index
+
+        Pages are consumed lazily, so indexing starts as soon as the first
+        page is fetched. Pages whose content is unchanged since the last run
+        are skipped, and only changed chunks are re-embedded.
+        """
         stats = {
+            "pages_fetched": 0,
             "pages_processed": 0,
+            "pages_unchanged": 0,
             "chunks_indexed": 0,
+            "chunks_updated": 0,
+            "chunks_deleted": 0,
+            "pages_removed": 0,
             "errors": 0,
         }
+        accumulator = BulkAccumulator(self.store, max_bytes=self.bulk_max_bytes)
+        pages = self._count_fetched(pages, stats)
+
+        # Manifest entries are saved only once their writes have succeeded
+        entries: list[ManifestEntry] = []
+        # Pages that became empty and are deleted from the index
+        removed: list[str] = []
+
+        if self.pipeline:
+            self._run_pipeline(pages, accumulator, stats, entries, removed, force)
+        else:
+            self._run_sequential(pages, accumulator, stats, entries, removed, force)
+
+        accumulator.flush()
+        self.store.refresh()
+
+        # Account for chunks lost in failed embed/bulk requests
+        failed = accumulator.failed_page_ids
+        stats["pages_processed"] -= len(failed.difference(removed))
+        stats["pages_removed"] -= len(failed.intersection(removed))
+        stats["chunks_indexed"] -= accumulator.failed_chunks
+        stats["chunks_deleted"] += accumulator.stale_deleted
+        stats["errors"] += len(failed)
+        stats.update(accumulator.stats)
+
+        if self.manifest:
+            self.manifest.put_many([e for e in entries if e.page_id not in failed])
+            # Failed pages are fully reindexed on the next run
+            self.manifest.delete_many(list(failed.union(removed)))
+
+        # Invalidate query caches of running bots
+        if stats["pages_processed"] or stats["chunks_deleted"] or stats["pages_removed"]:
+            stats["index_generation"] = self.store.bump_generation()
+
+        return stats
 
+    @staticmethod
+    def _count_fetched(
+        pages: Iterable[ConfluencePage], stats: dict
+    ) -> Iterator[ConfluencePage]:
+        """Count pages as they stream through"""
         for page in pages:
-            try:
-                # Convert HTML to markdown and plain text
-                markdown = self.converter.to_markdown(page.html_content)
-                plain_text = self.converter.to_plain_text(page.html_content)
+            stats["pages_fetched"] += 1
+            yield page
 
-                if not plain_text.strip():
-                    logger.warning(f"Skipping empty page: {page.title}")
+    def _is_same_version(self, page: ConfluencePage, force: bool) -> bool:
+        """Check whether the page version matches the manifest (no conversion needed)"""
+        if force or not self.manifest or not page.version:
+            return False
+        entry = self.manifest.get(page.id)
+        return entry is not None and entry.version == page.version
+
+    def _plan_page(
+        self,
+        page: ConfluencePage,
+        page_hash: str,
+        chunks: list[DocumentChunk],
+        force: bool,
+    ) -> PagePlan:
+        """Diff a converted page against the manifest
+
+        Chunks whose content hash is unchanged at the same position only get a
+        partial update; chunk ids past the new chunk count are deleted. Pages
+        without a manifest entry are rewritten, and their leftover chunk ids
+        are deleted in a batched lookup at bulk time instead of a per-page
+        delete_by_query.
+        """
+        hashes = [chunk_hash(chunk.content) for chunk in chunks]
+        entry = ManifestEntry(
+            page_id=page.id,
+            version=page.version,
+            content_hash=page_hash,
+            chunk_hashes=hashes,
+        )
+        previous = self.manifest.get(page.id) if self.manifest and not force else None
+
+        if previous is None:
+            # Unknown or forced page: replace all of its existing chunks
+            return PagePlan(
+                page=page,
+                entry=entry,
+                parent=chunks[0],
+                embed=chunks,
+                replace=not self._fresh_index,
+            )
+
+        if previous.content_hash == page_hash:
+            return PagePlan(page=page, entry=entry, parent=chunks[0])
+
+        plan = PagePlan(page=page, entry=entry, parent=chunks[0])
+        for chunk, new_hash in zip(chunks, hashes):
+            index = chunk.chunk_index
+            if index < len(previous.chunk_hashes) and previous.chunk_hashes[index] == new_hash:
+                plan.update.append(chunk)
+            else:
+                plan.embed.append(chunk)
+
+        plan.stale_ids = [
+            f"{page.id}_{index}"
+            for index in range(len(chunks), len(previous.chunk_hashes))
+        ]
+        return plan
+
+    def _chunk_ids(self, chunks: list[DocumentChunk]) -> set[str]:
+        """Document ids of a page's chunks"""
+        return {self.store.chunk_id(chunk) for chunk in chunks}
+
+    def _record_plan(self, plan: PagePlan, stats: dict, entries: list[ManifestEntry]) -> bool:
+        """Update stats for a planned page; returns False if nothing needs writing"""
+        entries.append(plan.entry)
+
+        if not (plan.embed or plan.update or plan.stale_ids):
+            stats["pages_unchanged"] += 1
+            logger.debug(f"Unchanged page '{plan.page.title}'")
+            return False
+
+        stats["pages_processed"] += 1
+        stats["chunks_indexed"] += len(plan.embed)
+        stats["chunks_updated"] += len(plan.update)
+        stats["chunks_deleted"] += len(plan.stale_ids)
+        logger.debug(
+            f"Queued page '{plan.page.title}': {len(plan.embed)} new, "
+            f"{len(plan.update)} unchanged, {len(plan.stale_ids)} stale chunks"
+        )
+        return True
+
+    def _remove_page(
+        self,
+        page: ConfluencePage,
+        accumulator: BulkAccumulator,
+        stats: dict,
+        removed: list[str],
+    ) -> None:
+        """Queue deletion of an emptied page's chunks and parent document"""
+        logger.warning(f"Removing empty page: {page.title}")
+        accumulator.add_removal(page.id)
+        removed.append(page.id)
+        stats["pages_removed"] += 1
+
+    def _run_sequential(
+        self,
+        pages: Iterable[ConfluencePage],
+        accumulator: BulkAccumulator,
+        stats: dict,
+        entries: list[ManifestEntry],
+        removed: list[str],
+        force: bool,
+    ) -> None:
+        """Convert and chunk pages one by one, batching embeds and bulks"""
+        for page in pages:
+            try:
+                if self._is_same_version(page, force):
+                    stats["pages_unchanged"] += 1
                     continue
 
-                # Chunk the document
-                chunks = self.chunker.chunk_document(
-                    page_id=page.id,
-                    title=page.title,
-                    url=page.url,
-                    plain_text=plain_text,
-                    markdown=markdown,
-                )
+                # Convert and chunk the document
+                page_hash, chunks = _prepare_page(page, self.chunker)
 
                 if not chunks:
+                    self._remove_page(page, accumulator, stats, removed)
                     continue
 
-                # Index chunks
-                self.opensearch.index_chunks(chunks)
-
-                stats["pages_processed"] += 1
-                stats["chunks_indexed"] += len(chunks)
+                plan = self._plan_page(page, page_hash, chunks, force)
+                if not self._record_plan(plan, stats, entries):
+                    continue
 
-                logger.debug(f"Indexed page '{page.title}' with {len(chunks)} chunks")
+                # Queue chunks for batched embedding and indexing
+                accumulator.add_parent(plan.parent)
+                accumulator.add(plan.embed)
+                accumulator.add_updates(plan.update)
+                accumulator.add_deletes(page.id, plan.stale_ids)
+                if plan.replace:
+                    accumulator.add_replace(page.id, self._chunk_ids(plan.embed))
 
             except Exception as e:
                 logger.error(f"Error processing page '{page.title}': {e}")
                 stats["errors"] += 1
 
-        return stats
+    def _run_pipeline(
+        self,
+        pages: Iterable[ConfluencePage],
+        accumulator: BulkAccumulator,
+        stats: dict,
+        entries: list[ManifestEntry],
+        removed: list[str],
+        force: bool,
+    ) -> None:
+        """Process pages with concurrent convert, embed and bulk stages
+
+        Conversion runs on a process pool, embedding on a pool of threads, and
+        bulk writes on the calling thread. Stages are connected by bounded
+        queues so no stage runs far ahead of the others.
+        """
+        queue_size = settings.index_queue_size
+        convert_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        write_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        feed_errors: list[Exception] = []
+
+        with ProcessPoolExecutor(max_workers=self.convert_workers) as executor:
+
+            def feed():
+                # Bounded queue limits the number of in-flight conversions
+                try:
+                    for page in pages:
+                        if self._is_same_version(page, force):
+                            convert_queue.put((page, None))
+                        else:
+                            convert_queue.put((page, executor.submit(_prepare_page, page)))
+                except Exception as e:
+                    feed_errors.append(e)
+                finally:
+                    for _ in range(self.embed_workers):
+                        convert_queue.put(None)
+
+            def embed():
+                # Group small pages into one embedding request
+                pending: list[PagePlan] = []
+                pending_chunks = 0
+
+                while True:
+                    if pending and (
+                        pending_chunks >= accumulator.embed_batch_size
+                        or convert_queue.empty()
+                    ):
+                        self._embed_plans(pending, write_queue)
+                        pending, pending_chunks = [], 0
+
+                    item = convert_queue.get()
+                    if item is None:
+                        break
+
+                    page, future = item
+                    if future is None:
+                        write_queue.put(("unchanged", page, None, None))
+                        continue
+
+                    try:
+                        page_hash, chunks = future.result()
+                        if not chunks:
+                            write_queue.put(("empty", page, None, None))
+                            continue
+                        plan = self._plan_page(page, page_hash, chunks, force)
+                    except Exception as e:
+                        write_queue.put(("error", page, e, None))
+                        continue
+
+                    pending.append(plan)
+                    pending_chunks += len(plan.embed)
+
+                if pending:
+                    self._embed_plans(pending, write_queue)
+                write_queue.put(None)
+
+            workers = [threading.Thread(target=feed, daemon=True)]
+            workers += [
+                threading.Thread(target=embed, daemon=True)
+                for _ in range(self.embed_workers)
+            ]
+            for worker in workers:
+                worker.start()
+
+            finished = 0
+            while finished < self.embed_workers:
+                item = write_queue.get()
+                if item is None:
+                    finished += 1
+                    continue
+
+                status, page, payload, embeddings = item
+                if status == "unchanged":
+                    stats["pages_unchanged"] += 1
+                elif status == "empty":
+                    self._remove_page(page, accumulator, stats, removed)
+                elif status == "error":
+                    logger.error(f"Error processing page '{page.title}': {payload}")
+                    stats["errors"] += 1
+                elif self._record_plan(payload, stats, entries):
+                    accumulator.add_parent(payload.parent)
+                    accumulator.add_embedded(payload.embed, embeddings)
+                    accumulator.add_updates(payload.update)
+                    accumulator.add_deletes(page.id, payload.stale_ids)
+                    if payload.replace:
+                        accumulator.add_replace(page.id, self._chunk_ids(payload.embed))
+
+            for worker in workers:
+                worker.join()
+
+        # Surface fetch failures the same way as in sequential mode
+        if feed_errors:
+            raise feed_errors[0]
+
+    def _embed_plans(self, plans: list[PagePlan], write_queue: queue.Queue) -> None:
+        """Embed changed chunks of several pages in one request and hand them to the writer"""
+        chunks = [chunk for plan in plans for chunk in plan.embed]
+        try:
+            embeddings = self.store.embed_chunks(chunks) if chunks else []
+        except Exception as e:
+            for plan in plans:
+                write_queue.put(("error", plan.page, e, None))
+            return
+
+        offset = 0
+        for plan in plans:
+            page_embeddings = embeddings[offset : offset + len(plan.embed)]
+            offset += len(plan.embed)
+            write_queue.put(("ok", plan.page, plan, page_embeddings))
 
     def reindex_page(self, page_id: str) -> bool:
         """Reindex a single page by ID"""
@@ -128,11 +597,9 @@ class BatchIndexer:
                 logger.warning(f"Page not found: {page_id}")
                 return False
 
-            # Delete existing chunks
-            self.opensearch.delete_by_page_id(page_id)
-
-            # Process and index
-            self._process_pages([page])
+            # Forced processing overwrites the page and deletes leftover chunks
+            self._fresh_index = False
+            self._process_pages([page], force=True)
             return True
 
         except Exception as e:
@@ -0,0 +1,139 @@
+"""Per-page manifest for change detection during indexing"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+
+def content_hash(title: str, plain_text: str) -> str:
+    """Hash of a page's title and whitespace-normalized plain text"""
+    normalized = " ".join(plain_text.split())
+    return hashlib.sha256(f"{title}\0{normalized}".encode("utf-8")).hexdigest()
+
+
+def chunk_hash(content: str) -> str:
+    """Hash of a single chunk's content"""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    """Indexed state of a page"""
+
+    page_id: str
+    version: int
+    content_hash: str
+    chunk_hashes: list[str]
+
+
+class PageManifest:
+    """SQLite-backed record of what has been indexed for each page
+
+    Entries are scoped by index name so that several indexes can share one
+    manifest file.
+    """
+
+    def __init__(self, path: str, index_name: str):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.index_name = index_name
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                index_name TEXT NOT NULL,
+                page_id TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                chunk_hashes TEXT NOT NULL,
+                PRIMARY KEY (index_name, page_id)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, page_id: str) -> ManifestEntry | None:
+        """Return the manifest entry for a page"""
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT version, content_hash, chunk_hashes FROM pages
+                WHERE index_name = ? AND page_id = ?
+                """,
+                (self.index_name, page_id),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        version, page_hash, chunk_hashes = row
+        return ManifestEntry(
+            page_id=page_id,
+            version=version,
+            content_hash=page_hash,
+            chunk_hashes=json.loads(chunk_hashes),
+        )
+
+    def put_many(self, entries: list[ManifestEntry]) -> None:
+        """Insert or replace entries"""
+        if not entries:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO pages
+                (index_name, page_id, version, content_hash, chunk_hashes)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        self.index_name,
+                        entry.page_id,
+                        entry.version,
+                        entry.content_hash,
+                        json.dumps(entry.chunk_hashes),
+                    )
+                    for entry in entries
+                ],
+            )
+            self._conn.commit()
+
+    def delete_many(self, page_ids: list[str]) -> None:
+        """Forget the given pages"""
+        if not page_ids:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM pages WHERE index_name = ? AND page_id = ?",
+                [(self.index_name, page_id) for page_id in page_ids],
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Forget every page of this index"""
+        with self._lock:
+            self._conn.execute("DELETE FROM pages WHERE index_name = ?", (self.index_name,))
+            self._conn.commit()
+
+    def adopt(self, index_name: str) -> None:
+        """Replace this index's entries with those recorded for another index"""
+        with self._lock:
+            self._conn.execute("DELETE FROM pages WHERE index_name = ?", (self.index_name,))
+            self._conn.execute(
+                "UPDATE pages SET index_name = ? WHERE index_name = ?",
+                (self.index_name, index_name),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
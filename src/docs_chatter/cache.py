@@ -0,0 +1,284 @@
+"""Query caches shared by the RAG pipeline"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable
+
+from docs_chatter.config import settings
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query text for use as a cache key"""
+    text = unicodedata.normalize("NFKC", query).casefold()
+    return " ".join(text.split()).strip(" ?!.。")
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after ``ttl`` seconds"""
+
+    shared = False
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._data.clear()
+
+    @property
+    def stats(self) -> dict:
+        """Return hit/miss counters"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._data),
+        }
+
+
+def _encode_key(key: Hashable) -> str:
+    """Stable string form of a cache key for shared backends"""
+    raw = json.dumps(key, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SQLiteTTLCache:
+    """TTL cache in a SQLite file shared by processes on the same host
+
+    Values must be JSON-serializable. Put the file on tmpfs (e.g. /dev/shm)
+    to keep it in shared memory.
+    """
+
+    shared = True
+
+    def __init__(self, path: str, namespace: str, max_size: int, ttl: float):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries (namespace, last_used)"
+        )
+        self._conn.commit()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value, or None if missing or expired"""
+        now = time.time()
+        encoded = _encode_key(key)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE namespace = ? AND key = ? AND expires >= ?",
+                (self.namespace, encoded, now),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE entries SET last_used = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, encoded),
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(row[0])
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting expired and least-recently-used entries"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO entries (namespace, key, value, expires, last_used)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (self.namespace, _encode_key(key), json.dumps(value), now + self.ttl, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        (count,) = self._conn.execute(
+            "SELECT COUNT(*) FROM entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        if count <= self.max_size:
+            return
+
+        self._conn.execute(
+            "DELETE FROM entries WHERE namespace = ? AND expires < ?", (self.namespace, now)
+        )
+        (count,) = self._conn.execute(
+            "SELECT COUNT(*) FROM entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        overflow = count - self.max_size
+        if overflow > 0:
+            self._conn.execute(
+                """
+                DELETE FROM entries WHERE namespace = ? AND key IN (
+                    SELECT key FROM entries WHERE namespace = ?
+                    ORDER BY last_used ASC LIMIT ?
+                )
+                """,
+                (self.namespace, self.namespace, overflow),
+            )
+
+    def clear(self) -> None:
+        """Drop all entries of this namespace"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE namespace = ?", (self.namespace,))
+            self._conn.commit()
+
+    @property
+    def stats(self) -> dict:
+        """Return hit/miss counters of this process"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class RedisCache:
+    """TTL cache in a Redis-compatible store shared by any number of processes
+
+    Values must be JSON-serializable. Size is bounded by the server's
+    maxmemory policy rather than an entry count.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, namespace: str, ttl: float):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError(
+                "CACHE_BACKEND=redis requires the redis package: pip install 'docs-chatter[redis]'"
+            ) from e
+
+        self.client = redis.Redis.from_url(url)
+        self.namespace = namespace
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key: Hashable) -> str:
+        return f"docs-chatter:{self.namespace}:{_encode_key(key)}"
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value, or None if missing or expired"""
+        value = self.client.get(self._key(key))
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value with the cache TTL"""
+        self.client.set(self._key(key), json.dumps(value), ex=max(1, int(self.ttl)))
+
+    def get_many(self, keys: list[Hashable]) -> list[Any | None]:
+        """Return the cached values of several keys in one round trip"""
+        if not keys:
+            return []
+        values = self.client.mget([self._key(key) for key in keys])
+        self.hits += sum(value is not None for value in values)
+        self.misses += sum(value is None for value in values)
+        return [json.loads(value) if value is not None else None for value in values]
+
+    def set_many(self, values: dict[Hashable, Any]) -> None:
+        """Store several values with the cache TTL in one round trip"""
+        pipeline = self.client.pipeline(transaction=False)
+        for key, value in values.items():
+            pipeline.set(self._key(key), json.dumps(value), ex=max(1, int(self.ttl)))
+        pipeline.execute()
+
+    def clear(self) -> None:
+        """Drop all entries of this namespace"""
+        keys = list(self.client.scan_iter(match=f"docs-chatter:{self.namespace}:*", count=1000))
+        for i in range(0, len(keys), 1000):
+            self.client.delete(*keys[i : i + 1000])
+
+    @property
+    def stats(self) -> dict:
+        """Return hit/miss counters of this process"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def create_cache(namespace: str, max_size: int, ttl: float):
+    """Create a query cache on the configured backend
+
+    "memory" keeps entries in this process, "sqlite" shares them between
+    processes on one host through SHARED_CACHE_PATH, and "redis" shares
+    them through REDIS_URL.
+    """
+    backend = settings.cache_backend
+    if backend == "memory":
+        return TTLCache(max_size, ttl)
+    if backend == "sqlite":
+        return SQLiteTTLCache(settings.shared_cache_path, namespace, max_size, ttl)
+    if backend == "redis":
+        return RedisCache(settings.redis_url, namespace, ttl)
+    raise ValueError(f"Unknown cache backend: {backend}")
@@ -17,6 +17,14 @@ class Settings(BaseSettings):
     confluence_username: str
     confluence_api_token: str
     confluence_space_keys: str  # comma-separated: "SPACE1,SPACE2"
+    confluence_concurrency: int = 8  # async fetcher only
+    confluence_rate_limit: float = 10.0  # requests per second
+    confluence_max_retries: int = 5
+
+    # Vector store: "opensearch" or "embedded" (local files, single host)
+    vector_store: str = "opensearch"
+    embedded_store_path: str = "~/.local/share/docs-chatter/vectors"
+    embedded_vector_dtype: str = "float16"  # or "float32"
 
     # OpenSearch
     opensearch_host: str = "localhost"
@@ -26,9 +34,22 @@ class Settings(BaseSettings):
     opensearch_index: str = "wise-chatter"
     opensearch_use_ssl: bool = True
     opensearch_verify_certs: bool = False
+    opensearch_shards: int = 1  # primary shards of new index versions
+    opensearch_replicas: int = 0  # replica copies, for read scaling and failover
+
+    # k-NN vector field, applied when an index is created or migrated
+    knn_engine: str = "faiss"  # "faiss", "lucene" or "nmslib"
+    knn_space_type: str = "innerproduct"  # embeddings are unit length
+    knn_compression: str = "none"  # "none", "fp16", "byte" or "pq"
+    knn_pq_m: int = 128  # PQ sub-vectors, must divide the embedding dimension
+    knn_m: int = 16  # HNSW links per vector
+    knn_ef_construction: int = 100  # HNSW candidate list size while indexing
+    knn_ef_search: int = 100  # HNSW candidate list size while searching (faiss, nmslib)
 
     # Cohere (Embedding)
     cohere_api_key: str
+    embedding_cache_path: str = "~/.cache/docs-chatter/embeddings.db"  # empty to disable
+    embedding_cache_max_entries: int = 500_000
 
     # Anthropic (LLM)
     anthropic_api_key: str
@@ -37,18 +58,73 @@ class Settings(BaseSettings):
     slack_bot_token: str
     slack_app_token: str
     slack_signing_secret: str
+    slack_update_interval: float = 1.0  # seconds between streamed message edits
+    slack_workers: int = 16  # questions answered concurrently
+    slack_queue_size: int = 100  # questions waiting before new ones are rejected
+    slack_max_pending_per_user: int = 3
+    slack_api_url: str = ""  # Slack Web API base URL override, for load tests
+    bot_worker_processes: int = 0  # processes answering questions, 0 to answer in the bot process
+    slack_debug: bool = False  # append per-stage timings and counters to answers
 
     # RAG Settings
     chunk_size: int = 800
     chunk_overlap: int = 100
     search_top_k: int = 30
     relevance_threshold: float = 60.0
-    score_threshold: float = 0.3
+    score_threshold: float = 0.3  # on fused scores, in [0, 1] for rrf and min_max
+    hybrid_fusion: str = "min_max"  # "rrf", "min_max" or "z_score"
+    hybrid_lexical_weight: float = 0.5  # the vector side gets the rest
+    hybrid_rrf_rank_constant: int = 60
+    hybrid_candidates: int = 0  # candidates per sub-query, 0 to use SEARCH_TOP_K
+    hybrid_server_fusion: bool = True  # fuse in an OpenSearch search pipeline when available
     max_context_docs: int = 10
+    relevance_mode: str = "pointwise"  # "pointwise" or "listwise"
+    relevance_batch_size: int = 5  # documents per listwise request
+    relevance_concurrency: int = 8  # in-flight grading requests per question
+    relevance_confident_score: float = 80.0  # stop grading once max_context_docs reach this, 0 to disable
+    rerank_top_m: int = 15  # candidates kept for LLM grading, 0 to keep all
+    rerank_lexical_weight: float = 0.5  # BM25 weight vs search score
+    rerank_skip_llm_confidence: float = 0.0  # query-term coverage to skip LLM grading, 0 to disable
+
+    # Query Caches
+    cache_backend: str = "memory"  # "memory" (per process), "sqlite" (per host) or "redis"
+    shared_cache_path: str = "~/.cache/docs-chatter/shared.db"  # use /dev/shm to keep it in memory
+    redis_url: str = "redis://localhost:6379/0"
+    query_cache_size: int = 1024
+    query_cache_ttl: float = 3600.0  # seconds
+    index_generation_check_interval: float = 30.0  # seconds
+    relevance_cache_path: str = "~/.cache/docs-chatter/relevance.db"  # empty to disable
+    relevance_cache_ttl: float = 7 * 24 * 3600.0  # seconds
+    relevance_cache_max_entries: int = 100_000
+    answer_cache_size: int = 0  # semantic answer cache entries per process, 0 (default) disables
+    answer_cache_threshold: float = 0.95  # cosine similarity to reuse an answer
+    answer_cache_ttl: float = 24 * 3600.0  # seconds
+
+    # Batch Indexing
+    index_manifest_path: str = "~/.cache/docs-chatter/manifest.db"  # empty to disable
+    index_convert_workers: int = 4
+    index_embed_workers: int = 4
+    index_queue_size: int = 32
+    index_bulk_max_docs: int = 1000
+    index_bulk_max_bytes: int = 10 * 1024 * 1024
+    index_flush_interval: float = 30.0  # seconds
+    index_rebuild_min_ratio: float = 0.9  # rebuilt chunks vs live chunks required to switch
+    index_rebuild_max_error_rate: float = 0.01  # share of failed pages allowed in a rebuild
+    index_keep_versions: int = 2  # previous index versions kept for rollback
+    index_force_merge_segments: int = 1
+    index_force_merge_timeout: float = 3600.0  # seconds
 
     # LLM Settings
     llm_temperature: float = 0.0
     llm_max_tokens: int = 4096
+    llm_timeout: float = 60.0  # seconds
+    anthropic_base_url: str = ""  # e.g. http://localhost:8091 for scripts/fake_llm.py
+    relevance_llm_concurrency: int = 16  # concurrent grading requests per process
+    answer_llm_concurrency: int = 8  # concurrent answer requests per process
+
+    # Metrics
+    metrics_port: int = 0  # Prometheus /metrics port, 0 to disable; worker N serves port + N + 1
+    otel_enabled: bool = False  # forward spans to the OpenTelemetry tracer provider
 
     @property
     def space_keys_list(self) -> list[str]:
@@ -1,4 +1,5 @@
 from .client import ConfluenceClient
+from .async_client import AsyncConfluenceClient
 from .converter import HTMLConverter
 
-__all__ = ["ConfluenceClient", "HTMLConverter"]
+__all__ = ["ConfluenceClient", "AsyncConfluenceClient", "HTMLConverter"]
@@ -0,0 +1,275 @@
+"""Asynchronous Confluence client with parallel pagination"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+
+import httpx
+
+from docs_chatter.config import settings
+from docs_chatter.confluence.client import ConfluenceClient, ConfluencePage
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+PAGE_EXPAND = "body.storage,version,history"
+
+
+class RateLimiter:
+    """Space requests evenly to stay under a requests-per-second limit"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class AsyncConfluenceClient:
+    """Asyncio-based Confluence client using a pooled HTTP session
+
+    Several pagination windows and spaces are fetched in parallel, bounded
+    by a concurrency semaphore and a rate limiter. Requests failing with
+    429/5xx are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        concurrency: int | None = None,
+        rate_limit: float | None = None,
+        max_retries: int | None = None,
+    ):
+        self.concurrency = concurrency or settings.confluence_concurrency
+        self.max_retries = max_retries or settings.confluence_max_retries
+        self.rate_limit = rate_limit or settings.confluence_rate_limit
+        self.limit = 50
+
+        base_url = settings.confluence_url.rstrip("/")
+        if not base_url.endswith("/wiki"):
+            base_url += "/wiki"
+        self.base_url = base_url
+
+        # Created lazily so they bind to the running event loop
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._rate_limiter: RateLimiter | None = None
+
+    async def __aenter__(self) -> "AsyncConfluenceClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP session"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _session(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                auth=(settings.confluence_username, settings.confluence_api_token),
+                limits=httpx.Limits(
+                    max_connections=self.concurrency,
+                    max_keepalive_connections=self.concurrency,
+                ),
+                timeout=httpx.Timeout(30.0),
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._rate_limiter = RateLimiter(self.rate_limit)
+        return self._client
+
+    async def _get(self, path: str, params: dict) -> dict:
+        """GET a JSON resource with retry and backoff on 429/5xx"""
+        client = self._session()
+
+        for attempt in range(self.max_retries + 1):
+            async with self._semaphore:
+                await self._rate_limiter.acquire()
+                try:
+                    response = await client.get(path, params=params)
+                except httpx.TransportError as e:
+                    if attempt == self.max_retries:
+                        raise
+                    delay = 2**attempt
+                    logger.warning(f"Request to {path} failed ({e}), retrying in {delay}s")
+                else:
+                    if response.status_code not in RETRY_STATUS_CODES:
+                        response.raise_for_status()
+                        return response.json()
+                    if attempt == self.max_retries:
+                        response.raise_for_status()
+
+                    retry_after = response.headers.get("Retry-After", "")
+                    delay = float(retry_after) if retry_after.isdigit() else 2**attempt
+                    logger.warning(
+                        f"Request to {path} returned {response.status_code}, "
+                        f"retrying in {delay}s"
+                    )
+
+            await asyncio.sleep(delay)
+
+        raise RuntimeError("unreachable")
+
+    async def _paginate(self, path: str, params: dict) -> AsyncIterator[dict]:
+        """Yield raw results, fetching several pagination windows at a time"""
+        first = await self._get(path, {**params, "start": 0, "limit": self.limit})
+        results = first.get("results", [])
+        for result in results:
+            yield result
+        if len(results) < self.limit:
+            return
+
+        start = self.limit
+        total = first.get("totalSize")
+
+        while total is None or start < total:
+            # Without a total, fetch windows speculatively until one is short
+            if total is None:
+                offsets = [start + i * self.limit for i in range(self.concurrency)]
+            else:
+                offsets = list(range(start, total, self.limit))[: self.concurrency]
+
+            windows = await asyncio.gather(
+                *(
+                    self._get(path, {**params, "start": offset, "limit": self.limit})
+                    for offset in offsets
+                )
+            )
+
+            for window in windows:
+                results = window.get("results", [])
+                for result in results:
+                    yield result
+                if len(results) < self.limit:
+                    return
+
+            start = offsets[-1] + self.limit
+
+    async def aiter_pages_in_space(self, space_key: str) -> AsyncIterator[ConfluencePage]:
+        """Yield all pages in a space"""
+        params = {"spaceKey": space_key, "type": "page", "expand": PAGE_EXPAND}
+        async for result in self._paginate("/rest/api/content", params):
+            yield ConfluenceClient._parse_page(result, space_key)
+
+    async def aiter_updated_pages_since(
+        self, space_key: str, since: str
+    ) -> AsyncIterator[ConfluencePage]:
+        """Yield pages updated since a given date (ISO format)"""
+        cql = f'space = "{space_key}" AND lastModified >= "{since}"'
+        params = {"cql": cql, "expand": PAGE_EXPAND}
+        async for result in self._paginate("/rest/api/content/search", params):
+            yield ConfluenceClient._parse_page(result, space_key)
+
+    async def aiter_all_pages(self) -> AsyncIterator[ConfluencePage]:
+        """Yield all pages from configured spaces, fetching spaces in parallel"""
+        async for page in self._merge_spaces(self.aiter_pages_in_space):
+            yield page
+
+    async def aiter_updated_pages(self, since: str) -> AsyncIterator[ConfluencePage]:
+        """Yield updated pages from configured spaces, fetching spaces in parallel"""
+        async for page in self._merge_spaces(
+            lambda space_key: self.aiter_updated_pages_since(space_key, since)
+        ):
+            yield page
+
+    async def get_page_by_id(self, page_id: str) -> ConfluencePage | None:
+        """Fetch a single page by ID"""
+        try:
+            page = await self._get(
+                f"/rest/api/content/{page_id}",
+                {"expand": f"{PAGE_EXPAND},space"},
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return None
+            raise
+
+        space_key = page.get("space", {}).get("key", "")
+        return ConfluenceClient._parse_page(page, space_key)
+
+    async def _merge_spaces(
+        self,
+        iter_space: Callable[[str], AsyncIterator[ConfluencePage]],
+    ) -> AsyncIterator[ConfluencePage]:
+        """Run one iterator per space concurrently and merge their pages"""
+        merged: asyncio.Queue = asyncio.Queue(maxsize=self.limit * self.concurrency)
+        done = object()
+
+        async def pump(space_key: str):
+            try:
+                async for page in iter_space(space_key):
+                    await merged.put(page)
+            finally:
+                await merged.put(done)
+
+        tasks = [asyncio.create_task(pump(key)) for key in settings.space_keys_list]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                item = await merged.get()
+                if item is done:
+                    remaining -= 1
+                    continue
+                yield item
+
+            # Propagate fetch errors from any space
+            for task in tasks:
+                task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def iter_all_pages(self) -> Iterator[ConfluencePage]:
+        """Synchronous iterator over aiter_all_pages (runs on a background loop)"""
+        return self._iter_sync(self.aiter_all_pages)
+
+    def iter_updated_pages(self, since: str) -> Iterator[ConfluencePage]:
+        """Synchronous iterator over aiter_updated_pages (runs on a background loop)"""
+        return self._iter_sync(lambda: self.aiter_updated_pages(since))
+
+    def _iter_sync(
+        self,
+        make_iter: Callable[[], AsyncIterator[ConfluencePage]],
+    ) -> Iterator[ConfluencePage]:
+        """Bridge an async page iterator to a bounded synchronous one"""
+        pages: queue.Queue = queue.Queue(maxsize=self.limit * self.concurrency)
+        done = object()
+        errors: list[Exception] = []
+
+        async def pump():
+            try:
+                async for page in make_iter():
+                    await asyncio.to_thread(pages.put, page)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                await self.aclose()
+                await asyncio.to_thread(pages.put, done)
+
+        thread = threading.Thread(target=asyncio.run, args=(pump(),), daemon=True)
+        thread.start()
+
+        while (page := pages.get()) is not done:
+            yield page
+
+        thread.join()
+        if errors:
+            raise errors[0]
@@ -1,5 +1,6 @@
 """Confluence API client for fetching documents"""
 
+from collections.abc import Iterator
 from dataclasses import dataclass
 from atlassian import Confluence
 
@@ -17,6 +18,7 @@ class ConfluencePage:
     html_content: str
     last_modified: str
     author: str
+    version: int = 0
 
 
 class ConfluenceClient:
@@ -32,7 +34,10 @@ class ConfluenceClient:
 
     def get_all_pages_in_space(self, space_key: str) -> list[ConfluencePage]:
         """Fetch all pages in a space"""
-        pages = []
+        return list(self.iter_pages_in_space(space_key))
+
+    def iter_pages_in_space(self, space_key: str) -> Iterator[ConfluencePage]:
+        """Yield all pages in a space as each result page arrives"""
         start = 0
         limit = 50
 
@@ -48,15 +53,13 @@ class ConfluenceClient:
                 break
 
             for page in results:
-                pages.append(self._parse_page(page, space_key))
+                yield self._parse_page(page, space_key)
 
             if len(results) < limit:
                 break
 
             start += limit
 
-        return pages
-
     def get_page_by_id(self, page_id: str) -> ConfluencePage | None:
         """Fetch a single page by ID"""
         page = self.client.get_page_by_id(
@@ -74,8 +77,13 @@ class ConfluenceClient:
         self, space_key: str, since: str
     ) -> list[ConfluencePage]:
         """Fetch pages updated since a given date (ISO format)"""
+        return list(self.iter_updated_pages_since(space_key, since))
+
+    def iter_updated_pages_since(
+        self, space_key: str, since: str
+    ) -> Iterator[ConfluencePage]:
+        """Yield pages updated since a given date as each result page arrives"""
         cql = f'space = "{space_key}" AND lastModified >= "{since}"'
-        pages = []
         start = 0
         limit = 50
 
@@ -91,16 +99,15 @@ class ConfluenceClient:
                 break
 
             for result in results["results"]:
-                pages.append(self._parse_page(result, space_key))
+                yield self._parse_page(result, space_key)
 
             if len(results["results"]) < limit:
                 break
 
             start += limit
 
-        return pages
-
-    def _parse_page(self, page: dict, space_key: str) -> ConfluencePage:
+    @staticmethod
+    def _parse_page(page: dict, space_key: str) -> ConfluencePage:
         """Parse API response into ConfluencePage"""
         page_id = page.get("id", "")
         title = page.get("title", "")
@@ -113,6 +120,7 @@ class ConfluenceClient:
         version = page.get("version", {})
         last_modified = version.get("when", "")
         author = version.get("by", {}).get("displayName", "")
+        version_number = version.get("number", 0)
 
         # Build URL
         base_url = settings.confluence_url.rstrip("/")
@@ -126,12 +134,19 @@ class ConfluenceClient:
             html_content=html_content,
             last_modified=last_modified,
             author=author,
+            version=version_number,
         )
 
     def get_all_pages(self) -> list[ConfluencePage]:
         """Fetch all pages from configured spaces"""
-        all_pages = []
+        return list(self.iter_all_pages())
+
+    def iter_all_pages(self) -> Iterator[ConfluencePage]:
+        """Yield all pages from configured spaces"""
+        for space_key in settings.space_keys_list:
+            yield from self.iter_pages_in_space(space_key)
+
+    def iter_updated_pages(self, since: str) -> Iterator[ConfluencePage]:
+        """Yield pages updated since a given date from configured spaces"""
         for space_key in settings.space_keys_list:
-            pages = self.get_all_pages_in_space(space_key)
-            all_pages.extend(pages)
-        return all_pages
+            yield from self.iter_updated_pages_since(space_key, since)
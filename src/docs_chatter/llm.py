@@ -0,0 +1,73 @@
+"""Shared Anthropic chat models with per-model concurrency limits"""
+
+import asyncio
+import weakref
+from collections.abc import AsyncIterator
+
+from langchain_anthropic import ChatAnthropic
+
+from docs_chatter.config import settings
+
+# Maximum concurrent requests per model name
+_limits: dict[str, int] = {}
+
+# Semaphores per event loop, then per model name
+_semaphores: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]
+] = weakref.WeakKeyDictionary()
+
+
+def chat_model(
+    model: str,
+    max_tokens: int,
+    concurrency: int,
+    temperature: float = 0,
+) -> ChatAnthropic:
+    """Create a chat model and register its concurrency limit
+
+    Models with the same base URL and timeout share one pooled HTTP client
+    (langchain-anthropic caches it), so keep-alive connections are reused
+    across requests and across models.
+    """
+    _limits[model] = concurrency
+    return ChatAnthropic(
+        model=model,
+        api_key=settings.anthropic_api_key,
+        base_url=settings.anthropic_base_url or None,
+        default_request_timeout=settings.llm_timeout,
+        temperature=temperature,
+        max_tokens=max_tokens,
+    )
+
+
+def _semaphore(model: str) -> asyncio.Semaphore:
+    """Return the semaphore limiting requests to a model on the running loop"""
+    loop = asyncio.get_running_loop()
+    semaphores = _semaphores.setdefault(loop, {})
+    if model not in semaphores:
+        semaphores[model] = asyncio.Semaphore(_limits.get(model, 8))
+    return semaphores[model]
+
+
+async def ainvoke(llm: ChatAnthropic, messages: list[dict]):
+    """Invoke a chat model natively async within its concurrency limit"""
+    async with _semaphore(llm.model):
+        return await llm.ainvoke(messages)
+
+
+async def astream(
+    llm: ChatAnthropic,
+    messages: list[dict],
+    usage: dict[str, int] | None = None,
+) -> AsyncIterator[str]:
+    """Stream response text from a chat model within its concurrency limit
+
+    Token counts reported by the stream are added to ``usage`` if given.
+    """
+    async with _semaphore(llm.model):
+        async for chunk in llm.astream(messages):
+            if usage is not None and chunk.usage_metadata:
+                for key in ("input_tokens", "output_tokens"):
+                    usage[key] = usage.get(key, 0) + chunk.usage_metadata.get(key, 0)
+            if chunk.text:
+                yield chunk.text
@@ -0,0 +1,215 @@
+"""Per-stage timing spans, counters and a Prometheus-style metrics endpoint"""
+
+import contextvars
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from docs_chatter.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the stage latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Called with (name, start_time, duration, attributes) for every finished span
+SpanHook = Callable[[str, float, float, dict[str, Any]], None]
+
+
+class Trace:
+    """Spans and counters recorded while answering one question"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.spans: list[dict[str, Any]] = []
+        self.counters: dict[str, float] = {}
+
+    def summary(self) -> dict[str, Any]:
+        """Return total seconds per stage, span counts and counters"""
+        stages: dict[str, dict[str, float]] = {}
+        for span in self.spans:
+            stage = stages.setdefault(span["name"], {"seconds": 0.0, "count": 0})
+            stage["seconds"] += span["duration"]
+            stage["count"] += 1
+        return {
+            "total": time.perf_counter() - self.start,
+            "stages": stages,
+            "counters": dict(self.counters),
+        }
+
+
+class Registry:
+    """Process-wide latency histograms and counters in Prometheus text format"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: dict[str, list] = {}  # stage -> [bucket counts, sum, count]
+        self._counters: dict[str, float] = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = [[0] * len(LATENCY_BUCKETS), 0.0, 0]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    histogram[0][i] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+
+    def increment(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP docs_chatter_stage_seconds Latency of RAG pipeline stages",
+            "# TYPE docs_chatter_stage_seconds histogram",
+        ]
+        with self._lock:
+            for stage, (buckets, total, count) in sorted(self._histograms.items()):
+                for bound, bucket in zip(LATENCY_BUCKETS, buckets):
+                    lines.append(
+                        f'docs_chatter_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {bucket}'
+                    )
+                lines.append(f'docs_chatter_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {count}')
+                lines.append(f'docs_chatter_stage_seconds_sum{{stage="{stage}"}} {total}')
+                lines.append(f'docs_chatter_stage_seconds_count{{stage="{stage}"}} {count}')
+
+            for name, value in sorted(self._counters.items()):
+                lines.append(f"# TYPE docs_chatter_{name}_total counter")
+                lines.append(f"docs_chatter_{name}_total {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+_current: contextvars.ContextVar[Trace | None] = contextvars.ContextVar("trace", default=None)
+_hooks: list[SpanHook] = []
+
+
+def add_span_hook(hook: SpanHook) -> None:
+    """Register a callback receiving every finished span, e.g. to forward it to a tracer"""
+    _hooks.append(hook)
+
+
+@contextmanager
+def trace() -> Iterator[Trace]:
+    """Collect spans and counters of the enclosed work, including threads it starts
+
+    Tasks and ``asyncio.to_thread`` calls copy the current context, so
+    spans recorded there land in the same trace.
+    """
+    current = Trace()
+    token = _current.set(current)
+    try:
+        yield current
+    finally:
+        try:
+            _current.reset(token)
+        except ValueError:
+            # Closed from another context, e.g. an abandoned async generator
+            pass
+
+
+def current_trace() -> Trace | None:
+    """Return the trace of the running question, if any"""
+    return _current.get()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[dict[str, Any]]:
+    """Time a pipeline stage
+
+    Yields the attribute dict so the stage can add results such as counts.
+    """
+    start_time = time.time()
+    start = time.perf_counter()
+    try:
+        yield attributes
+    finally:
+        duration = time.perf_counter() - start
+        registry.observe(name, duration)
+        current = _current.get()
+        if current is not None:
+            current.spans.append({"name": name, "duration": duration, **attributes})
+        for hook in _hooks:
+            try:
+                hook(name, start_time, duration, attributes)
+            except Exception as e:
+                logger.warning(f"Span hook failed: {e}")
+
+
+def record(name: str, value: float = 1) -> None:
+    """Add to a counter, e.g. cache hits, token counts or candidate counts"""
+    registry.increment(name, value)
+    current = _current.get()
+    if current is not None:
+        current.counters[name] = current.counters.get(name, 0) + value
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache hit or miss"""
+    record(f"{cache}_cache_{'hits' if hit else 'misses'}")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        payload = registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve /metrics for Prometheus scraping from a background thread"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    logger.info(f"Serving metrics on http://{host}:{port}/metrics")
+    return server
+
+
+def enable_opentelemetry() -> None:
+    """Forward spans to the globally configured OpenTelemetry tracer provider"""
+    try:
+        from opentelemetry import trace as otel_trace
+    except ImportError as e:
+        raise ImportError(
+            "OTEL_ENABLED requires the opentelemetry-api package: "
+            "pip install 'docs-chatter[otel]'"
+        ) from e
+
+    tracer = otel_trace.get_tracer("docs_chatter")
+
+    def export(name: str, start_time: float, duration: float, attributes: dict[str, Any]):
+        otel_span = tracer.start_span(
+            name,
+            start_time=int(start_time * 1e9),
+            attributes={k: v for k, v in attributes.items() if isinstance(v, (str, int, float, bool))},
+        )
+        otel_span.end(end_time=int((start_time + duration) * 1e9))
+
+    add_span_hook(export)
+
+
+def setup_metrics(port: int | None = None) -> None:
+    """Start exporters enabled in settings"""
+    port = settings.metrics_port if port is None else port
+    if port:
+        start_metrics_server(port)
+    if settings.otel_enabled:
+        enable_opentelemetry()
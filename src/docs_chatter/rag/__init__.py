@@ -1,6 +1,7 @@
 from .chunker import DocumentChunker
 from .retriever import HybridRetriever
 from .relevance import RelevanceEvaluator
+from .reranker import LexicalReranker
 from .chain import RAGChain
 
-__all__ = ["DocumentChunker", "HybridRetriever", "RelevanceEvaluator", "RAGChain"]
+__all__ = ["DocumentChunker", "HybridRetriever", "RelevanceEvaluator", "LexicalReranker", "RAGChain"]
@@ -0,0 +1,106 @@
+"""Semantic cache of answers for near-duplicate questions"""
+
+import threading
+import time
+from typing import Any
+
+import numpy as np
+
+
+class SemanticAnswerCache:
+    """In-memory nearest-neighbour cache keyed by query embedding
+
+    Embeddings are kept L2-normalized in one NumPy matrix, so a lookup is a
+    single matrix-vector product. Slots are reused oldest-first once
+    ``max_entries`` is reached.
+    """
+
+    def __init__(self, max_entries: int, threshold: float, ttl: float):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._vectors: np.ndarray | None = None
+        self._entries: list[dict[str, Any] | None] = [None] * max_entries
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, embedding: list[float]) -> tuple[int, dict[str, Any]] | None:
+        """Return (slot, entry) of the most similar unexpired question above the threshold"""
+        with self._lock:
+            if self._vectors is None:
+                self.misses += 1
+                return None
+
+            query = self._normalize(embedding)
+            similarities = self._vectors @ query
+            slot = int(np.argmax(similarities))
+            entry = self._entries[slot]
+
+            if (
+                entry is None
+                or similarities[slot] < self.threshold
+                or entry["created"] < time.time() - self.ttl
+            ):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return slot, {**entry, "similarity": float(similarities[slot])}
+
+    def store(
+        self,
+        query: str,
+        embedding: list[float],
+        result: dict[str, Any],
+        generation: int,
+        page_hashes: dict[str, str],
+    ) -> None:
+        """Cache an answer with the index generation and hashes of the pages it cites"""
+        vector = self._normalize(embedding)
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+
+            slot = self._next
+            self._next = (self._next + 1) % self.max_entries
+            self._vectors[slot] = vector
+            self._entries[slot] = {
+                "query": query,
+                "result": result,
+                "generation": generation,
+                "page_hashes": page_hashes,
+                "created": time.time(),
+            }
+
+    def revalidate(self, slot: int, generation: int) -> None:
+        """Mark an entry as still valid for a newer index generation"""
+        with self._lock:
+            if self._entries[slot] is not None:
+                self._entries[slot]["generation"] = generation
+
+    def remove(self, slot: int) -> None:
+        """Drop an entry; a zero vector never matches"""
+        with self._lock:
+            self._entries[slot] = None
+            if self._vectors is not None:
+                self._vectors[slot] = 0
+
+    @staticmethod
+    def _normalize(embedding: list[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @property
+    def stats(self) -> dict:
+        """Return hit/miss counters"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": sum(entry is not None for entry in self._entries),
+        }
@@ -2,11 +2,16 @@
 
 import asyncio
 import logging
-from langchain_anthropic import ChatAnthropic
+import time
+from collections.abc import AsyncIterator
 
+from docs_chatter import metrics
 from docs_chatter.config import settings
+from docs_chatter.llm import astream, chat_model
+from docs_chatter.rag.answer_cache import SemanticAnswerCache
 from docs_chatter.rag.retriever import HybridRetriever
 from docs_chatter.rag.relevance import RelevanceEvaluator
+from docs_chatter.rag.reranker import LexicalReranker
 
 logger = logging.getLogger(__name__)
 
@@ -34,12 +39,22 @@ class RAGChain:
 
     def __init__(self):
         self.retriever = HybridRetriever()
+        self.reranker = LexicalReranker()
         self.relevance_evaluator = RelevanceEvaluator()
-        self.llm = ChatAnthropic(
-            model="claude-sonnet-4-20250514",
-            api_key=settings.anthropic_api_key,
-            temperature=settings.llm_temperature,
+        self.llm = chat_model(
+            "claude-sonnet-4-20250514",
             max_tokens=settings.llm_max_tokens,
+            concurrency=settings.answer_llm_concurrency,
+            temperature=settings.llm_temperature,
+        )
+        self.answer_cache = (
+            SemanticAnswerCache(
+                max_entries=settings.answer_cache_size,
+                threshold=settings.answer_cache_threshold,
+                ttl=settings.answer_cache_ttl,
+            )
+            if settings.answer_cache_size
+            else None
         )
 
     async def aquery(self, query: str) -> dict:
@@ -48,50 +63,152 @@ class RAGChain:
         Returns:
             dict with keys: answer, sources, context_docs
         """
+        result = {}
+        async for event in self.aquery_stream(query):
+            if event["type"] == "done":
+                result = event["result"]
+        return result
+
+    async def aquery_stream(self, query: str) -> AsyncIterator[dict]:
+        """Process a query, yielding progress events as the pipeline runs
+
+        Events (by "type"):
+            retrieved: count of retrieved documents
+            relevant: count and sources of documents used as context
+            token: next piece of answer text
+            done: result with the same keys as aquery, plus a "trace" summary
+                of per-stage timings and counters
+        """
+        with metrics.trace() as trace, metrics.span("query"):
+            async for event in self._run_pipeline(query):
+                if event["type"] == "done":
+                    summary = trace.summary()
+                    logger.info(f"Query trace: {summary}")
+                    event = {**event, "result": {**event["result"], "trace": summary}}
+                yield event
+
+    async def _run_pipeline(self, query: str) -> AsyncIterator[dict]:
+        """Yield the events of aquery_stream within the current trace"""
+        # Step 0: Reuse the answer to a near-duplicate question
+        with metrics.span("answer_cache"):
+            cached = await asyncio.to_thread(self._cached_answer, query)
+        if cached is not None:
+            yield {"type": "token", "text": cached["answer"]}
+            yield {"type": "done", "result": cached}
+            return
+
         # Step 1: Retrieve
         logger.info(f"Retrieving documents for query: {query}")
-        retrieved = self.retriever.retrieve(query)
+        with metrics.span("retrieve"):
+            retrieved = await asyncio.to_thread(self.retriever.retrieve, query)
+        yield {"type": "retrieved", "count": len(retrieved)}
 
         if not retrieved:
-            return {
-                "answer": "관련 문서를 찾을 수 없습니다.",
-                "sources": [],
-                "context_docs": [],
+            answer = "관련 문서를 찾을 수 없습니다."
+            yield {"type": "token", "text": answer}
+            yield {
+                "type": "done",
+                "result": {"answer": answer, "sources": [], "context_docs": []},
             }
+            return
 
         logger.info(f"Retrieved {len(retrieved)} documents")
 
-        # Step 2: Relevance evaluation
+        # Step 2: Local rerank to cut candidates before LLM grading (CPU-bound, off the loop)
+        with metrics.span("rerank"):
+            candidates = await asyncio.to_thread(self.reranker.rerank, query, retrieved)
+        metrics.record("reranked_docs", len(candidates))
+        logger.info(f"Reranked to {len(candidates)} candidates")
+
+        # Step 3: Relevance evaluation
         logger.info("Evaluating relevance...")
-        relevant_docs = await self.relevance_evaluator.evaluate_batch(query, retrieved)
+        with metrics.span("relevance"):
+            relevant_docs = await self._evaluate_relevance(query, candidates)
+        metrics.record("relevant_docs", len(relevant_docs))
+
+        # Build sources list
+        sources = [
+            {"title": doc["title"], "url": doc["url"]}
+            for doc in relevant_docs
+        ]
+        yield {"type": "relevant", "count": len(relevant_docs), "sources": sources}
 
         if not relevant_docs:
-            return {
-                "answer": "질문과 관련된 문서를 찾을 수 없습니다.",
-                "sources": [],
-                "context_docs": [],
+            answer = "질문과 관련된 문서를 찾을 수 없습니다."
+            yield {"type": "token", "text": answer}
+            yield {
+                "type": "done",
+                "result": {"answer": answer, "sources": [], "context_docs": []},
             }
+            return
 
-        logger.info(f"Found {len(relevant_docs)} relevant documents")
+        logger.info(
+            f"Found {len(relevant_docs)} relevant documents "
+            f"(relevance cache: {self.relevance_evaluator.cache_stats})"
+        )
 
-        # Step 3: Build context
-        context = self._build_context(relevant_docs)
+        # Step 4: Build context
+        with metrics.span("build_context"):
+            context = self._build_context(relevant_docs)
 
-        # Step 4: Generate answer
+        # Step 5: Generate answer
         logger.info("Generating answer...")
-        answer = await self._generate_answer(query, context)
-
-        # Build sources list
-        sources = [
-            {"title": doc["title"], "url": doc["url"]}
-            for doc in relevant_docs
-        ]
+        parts = []
+        usage: dict[str, int] = {}
+        try:
+            with metrics.span("generate") as span:
+                started = time.perf_counter()
+                async for text in self._stream_answer(query, context, usage):
+                    if not parts:
+                        span["first_token_seconds"] = time.perf_counter() - started
+                    parts.append(text)
+                    yield {"type": "token", "text": text}
+            metrics.record("answer_input_tokens", usage.get("input_tokens", 0))
+            metrics.record("answer_output_tokens", usage.get("output_tokens", 0))
+        except Exception as e:
+            logger.error(f"Error generating answer: {e}")
+            error = f"답변 생성 중 오류가 발생했습니다: {e}"
+            yield {"type": "token", "text": error}
+            yield {
+                "type": "done",
+                "result": {"answer": error, "sources": sources, "context_docs": relevant_docs},
+            }
+            return
 
-        return {
-            "answer": answer,
+        result = {
+            "answer": "".join(parts),
             "sources": sources,
             "context_docs": relevant_docs,
         }
+        await asyncio.to_thread(self._store_answer, query, result)
+        yield {"type": "done", "result": result}
+
+    async def _evaluate_relevance(self, query: str, candidates: list[dict]) -> list[dict]:
+        """Grade candidates with the LLM, accepting lexically confident ones as-is"""
+        confidence = settings.rerank_skip_llm_confidence
+        if not confidence:
+            return await self.relevance_evaluator.evaluate_batch(query, candidates)
+
+        confident = [
+            {
+                **doc,
+                "relevance_score": doc["lexical_coverage"] * 100,
+                "relevance_response": "lexical",
+            }
+            for doc in candidates
+            if doc["lexical_coverage"] >= confidence
+        ]
+        uncertain = [doc for doc in candidates if doc["lexical_coverage"] < confidence]
+        logger.info(f"Skipping LLM grading for {len(confident)} lexically confident documents")
+
+        graded = []
+        if uncertain:
+            graded = await self.relevance_evaluator.evaluate_batch(query, uncertain)
+
+        # Confident documents are relevant whatever RELEVANCE_THRESHOLD is
+        results = confident + graded
+        results.sort(key=lambda x: x["relevance_score"], reverse=True)
+        return results[: settings.max_context_docs]
 
     def query(self, query: str) -> dict:
         """Synchronous wrapper for aquery"""
@@ -108,23 +225,85 @@ class RAGChain:
 
         return "\n".join(context_parts)
 
-    async def _generate_answer(self, query: str, context: str) -> str:
-        """Generate answer using LLM"""
+    async def _stream_answer(
+        self, query: str, context: str, usage: dict[str, int] | None = None
+    ) -> AsyncIterator[str]:
+        """Stream the answer using LLM"""
         user_prompt = USER_PROMPT_TEMPLATE.format(
             query=query,
             context=context,
         )
 
+        async for text in astream(
+            self.llm,
+            [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt},
+            ],
+            usage,
+        ):
+            yield text
+
+    def _cached_answer(self, query: str) -> dict | None:
+        """Return the cached answer of a similar question if its cited pages are unchanged
+
+        Entries from an older index generation are checked against the
+        current content hash of each cited page and kept only if none changed.
+        """
+        if self.answer_cache is None:
+            return None
+
+        store = self.retriever.store
+        try:
+            hit = self.answer_cache.lookup(store.embeddings.embed_query(query))
+            if hit is None:
+                metrics.record_cache("answer", False)
+                return None
+
+            slot, entry = hit
+            generation = store.current_generation()
+            if entry["generation"] != generation:
+                page_hashes = entry["page_hashes"]
+                if store.get_page_hashes(list(page_hashes)) != page_hashes:
+                    logger.info(f"Cited pages changed, dropping cached answer for: {entry['query']}")
+                    self.answer_cache.remove(slot)
+                    metrics.record_cache("answer", False)
+                    return None
+                self.answer_cache.revalidate(slot, generation)
+
+        except Exception as e:
+            logger.warning(f"Answer cache lookup failed: {e}")
+            return None
+
+        metrics.record_cache("answer", True)
+        logger.info(
+            f"Answer cache hit ({entry['similarity']:.3f}) for: {entry['query']} "
+            f"({self.answer_cache.stats})"
+        )
+        return {**entry["result"], "cached": True}
+
+    def _store_answer(self, query: str, result: dict) -> None:
+        """Cache an answer with hashes of the pages it was built from"""
+        if self.answer_cache is None:
+            return
+
+        store = self.retriever.store
         try:
-            response = await asyncio.to_thread(
-                self.llm.invoke,
-                [
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt},
-                ],
+            page_hashes = {
+                doc["page_id"]: store.parent_hash(doc["title"], doc["parent_content"])
+                for doc in result["context_docs"]
+            }
+            # Keep entries small: page markdown is not needed to serve a cached answer
+            context_docs = [
+                {k: v for k, v in doc.items() if k not in ("parent_content", "chunks")}
+                for doc in result["context_docs"]
+            ]
+            self.answer_cache.store(
+                query,
+                store.embeddings.embed_query(query),
+                {**result, "context_docs": context_docs},
+                store.current_generation(),
+                page_hashes,
             )
-            return response.content
-
         except Exception as e:
-            logger.error(f"Error generating answer: {e}")
-            return f"답변 생성 중 오류가 발생했습니다: {e}"
+            logger.warning(f"Failed to cache answer: {e}")
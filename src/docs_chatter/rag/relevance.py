@@ -1,11 +1,17 @@
 """Relevance evaluation using LLM"""
 
 import asyncio
+import json
 import re
 import logging
-from langchain_anthropic import ChatAnthropic
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 
+from docs_chatter import metrics
+from docs_chatter.cache import RedisCache
 from docs_chatter.config import settings
+from docs_chatter.llm import ainvoke, chat_model
+from docs_chatter.rag.relevance_cache import RelevanceCache
 
 logger = logging.getLogger(__name__)
 
@@ -32,23 +38,107 @@ RELEVANCE_USER_PROMPT = """질의(Query): {query}
 
 위 문서가 질의와 얼마나 관련이 있는지 평가해주세요."""
 
+LISTWISE_SYSTEM_PROMPT = """당신은 주어진 질의(Query)와 여러 문서(Document)의 관련성을 평가하는 AI 어시스턴트입니다.
+
+번호가 매겨진 각 문서를 분석하고, 질의와의 관련성 점수를 0(관련 없음)에서 100(매우 관련 있음) 사이로 평가해주세요.
+
+평가 기준:
+- 0-20: 전혀 관련 없음
+- 21-40: 약간의 관련성
+- 41-60: 보통의 관련성
+- 61-80: 높은 관련성
+- 81-100: 매우 높은 관련성 (질문에 직접적인 답변 제공)
+
+각 문서를 독립적으로 평가하고, 다른 설명 없이 아래 형식의 JSON 배열만 응답하세요:
+[{"doc": <문서 번호>, "score": <score>}, ...]"""
+
+LISTWISE_USER_PROMPT = """질의(Query): {query}
+
+{documents}
+
+위 {count}개 문서가 각각 질의와 얼마나 관련이 있는지 평가해주세요."""
+
+LISTWISE_DOCUMENT_TEMPLATE = """[문서 {number}]
+제목: {title}
+내용: {content}
+"""
+
 
 class RelevanceEvaluator:
-    """Evaluate relevance of documents to query using LLM"""
+    """Evaluate relevance of documents to query using LLM
 
-    def __init__(self):
-        self.llm = ChatAnthropic(
-            model="claude-3-5-haiku-latest",
-            api_key=settings.anthropic_api_key,
-            temperature=0,
+    In "pointwise" mode each document is graded in its own request. In
+    "listwise" mode up to ``batch_size`` documents are graded per request,
+    falling back to pointwise grading for documents whose scores cannot be
+    parsed. At most ``concurrency`` requests are in flight per question.
+    """
+
+    def __init__(
+        self,
+        mode: str | None = None,
+        batch_size: int | None = None,
+        concurrency: int | None = None,
+        confident_score: float | None = None,
+    ):
+        self.mode = mode or settings.relevance_mode
+        self.batch_size = batch_size or settings.relevance_batch_size
+        self.concurrency = concurrency or settings.relevance_concurrency
+        self.confident_score = (
+            confident_score if confident_score is not None else settings.relevance_confident_score
+        )
+
+        self.llm = chat_model(
+            "claude-3-5-haiku-latest",
             max_tokens=200,
+            concurrency=settings.relevance_llm_concurrency,
         )
+        self.listwise_llm = chat_model(
+            "claude-3-5-haiku-latest",
+            max_tokens=30 * self.batch_size + 100,
+            concurrency=settings.relevance_llm_concurrency,
+        )
+        if settings.cache_backend == "redis":
+            self.cache = RedisCache(settings.redis_url, "relevance", settings.relevance_cache_ttl)
+        elif settings.relevance_cache_path:
+            # SQLite file, shared by processes on the same host
+            self.cache = RelevanceCache(
+                path=settings.relevance_cache_path,
+                ttl=settings.relevance_cache_ttl,
+                max_entries=settings.relevance_cache_max_entries,
+            )
+        else:
+            self.cache = None
+        self.usage = {"calls": 0, "input_tokens": 0, "output_tokens": 0}
 
     async def evaluate_single(self, query: str, document: dict) -> dict:
         """Evaluate relevance of a single document"""
-        title = document.get("title", "")
-        content = document.get("parent_content", "")[:2000]  # Limit content size
+        # Reuse a previous grade of the same query and content
+        (cached,) = await self._cache_get_many(query, [document])
+        if cached is not None:
+            return cached
 
+        writes: dict[str, tuple[float, str]] = {}
+        result = await self._grade_single(query, document, writes)
+        await self._cache_set_many(writes)
+        return result
+
+    async def evaluate_listwise(self, query: str, documents: list[dict]) -> list[dict]:
+        """Evaluate relevance of several documents in a single request"""
+        results = await self._cache_get_many(query, documents)
+        pending = [i for i, result in enumerate(results) if result is None]
+        if pending:
+            writes: dict[str, tuple[float, str]] = {}
+            graded = await self._grade_listwise(query, [documents[i] for i in pending], writes)
+            await self._cache_set_many(writes)
+            for i, result in zip(pending, graded):
+                results[i] = result
+        return results
+
+    async def _grade_single(
+        self, query: str, document: dict, writes: dict[str, tuple[float, str]]
+    ) -> dict:
+        """Grade one document with the LLM, collecting its cache entry in ``writes``"""
+        title, content = self._excerpt(document)
         user_prompt = RELEVANCE_USER_PROMPT.format(
             query=query,
             title=title,
@@ -56,16 +146,19 @@ class RelevanceEvaluator:
         )
 
         try:
-            response = await asyncio.to_thread(
-                self.llm.invoke,
-                [
-                    {"role": "system", "content": RELEVANCE_SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt},
-                ],
-            )
+            with metrics.span("relevance_call", mode="pointwise", docs=1):
+                response = await ainvoke(
+                    self.llm,
+                    [
+                        {"role": "system", "content": RELEVANCE_SYSTEM_PROMPT},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                )
+            self._record_usage(response)
 
             # Parse score from response
             score = self._parse_score(response.content)
+            writes[RelevanceCache.make_key(query, title, content)] = (score, response.content)
 
             return {
                 **document,
@@ -81,6 +174,111 @@ class RelevanceEvaluator:
                 "relevance_response": str(e),
             }
 
+    async def _grade_listwise(
+        self, query: str, documents: list[dict], writes: dict[str, tuple[float, str]]
+    ) -> list[dict]:
+        """Grade documents with one LLM request, collecting their cache entries in ``writes``"""
+        blocks = []
+        for number, document in enumerate(documents, 1):
+            title, content = self._excerpt(document)
+            blocks.append(
+                LISTWISE_DOCUMENT_TEMPLATE.format(number=number, title=title, content=content)
+            )
+
+        user_prompt = LISTWISE_USER_PROMPT.format(
+            query=query,
+            documents="\n".join(blocks),
+            count=len(documents),
+        )
+
+        scores: dict[int, float] = {}
+        response_text = ""
+        try:
+            with metrics.span("relevance_call", mode="listwise", docs=len(documents)):
+                response = await ainvoke(
+                    self.listwise_llm,
+                    [
+                        {"role": "system", "content": LISTWISE_SYSTEM_PROMPT},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                )
+            self._record_usage(response)
+            response_text = response.content
+            scores = self._parse_listwise_scores(response_text, len(documents))
+        except Exception as e:
+            logger.error(f"Error evaluating relevance (listwise): {e}")
+
+        # Fall back to pointwise grading for documents without a parsed score
+        results: list[dict | None] = [None] * len(documents)
+        fallback = []
+        for number, document in enumerate(documents, 1):
+            if number in scores:
+                key = RelevanceCache.make_key(query, *self._excerpt(document))
+                writes[key] = (scores[number], response_text)
+                results[number - 1] = {
+                    **document,
+                    "relevance_score": scores[number],
+                    "relevance_response": response_text,
+                }
+            else:
+                fallback.append(number - 1)
+
+        if fallback:
+            logger.warning(f"Listwise grading missed {len(fallback)} documents, falling back")
+            graded = await asyncio.gather(
+                *(self._grade_single(query, documents[i], writes) for i in fallback)
+            )
+            for i, result in zip(fallback, graded):
+                results[i] = result
+
+        return results
+
+    async def aiter_evaluate(self, query: str, documents: list[dict]) -> AsyncIterator[dict]:
+        """Yield graded documents as they complete
+
+        Cached grades are looked up for all documents at once and yielded
+        first. The rest are requested in descending search-score order,
+        bounded by the concurrency limit, and their grades are cached in one
+        write at the end. Closing the iterator cancels pending requests.
+        """
+        ordered = sorted(documents, key=self._search_score, reverse=True)
+        cached = await self._cache_get_many(query, ordered)
+        misses = [doc for doc, result in zip(ordered, cached) if result is None]
+        if self.mode == "listwise":
+            # Grade documents in groups of batch_size
+            groups = [
+                misses[i : i + self.batch_size]
+                for i in range(0, len(misses), self.batch_size)
+            ]
+        else:
+            groups = [[doc] for doc in misses]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        writes: dict[str, tuple[float, str]] = {}
+
+        async def grade(group: list[dict]) -> list[dict]:
+            async with semaphore:
+                if self.mode == "listwise":
+                    return await self._grade_listwise(query, group, writes)
+                return [await self._grade_single(query, group[0], writes)]
+
+        tasks = [asyncio.create_task(grade(group)) for group in groups]
+        try:
+            for result in cached:
+                if result is not None:
+                    yield result
+            for next_done in asyncio.as_completed(tasks):
+                for result in await next_done:
+                    yield result
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+                logger.info(f"Cancelled {len(pending)} pending relevance requests")
+            await self._cache_set_many(writes)
+
     async def evaluate_batch(
         self,
         query: str,
@@ -88,13 +286,22 @@ class RelevanceEvaluator:
         threshold: float | None = None,
         max_docs: int | None = None,
     ) -> list[dict]:
-        """Evaluate relevance for multiple documents concurrently"""
+        """Evaluate relevance for multiple documents concurrently
+
+        Stops early once ``max_docs`` documents reach the confident score.
+        """
         threshold = threshold or settings.relevance_threshold
         max_docs = max_docs or settings.max_context_docs
 
-        # Evaluate all documents concurrently
-        tasks = [self.evaluate_single(query, doc) for doc in documents]
-        results = await asyncio.gather(*tasks)
+        results = []
+        confident = 0
+        async with aclosing(self.aiter_evaluate(query, documents)) as stream:
+            async for result in stream:
+                results.append(result)
+                if self.confident_score and result["relevance_score"] >= self.confident_score:
+                    confident += 1
+                    if confident >= max_docs:
+                        break
 
         # Filter by threshold
         filtered = [r for r in results if r["relevance_score"] > threshold]
@@ -105,9 +312,87 @@ class RelevanceEvaluator:
         # Limit to max docs
         return filtered[:max_docs]
 
+    @property
+    def cache_stats(self) -> dict:
+        """Return relevance cache hit/miss counters"""
+        if self.cache is None:
+            return {"hits": 0, "misses": 0, "hit_rate": 0.0}
+        return self.cache.stats
+
+    @staticmethod
+    def _search_score(document: dict) -> float:
+        return document.get("max_score", document.get("_score", 0))
+
+    @staticmethod
+    def _excerpt(document: dict) -> tuple[str, str]:
+        """Return the title and content excerpt sent to the grader"""
+        title = document.get("title", "")
+        content = document.get("parent_content", "")[:2000]  # Limit content size
+        return title, content
+
+    async def _cache_get_many(self, query: str, documents: list[dict]) -> list[dict | None]:
+        """Cached grades of ``documents`` (None where missing), looked up off the event loop"""
+        if self.cache is None:
+            return [None] * len(documents)
+        keys = [RelevanceCache.make_key(query, *self._excerpt(doc)) for doc in documents]
+        values = await asyncio.to_thread(self.cache.get_many, keys)
+
+        results = []
+        for document, value in zip(documents, values):
+            metrics.record_cache("relevance", value is not None)
+            if value is None:
+                results.append(None)
+                continue
+            score, response = value
+            results.append(
+                {**document, "relevance_score": score, "relevance_response": response}
+            )
+        return results
+
+    async def _cache_set_many(self, writes: dict[str, tuple[float, str]]) -> None:
+        """Store collected grades in one write off the event loop"""
+        if self.cache is not None and writes:
+            await asyncio.to_thread(self.cache.set_many, writes)
+
+    def _record_usage(self, response) -> None:
+        """Accumulate LLM call and token counts"""
+        self.usage["calls"] += 1
+        usage = getattr(response, "usage_metadata", None) or {}
+        self.usage["input_tokens"] += usage.get("input_tokens", 0)
+        self.usage["output_tokens"] += usage.get("output_tokens", 0)
+        metrics.record("relevance_calls")
+        metrics.record("relevance_input_tokens", usage.get("input_tokens", 0))
+        metrics.record("relevance_output_tokens", usage.get("output_tokens", 0))
+
     def _parse_score(self, response: str) -> float:
         """Parse relevance score from LLM response"""
         match = re.search(r"Relevance:\s*(\d+)", response)
         if match:
             return float(match.group(1))
         return 0.0
+
+    def _parse_listwise_scores(self, response: str, count: int) -> dict[int, float]:
+        """Parse {doc number: score} from a listwise JSON response
+
+        Entries with out-of-range numbers or scores are dropped so that those
+        documents fall back to pointwise grading.
+        """
+        match = re.search(r"\[.*\]", response, re.DOTALL)
+        if not match:
+            return {}
+
+        try:
+            items = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return {}
+
+        scores = {}
+        for item in items if isinstance(items, list) else []:
+            try:
+                number = int(item["doc"])
+                score = float(item["score"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 1 <= number <= count and 0 <= score <= 100:
+                scores[number] = score
+        return scores
@@ -0,0 +1,169 @@
+"""Persistent cache of LLM relevance scores"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from docs_chatter.cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+
+class RelevanceCache:
+    """SQLite-backed relevance cache keyed by (normalized query, content hash)
+
+    Entries expire after ``ttl`` seconds and are evicted in least-recently-used
+    order once the cache grows past ``max_entries``.
+    """
+
+    def __init__(self, path: str, ttl: float, max_entries: int):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS relevance (
+                key TEXT PRIMARY KEY,
+                score REAL NOT NULL,
+                response TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_relevance_last_used ON relevance (last_used)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(query: str, title: str, content: str) -> str:
+        """Build the cache key from the query and the graded content"""
+        content_hash = hashlib.sha256(f"{title}\0{content}".encode("utf-8")).hexdigest()
+        return hashlib.sha256(
+            f"{normalize_query(query)}\0{content_hash}".encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key: str) -> tuple[float, str] | None:
+        """Return (score, response) if cached and not expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT score, response FROM relevance WHERE key = ? AND created >= ?",
+                (key, now - self.ttl),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE relevance SET last_used = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        return row[0], row[1]
+
+    def get_many(self, keys: list[str]) -> list[tuple[float, str] | None]:
+        """Look up several keys in one transaction, in order"""
+        if not keys:
+            return []
+        now = time.time()
+        placeholders = ", ".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT key, score, response FROM relevance
+                WHERE key IN ({placeholders}) AND created >= ?
+                """,
+                (*keys, now - self.ttl),
+            ).fetchall()
+            found = {key: (score, response) for key, score, response in rows}
+            if found:
+                self._conn.executemany(
+                    "UPDATE relevance SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+            self.hits += sum(key in found for key in keys)
+            self.misses += sum(key not in found for key in keys)
+        return [found.get(key) for key in keys]
+
+    def set_many(self, values: dict[str, tuple[float, str]]) -> None:
+        """Store several (score, response) entries in one transaction"""
+        if not values:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO relevance (key, score, response, created, last_used)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [(key, score, response, now, now) for key, (score, response) in values.items()],
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def set(self, key: str, value: tuple[float, str]) -> None:
+        """Store (score, response), evicting expired and least-recently-used entries"""
+        score, response = value
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO relevance (key, score, response, created, last_used)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (key, score, response, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least-recently-used entries beyond max_entries"""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM relevance").fetchone()
+        if count <= self.max_entries:
+            return
+
+        self._conn.execute("DELETE FROM relevance WHERE created < ?", (now - self.ttl,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM relevance").fetchone()
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+
+        self._conn.execute(
+            """
+            DELETE FROM relevance WHERE key IN (
+                SELECT key FROM relevance ORDER BY last_used ASC LIMIT ?
+            )
+            """,
+            (overflow,),
+        )
+        logger.debug(f"Evicted {overflow} relevance scores from cache")
+
+    @property
+    def stats(self) -> dict:
+        """Return hit/miss counters"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,114 @@
+"""Local lexical reranking before LLM relevance grading"""
+
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+from docs_chatter.config import settings
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase words plus character bigrams of longer words
+
+    Bigrams let Korean words match across particles and endings
+    (e.g. "휴가를" and "휴가") without a morphological analyzer.
+    """
+    tokens = []
+    for word in WORD_PATTERN.findall(text.lower()):
+        tokens.append(word)
+        if len(word) > 2:
+            tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class LexicalReranker:
+    """Rerank retrieved pages with BM25 over the candidate set
+
+    The final score blends the normalized BM25 score with the normalized
+    search score. ``lexical_coverage`` (share of query terms found in the page)
+    is an absolute 0-1 confidence used to skip LLM grading.
+    """
+
+    def __init__(
+        self,
+        top_m: int | None = None,
+        lexical_weight: float | None = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.top_m = top_m if top_m is not None else settings.rerank_top_m
+        self.lexical_weight = (
+            lexical_weight if lexical_weight is not None else settings.rerank_lexical_weight
+        )
+        self.k1 = k1
+        self.b = b
+
+    def score(self, query: str, documents: list[dict]) -> list[dict]:
+        """Return documents with rerank_score and lexical_coverage, best first"""
+        if not documents:
+            return []
+
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        doc_tokens = [tokenize(self._text(doc)) for doc in documents]
+
+        if query_terms:
+            bm25, coverage = self._bm25(query_terms, doc_tokens)
+        else:
+            bm25 = coverage = np.zeros(len(documents))
+
+        search = np.array([doc.get("max_score", 0.0) for doc in documents], dtype=float)
+        combined = (
+            self.lexical_weight * self._normalize(bm25)
+            + (1 - self.lexical_weight) * self._normalize(search)
+        )
+
+        scored = [
+            {**doc, "rerank_score": float(combined[i]), "lexical_coverage": float(coverage[i])}
+            for i, doc in enumerate(documents)
+        ]
+        scored.sort(key=lambda x: x["rerank_score"], reverse=True)
+        return scored
+
+    def rerank(self, query: str, documents: list[dict]) -> list[dict]:
+        """Score documents and keep the top M (all of them if top_m is 0)"""
+        scored = self.score(query, documents)
+        return scored[: self.top_m] if self.top_m else scored
+
+    def _bm25(
+        self, query_terms: list[str], doc_tokens: list[list[str]]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """BM25 scores and query-term coverage for each document"""
+        counts = [Counter(tokens) for tokens in doc_tokens]
+        tf = np.array(
+            [[count[term] for term in query_terms] for count in counts], dtype=float
+        )
+        lengths = np.array([len(tokens) for tokens in doc_tokens], dtype=float)
+        avg_length = lengths.mean() or 1.0
+
+        n_docs = len(doc_tokens)
+        df = (tf > 0).sum(axis=0)
+        idf = np.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+        norm = self.k1 * (1 - self.b + self.b * lengths / avg_length)
+        bm25 = (idf * tf * (self.k1 + 1) / (tf + norm[:, None])).sum(axis=1)
+        coverage = (tf > 0).mean(axis=1)
+        return bm25, coverage
+
+    @staticmethod
+    def _text(document: dict) -> str:
+        content = document.get("parent_content") or " ".join(
+            chunk["content"] for chunk in document.get("chunks", [])
+        )
+        return f"{document.get('title', '')}\n{content}"
+
+    @staticmethod
+    def _normalize(values: np.ndarray) -> np.ndarray:
+        """Scale values to 0-1 by the maximum"""
+        top = values.max() if len(values) else 0.0
+        if not math.isfinite(top) or top <= 0:
+            return np.zeros_like(values)
+        return values / top
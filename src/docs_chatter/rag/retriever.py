@@ -1,15 +1,16 @@
 """Hybrid retriever for RAG pipeline"""
 
 from typing import Any
+from docs_chatter import metrics
 from docs_chatter.config import settings
-from docs_chatter.vectorstore.opensearch import OpenSearchClient
+from docs_chatter.vectorstore.base import create_vector_store
 
 
 class HybridRetriever:
     """Retriever that performs hybrid search and merges parent documents"""
 
     def __init__(self):
-        self.opensearch = OpenSearchClient()
+        self.store = create_vector_store()
 
     def retrieve(
         self,
@@ -31,14 +32,18 @@ class HybridRetriever:
         score_threshold = score_threshold or settings.score_threshold
 
         # Perform hybrid search
-        results = self.opensearch.hybrid_search(query, top_k)
+        results = self.store.hybrid_search(query, top_k)
 
         # Filter by score
         filtered = [r for r in results if r.get("_score", 0) > score_threshold]
 
         # Merge parent documents (deduplicate by page_id)
-        merged = self._merge_parents(filtered)
+        with metrics.span("merge_parents"):
+            merged = self._merge_parents(filtered)
 
+        metrics.record("searched_chunks", len(results))
+        metrics.record("filtered_chunks", len(filtered))
+        metrics.record("retrieved_pages", len(merged))
         return merged
 
     def _merge_parents(self, results: list[dict]) -> list[dict]:
@@ -54,7 +59,7 @@ class HybridRetriever:
                     "page_id": page_id,
                     "title": result["title"],
                     "url": result["url"],
-                    "parent_content": result["parent_content"],
+                    "parent_content": "",
                     "chunks": [],
                     "max_score": result.get("_score", 0),
                 }
@@ -71,6 +76,16 @@ class HybridRetriever:
             if result.get("_score", 0) > pages[page_id]["max_score"]:
                 pages[page_id]["max_score"] = result.get("_score", 0)
 
+        # Load parent documents once per page
+        parents = self.store.get_parents(list(pages))
+        for page_id, page in pages.items():
+            if page_id in parents:
+                page["parent_content"] = parents[page_id].get("parent_content", "")
+            else:
+                # Pages indexed before the parent index existed: use the matched chunks
+                chunks = sorted(page["chunks"], key=lambda chunk: chunk["chunk_index"])
+                page["parent_content"] = "\n\n".join(chunk["content"] for chunk in chunks)
+
         # Sort by max score
         sorted_pages = sorted(pages.values(), key=lambda x: x["max_score"], reverse=True)
 
@@ -3,11 +3,17 @@
 import asyncio
 import logging
 import re
+import threading
+from collections.abc import Callable
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
 
+from docs_chatter import metrics
 from docs_chatter.config import settings
 from docs_chatter.rag.chain import RAGChain
+from docs_chatter.slack.dispatcher import QuestionDispatcher
+from docs_chatter.slack.responder import MessageResponder, update_message
+from docs_chatter.slack.workers import WorkerPool
 
 logger = logging.getLogger(__name__)
 
@@ -15,14 +21,58 @@ logger = logging.getLogger(__name__)
 class SlackBot:
     """Slack bot for RAG-based Q&A"""
 
-    def __init__(self):
-        self.app = App(
+    def __init__(
+        self,
+        app: App | None = None,
+        rag_chain: RAGChain | None = None,
+        worker_processes: int | None = None,
+        chain_factory: Callable[[], RAGChain] | None = None,
+    ):
+        self.app = app or App(
             token=settings.slack_bot_token,
             signing_secret=settings.slack_signing_secret,
         )
-        self.rag_chain = RAGChain()
+        processes = (
+            worker_processes if worker_processes is not None else settings.bot_worker_processes
+        )
+
+        # One long-lived loop so pooled async HTTP clients are reused across questions
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, name="rag-loop", daemon=True).start()
+
+        if processes:
+            # Answer in worker processes; this process only receives events
+            self.rag_chain = None
+            self.worker_pool = WorkerPool(
+                self.loop, processes, settings.slack_workers, chain_factory
+            )
+            self._answer = self._answer_in_worker
+        else:
+            self.rag_chain = rag_chain or (chain_factory or RAGChain)()
+            self.worker_pool = None
+            self._answer = MessageResponder(self.app.client, self.rag_chain).answer
+
+        # Questions run on the loop; Bolt listener threads only enqueue them
+        self.dispatcher = QuestionDispatcher(
+            self.loop,
+            workers=settings.slack_workers * max(processes, 1),
+            max_pending=settings.slack_queue_size,
+            max_pending_per_user=settings.slack_max_pending_per_user,
+        )
+
         self._register_handlers()
 
+    async def _answer_in_worker(self, query: str, channel: str, ts: str):
+        """Answer on a worker process, reporting a failed worker in the placeholder"""
+        try:
+            await self.worker_pool.answer(query, channel, ts)
+        except Exception as e:
+            # Workers report their own errors; this is a crashed or exited worker
+            logger.error(f"Error processing question: {e}")
+            await asyncio.to_thread(
+                update_message, self.app.client, channel, ts, f"오류가 발생했습니다: {e}"
+            )
+
     def _register_handlers(self):
         """Register event handlers"""
 
@@ -39,7 +89,7 @@ class SlackBot:
                 self._handle_question(event, say)
 
     def _handle_question(self, event: dict, say):
-        """Process a question and respond"""
+        """Queue a question and return without waiting for the answer"""
         text = event.get("text", "")
         user = event.get("user", "")
         channel = event.get("channel", "")
@@ -59,51 +109,37 @@ class SlackBot:
         logger.info(f"Question from {user}: {query}")
 
         # Send "thinking" message
-        say(
+        placeholder = say(
             text="문서를 검색하고 있습니다...",
             channel=channel,
             thread_ts=thread_ts,
         )
-
-        try:
-            # Run RAG query
-            result = asyncio.run(self.rag_chain.aquery(query))
-
-            # Format response
-            response = self._format_response(result)
-
-            say(
-                text=response,
-                channel=channel,
-                thread_ts=thread_ts,
+        ts = placeholder["ts"]
+
+        ahead = self.dispatcher.submit(user, lambda: self._answer(query, channel, ts))
+        if ahead is None:
+            logger.warning(f"Rejected question from {user}: {self.dispatcher.stats}")
+            update_message(
+                self.app.client,
+                channel,
+                ts,
+                "요청이 많아 처리할 수 없습니다. 잠시 후 다시 질문해주세요.",
             )
-
-        except Exception as e:
-            logger.error(f"Error processing question: {e}")
-            say(
-                text=f"오류가 발생했습니다: {e}",
-                channel=channel,
-                thread_ts=thread_ts,
+        elif ahead:
+            update_message(
+                self.app.client,
+                channel,
+                ts,
+                f"대기 중입니다 (앞선 질문 {ahead}건). 곧 답변을 시작합니다...",
             )
 
-    def _format_response(self, result: dict) -> str:
-        """Format RAG result as Slack message"""
-        answer = result.get("answer", "")
-        sources = result.get("sources", [])
-
-        parts = [answer]
-
-        if sources:
-            parts.append("\n\n*참고 문서:*")
-            for source in sources[:5]:  # Limit to 5 sources
-                title = source.get("title", "")
-                url = source.get("url", "")
-                parts.append(f"• <{url}|{title}>")
-
-        return "\n".join(parts)
-
     def start(self):
         """Start the bot using Socket Mode"""
         logger.info("Starting Slack bot...")
+        metrics.setup_metrics()
         handler = SocketModeHandler(self.app, settings.slack_app_token)
-        handler.start()
+        try:
+            handler.start()
+        finally:
+            if self.worker_pool is not None:
+                self.worker_pool.stop()
@@ -0,0 +1,107 @@
+"""Bounded, per-user fair dispatching of questions onto an event loop"""
+
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+Job = Callable[[], Awaitable[None]]
+
+
+class QuestionDispatcher:
+    """Run jobs on a shared event loop with a fixed number of workers
+
+    Pending jobs are queued per user and served round-robin, so one user
+    asking many questions cannot starve others. Submissions beyond
+    ``max_pending`` in total or ``max_pending_per_user`` for one user are
+    rejected instead of queued.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        workers: int,
+        max_pending: int,
+        max_pending_per_user: int,
+    ):
+        self.loop = loop
+        self.max_pending = max_pending
+        self.max_pending_per_user = max_pending_per_user
+        self.active = 0
+
+        self._queues: OrderedDict[str, deque[Job]] = OrderedDict()
+        self._pending = 0
+        self._available: asyncio.Semaphore | None = None
+        self._workers = workers
+        self._tasks: list[asyncio.Task] = []
+        asyncio.run_coroutine_threadsafe(self._start(), loop).result()
+
+    async def _start(self):
+        self._available = asyncio.Semaphore(0)
+        self._tasks = [self.loop.create_task(self._worker(i)) for i in range(self._workers)]
+
+    def stop(self):
+        """Cancel the workers, abandoning queued and running jobs"""
+        asyncio.run_coroutine_threadsafe(self._stop(), self.loop).result()
+
+    async def _stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def submit(self, user: str, job: Job) -> int | None:
+        """Queue a job from any thread
+
+        Returns:
+            Number of jobs ahead of it, or None if rejected
+        """
+        return asyncio.run_coroutine_threadsafe(self._put(user, job), self.loop).result()
+
+    async def _put(self, user: str, job: Job) -> int | None:
+        queue = self._queues.get(user)
+        if self._pending >= self.max_pending or (
+            queue is not None and len(queue) >= self.max_pending_per_user
+        ):
+            return None
+
+        if queue is None:
+            queue = self._queues[user] = deque()
+        queue.append(job)
+        ahead = self._pending
+        self._pending += 1
+        self._available.release()
+        return ahead
+
+    def _next(self) -> Job:
+        """Pop the next job, rotating the served user to the back"""
+        user, queue = next(iter(self._queues.items()))
+        job = queue.popleft()
+        if queue:
+            self._queues.move_to_end(user)
+        else:
+            del self._queues[user]
+        self._pending -= 1
+        return job
+
+    async def _worker(self, worker_id: int):
+        while True:
+            await self._available.acquire()
+            job = self._next()
+            self.active += 1
+            try:
+                await job()
+            except Exception as e:
+                logger.error(f"Worker {worker_id} job failed: {e}")
+            finally:
+                self.active -= 1
+
+    @property
+    def stats(self) -> dict:
+        """Return queue depth and busy workers"""
+        return {
+            "pending": self._pending,
+            "active": self.active,
+            "users_waiting": len(self._queues),
+        }
@@ -0,0 +1,117 @@
+"""Answering a question into a Slack message"""
+
+import asyncio
+import logging
+import time
+
+from docs_chatter.config import settings
+from docs_chatter.rag.chain import RAGChain
+
+logger = logging.getLogger(__name__)
+
+
+def update_message(client, channel: str, ts: str, text: str):
+    """Replace the text of a posted message"""
+    try:
+        client.chat_update(channel=channel, ts=ts, text=text)
+    except Exception as e:
+        # Rate-limited or failed edits are superseded by the next one
+        logger.warning(f"Failed to update message: {e}")
+
+
+def format_response(result: dict) -> str:
+    """Format RAG result as Slack message"""
+    answer = result.get("answer", "")
+    sources = result.get("sources", [])
+
+    parts = [answer]
+
+    if sources:
+        parts.append("\n\n*참고 문서:*")
+        for source in sources[:5]:  # Limit to 5 sources
+            title = source.get("title", "")
+            url = source.get("url", "")
+            parts.append(f"• <{url}|{title}>")
+
+    if settings.slack_debug and result.get("trace"):
+        parts.append(format_trace(result["trace"]))
+
+    return "\n".join(parts)
+
+
+def format_trace(trace: dict) -> str:
+    """Format a query trace summary as a debug footer"""
+    stages = " · ".join(
+        f"{name} {stage['seconds']:.2f}s" + (f" ×{stage['count']}" if stage["count"] > 1 else "")
+        for name, stage in trace["stages"].items()
+        if name != "query"
+    )
+    counters = " · ".join(f"{name}={value:g}" for name, value in sorted(trace["counters"].items()))
+    return f"\n\n*디버그:* 전체 {trace['total']:.2f}s\n```{stages}\n{counters}```"
+
+
+class MessageResponder:
+    """Run RAG queries and stream their progress into placeholder messages"""
+
+    def __init__(self, client, rag_chain: RAGChain):
+        self.client = client
+        self.rag_chain = rag_chain
+
+    async def answer(self, query: str, channel: str, ts: str):
+        """Run the RAG query, streaming progress into the placeholder message"""
+        try:
+            result = await self._stream_to_message(query, channel, ts)
+
+            # Format response
+            response = format_response(result)
+            await asyncio.to_thread(update_message, self.client, channel, ts, response)
+
+        except Exception as e:
+            logger.error(f"Error processing question: {e}")
+            await asyncio.to_thread(
+                update_message, self.client, channel, ts, f"오류가 발생했습니다: {e}"
+            )
+
+    async def _stream_to_message(self, query: str, channel: str, ts: str) -> dict:
+        """Consume RAG events, editing the message with throttled, coalesced updates
+
+        At most one edit is in flight and edits are at least
+        ``slack_update_interval`` apart; text produced in between is shown by
+        the next edit.
+        """
+        text = ""
+        answer = ""
+        shown = ""
+        last_update = 0.0
+        pending: asyncio.Task | None = None
+        result = {}
+
+        async for event in self.rag_chain.aquery_stream(query):
+            if event["type"] == "retrieved":
+                text = f"관련 문서 {event['count']}건을 찾았습니다. 관련성을 평가하고 있습니다..."
+            elif event["type"] == "relevant":
+                text = "답변을 생성하고 있습니다..."
+            elif event["type"] == "token":
+                answer += event["text"]
+                text = answer
+            elif event["type"] == "done":
+                result = event["result"]
+                continue
+
+            now = time.monotonic()
+            if (
+                text != shown
+                and (pending is None or pending.done())
+                and now - last_update >= settings.slack_update_interval
+            ):
+                pending = asyncio.create_task(
+                    asyncio.to_thread(update_message, self.client, channel, ts, text)
+                )
+                shown = text
+                last_update = now
+
+        # Let the last edit land before the final response replaces it
+        if pending is not None:
+            await pending
+
+        return result
@@ -0,0 +1,191 @@
+"""Worker processes answering questions for the Slack front process"""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from collections.abc import Callable
+
+from slack_sdk import WebClient
+
+from docs_chatter import metrics
+from docs_chatter.config import settings
+from docs_chatter.rag.chain import RAGChain
+from docs_chatter.slack.responder import MessageResponder
+
+logger = logging.getLogger(__name__)
+
+
+def _worker_main(
+    worker_id: int,
+    jobs: multiprocessing.Queue,
+    results: multiprocessing.Queue,
+    concurrency: int,
+    chain_factory: Callable[[], RAGChain] | None,
+    log_level: int,
+):
+    """Entry point of a worker process"""
+    logging.basicConfig(
+        level=log_level,
+        format=f"%(asctime)s - worker-{worker_id} - %(name)s - %(levelname)s - %(message)s",
+    )
+    # Each worker exports its own metrics next to the bot's port
+    metrics.setup_metrics(settings.metrics_port + worker_id + 1 if settings.metrics_port else 0)
+    try:
+        asyncio.run(_serve(jobs, results, concurrency, chain_factory))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _serve(
+    jobs: multiprocessing.Queue,
+    results: multiprocessing.Queue,
+    concurrency: int,
+    chain_factory: Callable[[], RAGChain] | None,
+):
+    """Answer jobs from the queue, up to ``concurrency`` at a time"""
+    rag_chain = chain_factory() if chain_factory else RAGChain()
+    client = WebClient(
+        token=settings.slack_bot_token,
+        base_url=settings.slack_api_url or WebClient.BASE_URL,
+    )
+    responder = MessageResponder(client, rag_chain)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks: set[asyncio.Task] = set()
+
+    async def run(job_id: int, query: str, channel: str, ts: str):
+        try:
+            await responder.answer(query, channel, ts)
+            results.put((job_id, None))
+        except Exception as e:
+            results.put((job_id, str(e)))
+        finally:
+            semaphore.release()
+
+    while True:
+        await semaphore.acquire()
+        job = await asyncio.to_thread(jobs.get)
+        if job is None:
+            break
+        task = asyncio.create_task(run(*job))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class WorkerPool:
+    """Spawn worker processes, each with its own RAGChain, and route questions to them
+
+    Each question goes to the worker with the fewest in-flight questions.
+    Workers edit the Slack message themselves, so only small job and
+    completion tuples cross process boundaries. Dead workers are restarted
+    and their in-flight questions are reported as failed.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        processes: int,
+        concurrency: int,
+        chain_factory: Callable[[], RAGChain] | None = None,
+    ):
+        self.loop = loop
+        self.concurrency = concurrency
+        self.chain_factory = chain_factory
+        self.inflight = [0] * processes
+
+        self._context = multiprocessing.get_context("spawn")
+        self._results = self._context.Queue()
+        self._jobs = [self._context.Queue() for _ in range(processes)]
+        self._processes = [self._spawn(i) for i in range(processes)]
+        self._futures: dict[int, tuple[int, asyncio.Future]] = {}
+        self._ids = itertools.count()
+        self._stopped = False
+
+        threading.Thread(target=self._collect, name="worker-results", daemon=True).start()
+
+    def _spawn(self, worker_id: int) -> multiprocessing.Process:
+        process = self._context.Process(
+            target=_worker_main,
+            args=(
+                worker_id,
+                self._jobs[worker_id],
+                self._results,
+                self.concurrency,
+                self.chain_factory,
+                logging.getLogger().getEffectiveLevel(),
+            ),
+            name=f"rag-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    async def answer(self, query: str, channel: str, ts: str):
+        """Answer a question on the least busy worker and wait for it"""
+        worker = min(range(len(self.inflight)), key=self.inflight.__getitem__)
+        job_id = next(self._ids)
+        future = self.loop.create_future()
+        self._futures[job_id] = (worker, future)
+        self.inflight[worker] += 1
+        self._jobs[worker].put((job_id, query, channel, ts))
+
+        error = await future
+        if error:
+            raise RuntimeError(f"Worker {worker} failed: {error}")
+
+    def _collect(self):
+        """Resolve futures from worker completions and watch worker liveness"""
+        last_check = time.monotonic()
+        while not self._stopped:
+            try:
+                job_id, error = self._results.get(timeout=1.0)
+                self.loop.call_soon_threadsafe(self._finish, job_id, error)
+            except queue.Empty:
+                pass
+
+            if time.monotonic() - last_check >= 1.0:
+                last_check = time.monotonic()
+                self.loop.call_soon_threadsafe(self._check_workers)
+
+    def _finish(self, job_id: int, error: str | None):
+        worker, future = self._futures.pop(job_id, (None, None))
+        if future is None:
+            return
+        self.inflight[worker] -= 1
+        if not future.done():
+            future.set_result(error)
+
+    def _check_workers(self):
+        """Restart dead workers and fail the questions they held"""
+        if self._stopped:
+            return
+        for worker, process in enumerate(self._processes):
+            if process.is_alive():
+                continue
+            logger.error(f"Worker {worker} exited with code {process.exitcode}, restarting")
+            for job_id, (owner, _) in list(self._futures.items()):
+                if owner == worker:
+                    self._finish(job_id, "worker process exited")
+            self._jobs[worker] = self._context.Queue()
+            self._processes[worker] = self._spawn(worker)
+
+    def stop(self, timeout: float = 10.0):
+        """Let workers finish in-flight questions, then stop them"""
+        self._stopped = True
+        for jobs in self._jobs:
+            jobs.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+
+    @property
+    def stats(self) -> dict:
+        """Return in-flight questions per worker"""
+        return {"inflight": list(self.inflight)}
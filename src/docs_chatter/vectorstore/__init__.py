@@ -1,4 +1,16 @@
+from .base import VectorStore, create_vector_store
 from .opensearch import OpenSearchClient
+from .embedded import EmbeddedVectorStore
 from .embeddings import CohereEmbeddings
+from .cache import EmbeddingCache
+from .bulk import BulkAccumulator
 
-__all__ = ["OpenSearchClient", "CohereEmbeddings"]
+__all__ = [
+    "VectorStore",
+    "create_vector_store",
+    "OpenSearchClient",
+    "EmbeddedVectorStore",
+    "CohereEmbeddings",
+    "EmbeddingCache",
+    "BulkAccumulator",
+]
@@ -0,0 +1,283 @@
+"""Vector store interface shared by the OpenSearch and embedded backends"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any
+
+from docs_chatter import metrics
+from docs_chatter.cache import create_cache, normalize_query
+from docs_chatter.config import settings
+from docs_chatter.vectorstore.embeddings import CohereEmbeddings
+
+if TYPE_CHECKING:
+    # Imported for annotations only; rag imports this package
+    from docs_chatter.rag.chunker import DocumentChunk
+
+
+class VectorStore(ABC):
+    """Chunk and parent page storage with hybrid (lexical + vector) search
+
+    Writes use the OpenSearch bulk format (action line, then document line)
+    for every backend, so BulkAccumulator and the indexer work unchanged.
+    Chunks go to ``index_name`` and parent pages to ``parent_index_name``.
+    """
+
+    def __init__(
+        self,
+        index_name: str | None = None,
+        embeddings: CohereEmbeddings | None = None,
+    ):
+        self.index_name = index_name or settings.opensearch_index
+        # Page markdown is stored once per page, separately from chunks
+        self.parent_index_name = f"{self.index_name}-parents"
+        self.embeddings = embeddings or CohereEmbeddings()
+
+        # Search results cache, invalidated when the index generation changes
+        self.search_cache = create_cache(
+            "search", settings.query_cache_size, settings.query_cache_ttl
+        )
+        self._generation = 0
+        self._generation_checked = 0.0
+
+    @abstractmethod
+    def create_index(self) -> bool:
+        """Create the chunk index
+
+        Returns:
+            True if the index was created, False if it already existed
+        """
+
+    @abstractmethod
+    def create_parent_index(self) -> bool:
+        """Create the parent document index
+
+        Returns:
+            True if the index was created, False if it already existed
+        """
+
+    @abstractmethod
+    def delete_index(self) -> None:
+        """Delete the chunk and parent indexes"""
+
+    @abstractmethod
+    def bulk(self, body: str | list[dict], refresh: bool = False) -> dict:
+        """Apply bulk actions given as NDJSON or as a list of action/document dicts
+
+        Returns:
+            Response with "errors" and one entry per action in "items"
+        """
+
+    @abstractmethod
+    def refresh(self) -> None:
+        """Make recent writes searchable"""
+
+    @abstractmethod
+    def delete_by_page_id(self, page_id: str) -> None:
+        """Delete all chunks and the parent document for a page"""
+
+    @abstractmethod
+    def get_parents(self, page_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Fetch parent documents for many pages"""
+
+    @abstractmethod
+    def get_page_hashes(self, page_ids: list[str]) -> dict[str, str]:
+        """Fetch the content hash of many pages without their markdown"""
+
+    @abstractmethod
+    def get_chunk_ids(self, page_ids: list[str]) -> list[tuple[str, str]]:
+        """Return (page_id, doc_id) of all indexed chunks for many pages"""
+
+    @abstractmethod
+    def count_chunks(self) -> int:
+        """Number of indexed chunks, 0 if the index does not exist yet"""
+
+    @abstractmethod
+    def get_generation(self) -> int:
+        """Read the index generation counter"""
+
+    @abstractmethod
+    def bump_generation(self) -> int:
+        """Increment the index generation so query caches are invalidated"""
+
+    @abstractmethod
+    def _hybrid_search(self, query: str, top_k: int) -> list[dict[str, Any]]:
+        """Search chunks, returning their fields and ``_score`` best first"""
+
+    def create_staging(self) -> VectorStore:
+        """Create empty versioned indexes to rebuild into, tuned for bulk loading"""
+        raise NotImplementedError(f"{type(self).__name__} does not support blue/green rebuilds")
+
+    def switch_to(self, staging: VectorStore) -> None:
+        """Finalize a rebuilt staging store and atomically serve it under this store's name"""
+        raise NotImplementedError(f"{type(self).__name__} does not support blue/green rebuilds")
+
+    def prune_versions(self) -> None:
+        """Delete old versions beyond those kept for rollback"""
+        raise NotImplementedError(f"{type(self).__name__} does not support blue/green rebuilds")
+
+    def discard(self, staging: VectorStore) -> None:
+        """Delete a staging store that will not be switched to"""
+        raise NotImplementedError(f"{type(self).__name__} does not support blue/green rebuilds")
+
+    def rollback(self) -> str:
+        """Serve the previous index version again, returning its name"""
+        raise NotImplementedError(f"{type(self).__name__} does not support blue/green rebuilds")
+
+    def index_chunks(self, chunks: list[DocumentChunk]) -> None:
+        """Index document chunks with embeddings"""
+        if not chunks:
+            return
+
+        embeddings = self.embed_chunks(chunks)
+        self.write_chunks(chunks, embeddings)
+
+    def calibrate(self, embeddings: list[list[float]]) -> None:
+        """Fit the stored vector encoding to the first embeddings written, if needed"""
+
+    def embed_chunks(self, chunks: list[DocumentChunk]) -> list[list[float]]:
+        """Generate embeddings for chunks in batch"""
+        texts = [chunk.content for chunk in chunks]
+        return self.embeddings.embed_documents(texts)
+
+    def write_chunks(
+        self,
+        chunks: list[DocumentChunk],
+        embeddings: list[list[float]],
+        refresh: bool = False,
+    ) -> None:
+        """Bulk index chunks with precomputed embeddings"""
+        self.calibrate(embeddings)
+        actions = []
+        parents = {}
+        for chunk, embedding in zip(chunks, embeddings):
+            actions.extend(self.build_index_action(chunk, embedding))
+            parents.setdefault(chunk.page_id, chunk)
+
+        for chunk in parents.values():
+            actions.extend(self.build_parent_action(chunk))
+
+        if actions:
+            self.bulk(actions, refresh=refresh)
+
+    def build_index_action(
+        self,
+        chunk: DocumentChunk,
+        embedding: list[float],
+    ) -> tuple[dict, dict]:
+        """Build the bulk action and document for a chunk"""
+        action = {"index": {"_index": self.index_name, "_id": self.chunk_id(chunk)}}
+        document = {
+            "page_id": chunk.page_id,
+            "chunk_index": chunk.chunk_index,
+            "title": chunk.title,
+            "url": chunk.url,
+            "content": chunk.content,
+            "content_embedding": embedding,
+        }
+
+        return action, document
+
+    def build_update_action(self, chunk: DocumentChunk) -> tuple[dict, dict]:
+        """Build a partial update for a chunk whose content (and embedding) is unchanged"""
+        action = {"update": {"_index": self.index_name, "_id": self.chunk_id(chunk)}}
+        document = {
+            "doc": {
+                "chunk_index": chunk.chunk_index,
+                "title": chunk.title,
+                "url": chunk.url,
+            }
+        }
+
+        return action, document
+
+    def build_parent_action(self, chunk: DocumentChunk) -> tuple[dict, dict]:
+        """Build the bulk action and document storing a chunk's parent page"""
+        action = {"index": {"_index": self.parent_index_name, "_id": chunk.page_id}}
+        document = {
+            "page_id": chunk.page_id,
+            "title": chunk.title,
+            "url": chunk.url,
+            "parent_content": chunk.parent_content,
+            "content_hash": self.parent_hash(chunk.title, chunk.parent_content),
+        }
+
+        return action, document
+
+    def build_delete_action(self, doc_id: str) -> dict:
+        """Build the bulk action deleting a chunk by id"""
+        return {"delete": {"_index": self.index_name, "_id": doc_id}}
+
+    def build_parent_delete_action(self, page_id: str) -> dict:
+        """Build the bulk action deleting a page's parent document"""
+        return {"delete": {"_index": self.parent_index_name, "_id": page_id}}
+
+    @staticmethod
+    def parent_hash(title: str, parent_content: str) -> str:
+        """Hash identifying the indexed version of a page"""
+        return hashlib.sha256(f"{title}\0{parent_content}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def chunk_id(chunk: DocumentChunk) -> str:
+        """Document id of a chunk"""
+        return f"{chunk.page_id}_{chunk.chunk_index}"
+
+    def current_generation(self) -> int:
+        """Return the index generation, re-reading it at most once per interval"""
+        now = time.monotonic()
+        if now - self._generation_checked >= settings.index_generation_check_interval:
+            self._generation_checked = now
+            try:
+                generation = self.get_generation()
+            except Exception:
+                # Without a generation the cached results cannot be trusted
+                generation = -1
+            if generation != self._generation:
+                # Keys include the generation; shared caches let old entries expire
+                # rather than wiping what other processes cached for the new one
+                if not self.search_cache.shared:
+                    self.search_cache.clear()
+                self._generation = generation
+        return self._generation
+
+    def hybrid_search(
+        self,
+        query: str,
+        top_k: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Perform hybrid search (lexical + neural)
+
+        Results are cached by normalized query text until the index
+        generation changes.
+        """
+        top_k = top_k or settings.search_top_k
+
+        key = (normalize_query(query), top_k, self.current_generation())
+        cached = self.search_cache.get(key)
+        metrics.record_cache("search", cached is not None)
+        if cached is not None:
+            return [result.copy() for result in cached]
+
+        results = self._hybrid_search(query, top_k)
+        self.search_cache.set(key, results)
+        return [result.copy() for result in results]
+
+
+def create_vector_store() -> VectorStore:
+    """Create the configured vector store
+
+    "opensearch" uses the OpenSearch cluster at OPENSEARCH_HOST, "embedded"
+    keeps everything in local files under EMBEDDED_STORE_PATH.
+    """
+    backend = settings.vector_store
+    if backend == "opensearch":
+        from docs_chatter.vectorstore.opensearch import OpenSearchClient
+
+        return OpenSearchClient()
+    if backend == "embedded":
+        from docs_chatter.vectorstore.embedded import EmbeddedVectorStore
+
+        return EmbeddedVectorStore()
+    raise ValueError(f"Unknown vector store: {backend}")
@@ -0,0 +1,220 @@
+"""Cross-page accumulator for embedding and bulk indexing"""
+
+import json
+import logging
+import time
+
+from docs_chatter.config import settings
+from docs_chatter.rag.chunker import DocumentChunk
+from docs_chatter.vectorstore.base import VectorStore
+
+logger = logging.getLogger(__name__)
+
+
+class BulkAccumulator:
+    """Pack chunks from many pages into embedding batches and bulk bodies
+
+    Embedding calls are sized to the provider's max batch. Bulk bodies are
+    flushed when they reach ``max_docs`` documents, ``max_bytes`` bytes, or
+    when ``flush_interval`` seconds have passed since the last flush.
+    """
+
+    def __init__(
+        self,
+        store: VectorStore,
+        max_docs: int | None = None,
+        max_bytes: int | None = None,
+        flush_interval: float | None = None,
+    ):
+        self.store = store
+        self.embed_batch_size = store.embeddings.max_batch_size
+        self.max_docs = max_docs or settings.index_bulk_max_docs
+        self.max_bytes = max_bytes or settings.index_bulk_max_bytes
+        self.flush_interval = flush_interval or settings.index_flush_interval
+
+        # Chunks waiting for embeddings
+        self._pending: list[DocumentChunk] = []
+
+        # Serialized bulk lines waiting to be sent
+        self._lines: list[str] = []
+        self._line_bytes = 0
+        self._doc_page_ids: list[str] = []
+        self._doc_is_chunk: list[bool] = []  # item writes a chunk to the chunk index
+        self._last_flush = time.monotonic()
+
+        # Pages being fully replaced: page_id -> chunk ids to keep
+        self._replaced: dict[str, set[str]] = {}
+        self.stale_deleted = 0
+
+        self.failed_page_ids: set[str] = set()
+        self.failed_items = 0
+        self.failed_chunks = 0  # lost chunk writes, as counted in chunks_indexed
+        self.stats = {
+            "embed_requests": 0,
+            "bulk_requests": 0,
+            "bulk_bytes": 0,
+        }
+
+    def add(self, chunks: list[DocumentChunk]) -> None:
+        """Queue chunks that still need embeddings"""
+        self._pending.extend(chunks)
+        while len(self._pending) >= self.embed_batch_size:
+            batch = self._pending[: self.embed_batch_size]
+            self._pending = self._pending[self.embed_batch_size :]
+            self._embed(batch)
+
+    def add_embedded(
+        self,
+        chunks: list[DocumentChunk],
+        embeddings: list[list[float]],
+    ) -> None:
+        """Queue chunks whose embeddings are already computed"""
+        self.store.calibrate(embeddings)
+        for chunk, embedding in zip(chunks, embeddings):
+            action, document = self.store.build_index_action(chunk, embedding)
+            self._append(chunk.page_id, action, document)
+        self._maybe_flush()
+
+    def add_updates(self, chunks: list[DocumentChunk]) -> None:
+        """Queue partial updates for chunks whose content is unchanged"""
+        for chunk in chunks:
+            action, document = self.store.build_update_action(chunk)
+            self._append(chunk.page_id, action, document)
+        self._maybe_flush()
+
+    def add_parent(self, chunk: DocumentChunk) -> None:
+        """Queue the parent document of a page (stored once per page)"""
+        action, document = self.store.build_parent_action(chunk)
+        self._append(chunk.page_id, action, document)
+        self._maybe_flush()
+
+    def add_deletes(self, page_id: str, doc_ids: list[str]) -> None:
+        """Queue deletes of stale chunk ids"""
+        for doc_id in doc_ids:
+            self._append(page_id, self.store.build_delete_action(doc_id))
+        self._maybe_flush()
+
+    def add_removal(self, page_id: str) -> None:
+        """Queue deletes of every chunk and the parent document of a page"""
+        self._append(page_id, self.store.build_parent_delete_action(page_id))
+        self.add_replace(page_id, set())
+        self._maybe_flush()
+
+    def add_replace(self, page_id: str, keep_ids: set[str]) -> None:
+        """Mark a page as fully replaced by the given chunk ids
+
+        Existing chunk ids of replaced pages are looked up in one batched
+        query at flush time, and those not in ``keep_ids`` are deleted in
+        the same bulk request.
+        """
+        self._replaced[page_id] = keep_ids
+
+    def _append(self, page_id: str, action: dict, document: dict | None = None) -> None:
+        """Serialize one bulk item, flushing first if it would exceed max_bytes"""
+        body = json.dumps(action) + "\n"
+        if document is not None:
+            body += json.dumps(document, ensure_ascii=False) + "\n"
+        size = len(body.encode("utf-8"))
+
+        if self._lines and self._line_bytes + size > self.max_bytes:
+            self._flush_bulk()
+
+        self._lines.append(body)
+        self._line_bytes += size
+        self._doc_page_ids.append(page_id)
+        self._doc_is_chunk.append(action.get("index", {}).get("_index") == self.store.index_name)
+
+        if len(self._doc_page_ids) >= self.max_docs:
+            self._flush_bulk()
+
+    def _maybe_flush(self) -> None:
+        """Flush if the buffer has been waiting longer than flush_interval"""
+        if self._lines and time.monotonic() - self._last_flush >= self.flush_interval:
+            self._flush_bulk()
+
+    def flush(self) -> None:
+        """Embed and write everything still buffered"""
+        if self._pending:
+            batch, self._pending = self._pending, []
+            self._embed(batch)
+        self._flush_bulk()
+
+    def _embed(self, chunks: list[DocumentChunk]) -> None:
+        """Embed a batch of chunks and queue them for bulk indexing"""
+        try:
+            embeddings = self.store.embed_chunks(chunks)
+        except Exception as e:
+            logger.error(f"Error embedding batch of {len(chunks)} chunks: {e}")
+            self._record_failure([chunk.page_id for chunk in chunks], chunks=len(chunks))
+            return
+
+        self.stats["embed_requests"] += 1
+        self.add_embedded(chunks, embeddings)
+
+    def _resolve_replaced(self) -> None:
+        """Queue deletes for stale chunks of replaced pages"""
+        replaced, self._replaced = self._replaced, {}
+        page_ids = list(replaced)
+
+        try:
+            existing = self.store.get_chunk_ids(page_ids)
+        except Exception as e:
+            logger.error(f"Error looking up chunks of {len(page_ids)} pages: {e}")
+            self._record_failure(page_ids)
+            return
+
+        for page_id, doc_id in existing:
+            if doc_id not in replaced[page_id]:
+                body = json.dumps(self.store.build_delete_action(doc_id)) + "\n"
+                self._lines.append(body)
+                self._line_bytes += len(body)
+                self._doc_page_ids.append(page_id)
+                self._doc_is_chunk.append(False)
+                self.stale_deleted += 1
+
+    def _flush_bulk(self) -> None:
+        """Send the buffered bulk body"""
+        self._last_flush = time.monotonic()
+        if self._replaced:
+            self._resolve_replaced()
+        if not self._lines:
+            return
+
+        body = "".join(self._lines)
+        page_ids = self._doc_page_ids
+        is_chunk = self._doc_is_chunk
+        size = self._line_bytes
+
+        self._lines = []
+        self._line_bytes = 0
+        self._doc_page_ids = []
+        self._doc_is_chunk = []
+
+        try:
+            response = self.store.bulk(body)
+        except Exception as e:
+            logger.error(f"Error writing bulk of {len(page_ids)} items: {e}")
+            self._record_failure(page_ids, chunks=sum(is_chunk))
+            return
+
+        if response.get("errors"):
+            failed = [
+                (page_id, chunk)
+                for item, page_id, chunk in zip(response.get("items", []), page_ids, is_chunk)
+                if next(iter(item.values())).get("error")
+            ]
+            logger.error(f"Bulk request had {len(failed)} failed items")
+            self._record_failure(
+                [page_id for page_id, _ in failed],
+                chunks=sum(chunk for _, chunk in failed),
+            )
+
+        self.stats["bulk_requests"] += 1
+        self.stats["bulk_bytes"] += size
+        logger.debug(f"Flushed bulk of {len(page_ids)} items ({size} bytes)")
+
+    def _record_failure(self, page_ids: list[str], chunks: int = 0) -> None:
+        """Track items, chunk writes and pages lost to a failed request"""
+        self.failed_items += len(page_ids)
+        self.failed_chunks += chunks
+        self.failed_page_ids.update(page_ids)
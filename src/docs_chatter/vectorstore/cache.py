@@ -0,0 +1,128 @@
+"""Persistent content-addressed embedding cache"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """SQLite-backed embedding cache keyed by hash(model, text)
+
+    Entries are evicted in least-recently-used order once the cache
+    grows past ``max_entries``.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """Build the content-addressed cache key for a text"""
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        """Return cached vectors for the given keys (missing keys are omitted)"""
+        if not keys:
+            return {}
+
+        found: dict[str, list[float]] = {}
+        unique_keys = list(dict.fromkeys(keys))
+
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(unique_keys), 500):
+                batch = unique_keys[i : i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+
+            hits = sum(1 for key in keys if key in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+
+        return found
+
+    def put_many(self, items: dict[str, list[float]]) -> None:
+        """Store vectors and evict least-recently-used entries over the limit"""
+        if not items:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                [(key, array("f", vector).tobytes(), now) for key, vector in items.items()],
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries beyond max_entries"""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+
+        self._conn.execute(
+            """
+            DELETE FROM embeddings WHERE key IN (
+                SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?
+            )
+            """,
+            (overflow,),
+        )
+        logger.debug(f"Evicted {overflow} embeddings from cache")
+
+    @property
+    def stats(self) -> dict:
+        """Return hit/miss counters"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,479 @@
+"""Embedded vector store: local files searched in-process, no server needed"""
+
+import json
+import math
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from docs_chatter import metrics
+from docs_chatter.config import settings
+from docs_chatter.rag.reranker import tokenize
+from docs_chatter.vectorstore.base import VectorStore
+from docs_chatter.vectorstore.fusion import fuse
+
+# Chunk fields returned by searches
+SOURCE_FIELDS = ("page_id", "chunk_index", "title", "url", "content")
+
+# Chunk fields a bulk "update" may change
+UPDATABLE_FIELDS = ("page_id", "chunk_index", "title", "url", "content")
+
+# Rows converted to float32 at a time when scoring a float16 matrix
+SCORE_BLOCK_ROWS = 16384
+
+# SQLite host parameter limit is 999 on older builds
+MAX_PARAMS = 500
+
+
+class Strings:
+    """Sequence of strings stored as one UTF-8 buffer, ``i`` at ``data[offsets[i]:offsets[i + 1]]``
+
+    Unlike a fixed-width numpy string array, size does not grow with the
+    longest string.
+    """
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+
+    @staticmethod
+    def encode(strings: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Buffer and offsets arrays of ``strings``"""
+        encoded = [string.encode() for string in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(item) for item in encoded], out=offsets[1:])
+        return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self._bytes(i).decode()
+
+    def _bytes(self, i: int) -> bytes:
+        return self.data[self.offsets[i] : self.offsets[i + 1]].tobytes()
+
+    def find(self, string: str) -> int | None:
+        """Position of ``string`` in a sorted sequence, or None
+
+        UTF-8 byte order matches code point order, so encoded strings
+        compare like the sorted originals.
+        """
+        key = string.encode()
+        low, high = 0, len(self)
+        while low < high:
+            mid = (low + high) // 2
+            if self._bytes(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+        return low if low < len(self) and self._bytes(low) == key else None
+
+
+class Snapshot:
+    """Read-only search structures of one refresh, memory-mapped from disk
+
+    ``vectors`` holds one embedding per chunk; the lexical side is a BM25
+    inverted index in CSR form: postings of ``terms[i]`` are
+    ``postings[offsets[i]:offsets[i + 1]]`` with term frequencies in ``tfs``.
+    Chunk ids and terms are ``Strings`` buffers.
+    """
+
+    FILES = (
+        "id_data",
+        "id_offsets",
+        "vectors",
+        "sq_norms",
+        "term_data",
+        "term_offsets",
+        "offsets",
+        "postings",
+        "tfs",
+        "lengths",
+    )
+
+    def __init__(self, path: Path):
+        self.path = path
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in self.FILES}
+        self.ids = Strings(arrays["id_data"], arrays["id_offsets"])
+        self.vectors = arrays["vectors"]
+        self.sq_norms = arrays["sq_norms"]
+        self.terms = Strings(arrays["term_data"], arrays["term_offsets"])
+        self.offsets = arrays["offsets"]
+        self.postings = arrays["postings"]
+        self.tfs = arrays["tfs"]
+        self.lengths = arrays["lengths"]
+        self.average_length = float(self.lengths.mean()) if len(self.lengths) else 1.0
+
+    @classmethod
+    def build(cls, path: Path, rows: list[tuple[str, str, bytes]], dtype: str) -> "Snapshot":
+        """Write the snapshot of (id, text, float32 embedding bytes) rows and load it"""
+        path.mkdir(parents=True)
+        postings: dict[str, list[tuple[int, int]]] = {}
+        lengths = np.zeros(len(rows), dtype=np.float32)
+        vectors = None
+
+        for row, (_, text, embedding) in enumerate(rows):
+            vector = np.frombuffer(embedding, dtype=np.float32)
+            if vectors is None:
+                vectors = np.zeros((len(rows), len(vector)), dtype=dtype)
+            vectors[row] = vector
+
+            tokens = tokenize(text)
+            lengths[row] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                postings.setdefault(term, []).append((row, tf))
+
+        if vectors is None:
+            vectors = np.zeros((0, 0), dtype=dtype)
+        terms = sorted(postings)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        for i, term in enumerate(terms):
+            offsets[i + 1] = offsets[i] + len(postings[term])
+        flat = [posting for term in terms for posting in postings[term]]
+        id_data, id_offsets = Strings.encode([row[0] for row in rows])
+        term_data, term_offsets = Strings.encode(terms)
+
+        arrays = {
+            "id_data": id_data,
+            "id_offsets": id_offsets,
+            "vectors": vectors,
+            "sq_norms": (vectors.astype(np.float32) ** 2).sum(axis=1),
+            "term_data": term_data,
+            "term_offsets": term_offsets,
+            "offsets": offsets,
+            "postings": np.array([row for row, _ in flat], dtype=np.int32),
+            "tfs": np.array([tf for _, tf in flat], dtype=np.float32),
+            "lengths": lengths,
+        }
+        for name, array in arrays.items():
+            np.save(path / f"{name}.npy", array)
+        return cls(path)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def bm25(self, query: str, top_k: int, k1: float = 1.2, b: float = 0.75) -> dict[int, float]:
+        """Top rows by BM25 score of the query terms"""
+        scores = np.zeros(len(self), dtype=np.float32)
+        for term in dict.fromkeys(tokenize(query)):
+            i = self.terms.find(term)
+            if i is None:
+                continue
+            start, end = self.offsets[i], self.offsets[i + 1]
+            rows = self.postings[start:end]
+            tfs = self.tfs[start:end]
+            idf = math.log(1 + (len(self) - (end - start) + 0.5) / (end - start + 0.5))
+            norm = k1 * (1 - b + b * self.lengths[rows] / self.average_length)
+            scores[rows] += idf * tfs * (k1 + 1) / (tfs + norm)
+        return self._top(scores, top_k, scores > 0)
+
+    def knn(self, embedding: list[float], top_k: int) -> dict[int, float]:
+        """Exact nearest rows scored like OpenSearch's l2 space: 1 / (1 + d^2)"""
+        query = np.asarray(embedding, dtype=np.float32)
+        if self.vectors.dtype == np.float32:
+            dots = self.vectors @ query
+        else:
+            dots = np.empty(len(self), dtype=np.float32)
+            for start in range(0, len(self), SCORE_BLOCK_ROWS):
+                block = self.vectors[start : start + SCORE_BLOCK_ROWS].astype(np.float32)
+                dots[start : start + len(block)] = block @ query
+        distances = np.maximum(self.sq_norms - 2 * dots + query @ query, 0)
+        return self._top(1 / (1 + distances), top_k)
+
+    @staticmethod
+    def _top(scores: np.ndarray, top_k: int, mask: np.ndarray | None = None) -> dict[int, float]:
+        rows = np.flatnonzero(mask) if mask is not None else np.arange(len(scores))
+        if len(rows) > top_k:
+            rows = rows[np.argpartition(-scores[rows], top_k - 1)[:top_k]]
+        return {int(row): float(scores[row]) for row in rows}
+
+
+class EmbeddedVectorStore(VectorStore):
+    """Vector store in a local directory, for single-host deployments, CI and benchmarks
+
+    Documents are kept in a SQLite file, the source of truth written by
+    ``bulk``. ``refresh`` rebuilds a search snapshot from it (an embedding
+    matrix stored as float16 or float32 and a BM25 inverted index) and
+    publishes it by atomically replacing the CURRENT file. Searches
+    memory-map the latest snapshot, so processes pick it up in milliseconds
+    without copying it. As with OpenSearch, writes become searchable only
+    after a refresh.
+
+    Vector search is exact (brute force), which stays fast up to a few
+    hundred thousand chunks; use OpenSearch beyond that.
+    """
+
+    def __init__(self, path: str | None = None, dtype: str | None = None):
+        super().__init__()
+        self.path = Path(path or settings.embedded_store_path).expanduser() / self.index_name
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.dtype = dtype or settings.embedded_vector_dtype
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path / "store.db", check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS chunks (
+                id TEXT PRIMARY KEY,
+                page_id TEXT NOT NULL,
+                chunk_index INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                url TEXT NOT NULL,
+                content TEXT NOT NULL,
+                embedding BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_chunks_page_id ON chunks (page_id);
+            CREATE TABLE IF NOT EXISTS parents (
+                page_id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                url TEXT NOT NULL,
+                parent_content TEXT NOT NULL,
+                content_hash TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+        self._snapshot: Snapshot | None = None
+        self._snapshot_version: tuple[int, int] | None = None
+        self._dirty = False
+
+    def create_index(self) -> bool:
+        return self._create("chunks_created")
+
+    def create_parent_index(self) -> bool:
+        return self._create("parents_created")
+
+    def _create(self, flag: str) -> bool:
+        with self._lock:
+            created = self._conn.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES (?, '1')", (flag,)
+            ).rowcount
+            self._conn.commit()
+        return bool(created)
+
+    def delete_index(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM chunks")
+            self._conn.execute("DELETE FROM parents")
+            self._conn.execute("DELETE FROM meta")
+            self._conn.commit()
+        (self.path / "CURRENT").unlink(missing_ok=True)
+        shutil.rmtree(self.path / "snapshots", ignore_errors=True)
+        self._snapshot = None
+        self._snapshot_version = None
+
+    def bulk(self, body: str | list[dict], refresh: bool = False) -> dict:
+        lines = (
+            [json.loads(line) for line in body.splitlines() if line.strip()]
+            if isinstance(body, str)
+            else list(body)
+        )
+
+        items = []
+        with self._lock:
+            i = 0
+            while i < len(lines):
+                op, meta = next(iter(lines[i].items()))
+                document = lines[i + 1] if op != "delete" else None
+                i += 1 if op == "delete" else 2
+                items.append({op: self._apply(op, meta["_index"], meta["_id"], document)})
+            self._conn.commit()
+            self._dirty = True
+
+        if refresh:
+            self.refresh()
+        return {"errors": any("error" in item[next(iter(item))] for item in items), "items": items}
+
+    def _apply(self, op: str, index: str, doc_id: str, document: dict | None) -> dict:
+        """Apply one bulk action; the caller holds the lock and commits"""
+        parent = index == self.parent_index_name
+        table, key = ("parents", "page_id") if parent else ("chunks", "id")
+
+        if op == "delete":
+            deleted = self._conn.execute(f"DELETE FROM {table} WHERE {key} = ?", (doc_id,)).rowcount
+            return {"_id": doc_id, "status": 200 if deleted else 404}
+
+        if op == "update":
+            fields = {k: v for k, v in document["doc"].items() if k in UPDATABLE_FIELDS}
+            updated = not parent and fields and self._conn.execute(
+                f"UPDATE chunks SET {', '.join(f'{k} = ?' for k in fields)} WHERE id = ?",
+                (*fields.values(), doc_id),
+            ).rowcount
+            if not updated:
+                error = {"type": "document_missing_exception"}
+                return {"_id": doc_id, "status": 404, "error": error}
+            return {"_id": doc_id, "status": 200}
+
+        if parent:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parents VALUES (?, ?, ?, ?, ?)",
+                (
+                    doc_id,
+                    document["title"],
+                    document["url"],
+                    document["parent_content"],
+                    document.get("content_hash", ""),
+                ),
+            )
+        else:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO chunks VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    doc_id,
+                    document["page_id"],
+                    document["chunk_index"],
+                    document["title"],
+                    document["url"],
+                    document["content"],
+                    np.asarray(document["content_embedding"], dtype=np.float32).tobytes(),
+                ),
+            )
+        return {"_id": doc_id, "status": 201}
+
+    def refresh(self) -> None:
+        """Rebuild and publish the search snapshot if anything was written
+
+        The snapshot is rebuilt from every chunk, not patched, so a refresh
+        reads the whole table into memory and costs the same after one write
+        as after thousands. Write in large batches and refresh once per batch
+        (the indexer refreshes once per run) rather than per document.
+        """
+        if not self._dirty and (self.path / "CURRENT").exists():
+            return
+
+        with self._lock:
+            self._dirty = False
+            rows = self._conn.execute(
+                "SELECT id, title || ' ' || content, embedding FROM chunks ORDER BY id"
+            ).fetchall()
+
+        name = f"{time.time_ns()}"
+        snapshots = self.path / "snapshots"
+        Snapshot.build(snapshots / name, rows, self.dtype)
+
+        # Publish atomically; readers keep using the previous snapshot until they see it
+        tmp = self.path / "CURRENT.tmp"
+        tmp.write_text(name)
+        os.replace(tmp, self.path / "CURRENT")
+
+        # Keep the previous snapshot for readers still searching it
+        for old in sorted(p.name for p in snapshots.iterdir())[:-2]:
+            shutil.rmtree(snapshots / old, ignore_errors=True)
+
+    def _current_snapshot(self) -> Snapshot | None:
+        """Return the published snapshot, loading it again when CURRENT changes"""
+        try:
+            stat = (self.path / "CURRENT").stat()
+        except FileNotFoundError:
+            return None
+
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version != self._snapshot_version:
+            name = (self.path / "CURRENT").read_text().strip()
+            self._snapshot = Snapshot(self.path / "snapshots" / name)
+            self._snapshot_version = version
+        return self._snapshot
+
+    def delete_by_page_id(self, page_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM chunks WHERE page_id = ?", (page_id,))
+            self._conn.execute("DELETE FROM parents WHERE page_id = ?", (page_id,))
+            self._conn.commit()
+            self._dirty = True
+
+    def _select_in(self, sql: str, values: list[str]) -> list[tuple]:
+        """Run a query with an ``IN ({})`` placeholder over values in batches"""
+        rows = []
+        with self._lock:
+            for i in range(0, len(values), MAX_PARAMS):
+                batch = values[i : i + MAX_PARAMS]
+                rows.extend(
+                    self._conn.execute(sql.format(", ".join("?" * len(batch))), batch).fetchall()
+                )
+        return rows
+
+    def get_parents(self, page_ids: list[str]) -> dict[str, dict[str, Any]]:
+        rows = self._select_in(
+            "SELECT page_id, title, url, parent_content, content_hash FROM parents "
+            "WHERE page_id IN ({})",
+            page_ids,
+        )
+        return {
+            row[0]: {
+                "page_id": row[0],
+                "title": row[1],
+                "url": row[2],
+                "parent_content": row[3],
+                "content_hash": row[4],
+            }
+            for row in rows
+        }
+
+    def get_page_hashes(self, page_ids: list[str]) -> dict[str, str]:
+        rows = self._select_in(
+            "SELECT page_id, content_hash FROM parents WHERE page_id IN ({})", page_ids
+        )
+        return dict(rows)
+
+    def get_chunk_ids(self, page_ids: list[str]) -> list[tuple[str, str]]:
+        return self._select_in("SELECT page_id, id FROM chunks WHERE page_id IN ({})", page_ids)
+
+    def count_chunks(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def get_generation(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return int(row[0]) if row else 0
+
+    def bump_generation(self) -> int:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('generation', '1') "
+                "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+            )
+            self._conn.commit()
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return int(row[0])
+
+    def _hybrid_search(self, query: str, top_k: int) -> list[dict[str, Any]]:
+        """Fuse BM25 and vector scores of the snapshot like the OpenSearch hybrid query"""
+        query_embedding = self.embeddings.embed_query(query)
+        candidates = max(top_k, settings.hybrid_candidates)
+
+        with metrics.span("embedded_search"):
+            snapshot = self._current_snapshot()
+            if snapshot is None or not len(snapshot):
+                return []
+
+            combined = fuse(
+                [snapshot.bm25(query, candidates), snapshot.knn(query_embedding, candidates)]
+            )
+            ranked = sorted(combined.items(), key=lambda item: item[1], reverse=True)[:top_k]
+            ids = [snapshot.ids[row] for row, _ in ranked]
+            rows = self._select_in(
+                f"SELECT id, {', '.join(SOURCE_FIELDS)} FROM chunks WHERE id IN ({{}})", ids
+            )
+
+        # Chunks deleted since the snapshot was built are skipped
+        documents = {row[0]: dict(zip(SOURCE_FIELDS, row[1:])) for row in rows}
+        return [
+            {**documents[doc_id], "_score": score}
+            for doc_id, (_, score) in zip(ids, ranked)
+            if doc_id in documents
+        ]
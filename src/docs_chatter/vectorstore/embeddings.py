@@ -1,27 +1,96 @@
 """Cohere embeddings wrapper"""
 
+import numpy as np
 from langchain_cohere import CohereEmbeddings as LangChainCohereEmbeddings
 
+from docs_chatter import metrics
+from docs_chatter.cache import create_cache, normalize_query
 from docs_chatter.config import settings
+from docs_chatter.vectorstore.cache import EmbeddingCache
+
+
+def normalize(vector: list[float]) -> list[float]:
+    """Scale a vector to unit length, so inner product equals cosine similarity"""
+    array = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(array))
+    return (array / norm).tolist() if norm else list(vector)
 
 
 class CohereEmbeddings:
     """Wrapper for Cohere embeddings using LangChain"""
 
-    def __init__(self, model: str = "embed-multilingual-v3.0"):
+    # Max texts per Cohere embed request
+    max_batch_size = 96
+
+    def __init__(
+        self,
+        model: str = "embed-multilingual-v3.0",
+        cache: EmbeddingCache | None = None,
+    ):
         self.model = model
         self._embeddings = LangChainCohereEmbeddings(
             cohere_api_key=settings.cohere_api_key,
             model=model,
         )
 
+        if cache is None and settings.embedding_cache_path:
+            cache = EmbeddingCache(
+                path=settings.embedding_cache_path,
+                max_entries=settings.embedding_cache_max_entries,
+            )
+        self.cache = cache
+        self.query_cache = create_cache(
+            "query-embeddings", settings.query_cache_size, settings.query_cache_ttl
+        )
+
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
-        """Embed a list of documents"""
-        return self._embeddings.embed_documents(texts)
+        """Embed a list of documents, reusing cached vectors when available"""
+        if self.cache is None:
+            return self._embed_batched(texts)
+
+        keys = [EmbeddingCache.make_key(self.model, text) for text in texts]
+        cached = self.cache.get_many(keys)
+
+        # Embed only texts not found in cache (deduplicated)
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached:
+                missing.setdefault(key, text)
+
+        if missing:
+            vectors = self._embed_batched(list(missing.values()))
+            new_items = dict(zip(missing.keys(), vectors))
+            self.cache.put_many(new_items)
+            cached.update(new_items)
+
+        return [cached[key] for key in keys]
+
+    def _embed_batched(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts in requests of at most max_batch_size"""
+        vectors = []
+        for i in range(0, len(texts), self.max_batch_size):
+            vectors.extend(
+                self._embeddings.embed_documents(texts[i : i + self.max_batch_size])
+            )
+        return [normalize(vector) for vector in vectors]
 
     def embed_query(self, text: str) -> list[float]:
-        """Embed a single query"""
-        return self._embeddings.embed_query(text)
+        """Embed a single query, cached by normalized query text"""
+        key = normalize_query(text)
+        embedding = self.query_cache.get(key)
+        metrics.record_cache("query_embedding", embedding is not None)
+        if embedding is None:
+            with metrics.span("embed_query"):
+                embedding = normalize(self._embeddings.embed_query(text))
+            self.query_cache.set(key, embedding)
+        return embedding
+
+    @property
+    def cache_stats(self) -> dict:
+        """Return embedding cache hit/miss counters"""
+        if self.cache is None:
+            return {"hits": 0, "misses": 0, "hit_rate": 0.0}
+        return self.cache.stats
 
     @property
     def dimension(self) -> int:
@@ -0,0 +1,70 @@
+"""Score fusion for hybrid (lexical + vector) search"""
+
+import statistics
+from collections.abc import Hashable
+
+from docs_chatter.config import settings
+
+FUSION_METHODS = ("rrf", "min_max", "z_score")
+
+
+def fusion_weights() -> list[float]:
+    """Configured (lexical, vector) weights, summing to 1"""
+    lexical = min(max(settings.hybrid_lexical_weight, 0.0), 1.0)
+    return [lexical, 1.0 - lexical]
+
+
+def fuse(
+    result_sets: list[dict[Hashable, float]],
+    method: str | None = None,
+    weights: list[float] | None = None,
+    rank_constant: int | None = None,
+) -> dict[Hashable, float]:
+    """Combine the scores of several searches into one score per document
+
+    Each result set maps document ids to that search's raw score. A document
+    missing from a set gets nothing from it. "rrf" and "min_max" produce
+    scores in [0, 1], 1 meaning first in every search, so a score threshold
+    means the same for both sides; "z_score" is centered on 0.
+
+    Args:
+        result_sets: Raw scores per search, in the order of ``weights``
+        method: "rrf", "min_max" or "z_score" (default: HYBRID_FUSION)
+        weights: Weight per search (default: HYBRID_LEXICAL_WEIGHT and the rest)
+        rank_constant: RRF rank constant (default: HYBRID_RRF_RANK_CONSTANT)
+    """
+    method = method or settings.hybrid_fusion
+    weights = weights or fusion_weights()
+    rank_constant = rank_constant or settings.hybrid_rrf_rank_constant
+    total = sum(weights) or 1.0
+
+    combined: dict[Hashable, float] = {}
+    for scores, weight in zip(result_sets, weights):
+        if not scores:
+            continue
+        weight /= total
+
+        if method == "rrf":
+            ranked = sorted(scores, key=scores.get, reverse=True)
+            # Scaled so that rank 1 in every search scores 1
+            normalized = {
+                doc_id: (rank_constant + 1) / (rank_constant + rank)
+                for rank, doc_id in enumerate(ranked, 1)
+            }
+        elif method == "min_max":
+            low, high = min(scores.values()), max(scores.values())
+            normalized = {
+                doc_id: (score - low) / (high - low) if high > low else 1.0
+                for doc_id, score in scores.items()
+            }
+        elif method == "z_score":
+            mean = statistics.fmean(scores.values())
+            stdev = statistics.pstdev(scores.values()) or 1.0
+            normalized = {doc_id: (score - mean) / stdev for doc_id, score in scores.items()}
+        else:
+            raise ValueError(f"Unknown fusion method: {method}")
+
+        for doc_id, score in normalized.items():
+            combined[doc_id] = combined.get(doc_id, 0.0) + weight * score
+
+    return combined
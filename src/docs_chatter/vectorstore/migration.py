@@ -0,0 +1,211 @@
+"""Move an existing chunk index to the configured vector mapping"""
+
+import logging
+import time
+from datetime import datetime, timezone
+
+from opensearchpy import helpers
+
+from docs_chatter.config import settings
+from docs_chatter.vectorstore.opensearch import OpenSearchClient
+
+logger = logging.getLogger(__name__)
+
+# Vectors sampled from the source index to calibrate the int8 scale
+CALIBRATION_SAMPLE = 2000
+
+# Normalizes each vector and, for byte storage, quantizes it to int8
+REINDEX_SCRIPT = """
+double norm = 0;
+for (def x : ctx._source.content_embedding) { norm += x * x; }
+norm = Math.sqrt(norm);
+if (norm > 0) {
+  List vector = new ArrayList();
+  for (def x : ctx._source.content_embedding) {
+    double value = x / norm;
+    if (params.quantize) {
+      vector.add((int) Math.max(-128, Math.min(127, Math.round(value * params.scale))));
+    } else {
+      vector.add(value);
+    }
+  }
+  ctx._source.content_embedding = vector;
+}
+"""
+
+
+def wait_for_task(store: OpenSearchClient, task_id: str, poll_interval: float) -> dict:
+    """Poll a server-side task until it completes, logging its progress"""
+    while True:
+        task = store.client.tasks.get(task_id=task_id)
+        status = task.get("task", {}).get("status", {})
+        if task.get("completed"):
+            return task
+        logger.info(f"Reindexed {status.get('created', 0)}/{status.get('total', '?')} chunks")
+        time.sleep(poll_interval)
+
+
+def calibrate_byte_scale(store: OpenSearchClient, source: str) -> float:
+    """Fit the int8 scale to a sample of the vectors in an index"""
+    vectors = []
+    for hit in helpers.scan(
+        store.client,
+        index=source,
+        query={"query": {"match_all": {}}, "_source": ["content_embedding"]},
+    ):
+        vectors.append(hit["_source"]["content_embedding"])
+        if len(vectors) >= CALIBRATION_SAMPLE:
+            break
+    return store.fit_byte_scale(vectors) if vectors else 0.0
+
+
+def train_pq_model(
+    store: OpenSearchClient,
+    model_id: str,
+    training_index: str,
+    poll_interval: float,
+) -> None:
+    """Train a faiss PQ model on the vectors already in an index"""
+    logger.info(f"Training PQ model {model_id} on {training_index}")
+    store.client.plugins.knn.train_model(
+        model_id=model_id, body=store.pq_training_body(training_index)
+    )
+    while True:
+        model = store.client.plugins.knn.get_model(model_id=model_id)
+        if model.get("state") == "created":
+            return
+        if model.get("state") == "failed":
+            raise RuntimeError(f"PQ model training failed: {model.get('error')}")
+        time.sleep(poll_interval)
+
+
+def copy_parents(
+    store: OpenSearchClient,
+    sources: list[str],
+    target: str,
+    poll_interval: float,
+) -> None:
+    """Reindex parent documents unchanged into the new version's parent index"""
+    client = store.client
+    expected = client.count(index=",".join(sources))["count"]
+    response = client.reindex(
+        body={"source": {"index": sources}, "dest": {"index": target}},
+        params={"wait_for_completion": "false", "refresh": "true"},
+    )
+    task = wait_for_task(store, response["task"], poll_interval)
+
+    failures = task.get("response", {}).get("failures") or task.get("error")
+    copied = client.count(index=target)["count"]
+    if failures or copied != expected:
+        raise RuntimeError(f"Reindex into {target} failed ({copied}/{expected} copied): {failures}")
+
+
+def migrate_index(
+    store: OpenSearchClient | None = None,
+    poll_interval: float = 5.0,
+    dry_run: bool = False,
+) -> dict:
+    """Copy the chunk index into a new index with the configured vector mapping
+
+    Vectors are normalized (and quantized for byte storage, with an int8
+    scale calibrated on a sample of the source) server-side by a reindex
+    script. Parent documents are copied as they are into the new version's
+    parent index, so the result has the same layout as a rebuild. Both
+    then take over their names: the old chunk and parent indexes are
+    deleted and the names become aliases of the new ones in a single atomic
+    alias update, so searches never see a missing index. Stop the indexer
+    while migrating; writes made meanwhile are lost.
+
+    Returns:
+        Summary with the old and new index names and document counts
+    """
+    store = store or OpenSearchClient()
+    client = store.client
+    name = store.index_name
+
+    sources = store.concrete_indexes(name)
+    if len(sources) != 1:
+        raise RuntimeError(f"{name} resolves to {len(sources)} indexes: {sources}")
+    source = sources[0]
+    target = f"{name}-{datetime.now(timezone.utc):%Y%m%d%H%M%S}"
+    target_parents = store.version(target).parent_index_name
+    parent_sources = []
+    if client.indices.exists(index=store.parent_index_name):
+        parent_sources = store.concrete_indexes(store.parent_index_name)
+
+    summary = {
+        "alias": name,
+        "source": source,
+        "target": target,
+        "parent_sources": parent_sources,
+        "parent_target": target_parents,
+        "engine": settings.knn_engine,
+        "space_type": settings.knn_space_type,
+        "compression": settings.knn_compression,
+        "documents": client.count(index=source)["count"],
+    }
+    byte_scale = 0.0
+    if settings.knn_compression == "byte":
+        byte_scale = calibrate_byte_scale(store, source)
+        summary["byte_scale"] = byte_scale
+
+    # Validates the settings before anything is created
+    body = store.index_body(
+        model_id=target if settings.knn_compression == "pq" else None,
+        byte_scale=byte_scale,
+    )
+    if dry_run:
+        summary["mapping"] = body["mappings"]["properties"]["content_embedding"]
+        return summary
+
+    if settings.knn_compression == "pq":
+        train_pq_model(store, target, source, poll_interval)
+
+    # Searches cached against the old index are dropped once it is replaced
+    body["mappings"]["_meta"]["generation"] = store.get_generation() + 1
+    client.indices.create(index=target, body=body)
+    client.indices.create(index=target_parents, body=store.parent_index_body())
+
+    start = time.monotonic()
+    response = client.reindex(
+        body={
+            "source": {"index": source},
+            "dest": {"index": target},
+            "script": {
+                "lang": "painless",
+                "source": REINDEX_SCRIPT,
+                "params": {
+                    "quantize": settings.knn_compression == "byte",
+                    "scale": byte_scale,
+                },
+            },
+        },
+        params={"wait_for_completion": "false", "refresh": "true"},
+    )
+    task = wait_for_task(store, response["task"], poll_interval)
+
+    failures = task.get("response", {}).get("failures") or task.get("error")
+    copied = client.count(index=target)["count"]
+    if failures or copied != summary["documents"]:
+        client.indices.delete(index=f"{target},{target_parents}")
+        raise RuntimeError(
+            f"Reindex into {target} failed ({copied}/{summary['documents']} copied): {failures}"
+        )
+
+    if parent_sources:
+        try:
+            copy_parents(store, parent_sources, target_parents, poll_interval)
+        except Exception:
+            client.indices.delete(index=f"{target},{target_parents}")
+            raise
+
+    # Deleting the old indexes frees their names (or aliases) for the new ones atomically
+    actions = [{"remove_index": {"index": index}} for index in [source, *parent_sources]]
+    actions += [
+        {"add": {"index": target, "alias": name}},
+        {"add": {"index": target_parents, "alias": store.parent_index_name}},
+    ]
+    client.indices.update_aliases(body={"actions": actions})
+
+    summary["reindex_seconds"] = time.monotonic() - start
+    return summary
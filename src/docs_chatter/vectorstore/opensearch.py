@@ -1,18 +1,46 @@
 """OpenSearch client for vector storage and hybrid search"""
 
-from opensearchpy import OpenSearch
-from typing import Any
+from __future__ import annotations
 
+import logging
+import re
+from datetime import datetime, timezone
+
+import numpy as np
+from opensearchpy import NotFoundError, OpenSearch, helpers
+from typing import TYPE_CHECKING, Any
+
+from docs_chatter import metrics
 from docs_chatter.config import settings
+from docs_chatter.vectorstore.base import VectorStore
 from docs_chatter.vectorstore.embeddings import CohereEmbeddings
-from docs_chatter.rag.chunker import DocumentChunk
+from docs_chatter.vectorstore.fusion import FUSION_METHODS, fuse, fusion_weights
+
+if TYPE_CHECKING:
+    from docs_chatter.rag.chunker import DocumentChunk
+
+logger = logging.getLogger(__name__)
+
+SOURCE_FIELDS = ("page_id", "chunk_index", "title", "url", "content")
 
+# Index settings while a staging index is bulk loaded, restored before switching
+BULK_LOAD_SETTINGS = {"refresh_interval": "-1", "number_of_replicas": 0}
 
-class OpenSearchClient:
+# int8 scale of byte indexes created before scales were calibrated
+DEFAULT_BYTE_SCALE = 127.0
+
+
+class OpenSearchClient(VectorStore):
     """Client for OpenSearch vector operations"""
 
-    def __init__(self):
-        self.client = OpenSearch(
+    def __init__(
+        self,
+        index_name: str | None = None,
+        client: OpenSearch | None = None,
+        embeddings: CohereEmbeddings | None = None,
+    ):
+        super().__init__(index_name, embeddings)
+        self.client = client or OpenSearch(
             hosts=[
                 {
                     "host": settings.opensearch_host,
@@ -24,20 +52,52 @@ class OpenSearchClient:
             verify_certs=settings.opensearch_verify_certs,
             ssl_show_warn=False,
         )
-        self.index_name = settings.opensearch_index
-        self.embeddings = CohereEmbeddings()
 
-    def create_index(self) -> None:
-        """Create the index with proper mappings for hybrid search"""
+        # Fuses hybrid query scores server-side; None until first checked
+        self.search_pipeline_name = f"{self.index_name}-hybrid"
+        self._server_fusion: bool | None = None
+
+        # Layout of new index versions, read from the index template once
+        self.template_name = f"{self.index_name}-versions"
+        self._layout: dict | None = None
+
+        # int8 scale of a byte index, read from the mapping metadata
+        self._byte_scale: float | None = None
+
+    def create_index(self) -> bool:
+        """Create the index with proper mappings for hybrid search
+
+        Returns:
+            True if the index was created, False if it already existed
+        """
         if self.client.indices.exists(index=self.index_name):
-            return
+            return False
 
-        mappings = {
+        self.client.indices.create(index=self.index_name, body=self.index_body())
+        return True
+
+    def index_body(
+        self,
+        model_id: str | None = None,
+        generation: int = 0,
+        byte_scale: float = 0.0,
+    ) -> dict:
+        """Settings and mappings of a chunk index
+
+        Args:
+            model_id: Trained k-NN model, required for PQ compression
+            generation: Initial index generation
+            byte_scale: int8 scale for byte compression, 0 to calibrate on first write
+        """
+        meta = {"generation": generation}
+        if settings.knn_compression == "byte":
+            meta["byte_scale"] = byte_scale
+        return {
             "settings": {
                 "index": {
                     "knn": True,
-                    "number_of_shards": 1,
-                    "number_of_replicas": 0,
+                    "knn.algo_param.ef_search": self.layout()["ef_search"],
+                    **self.index_settings(),
                 },
                 "analysis": {
                     "analyzer": {
@@ -50,6 +110,7 @@ class OpenSearchClient:
                 },
             },
             "mappings": {
+                "_meta": meta,
                 "properties": {
                     "page_id": {"type": "keyword"},
                     "chunk_index": {"type": "integer"},
@@ -62,138 +123,604 @@ class OpenSearchClient:
                         "type": "text",
                         "analyzer": "korean_analyzer",
                     },
-                    "parent_content": {"type": "text"},
-                    "content_embedding": {
-                        "type": "knn_vector",
-                        "dimension": self.embeddings.dimension,
-                        "method": {
-                            "name": "hnsw",
-                            "space_type": "l2",
-                            "engine": "nmslib",
-                        },
-                    },
+                    "content_embedding": self.vector_field_mapping(model_id),
+                },
+            },
+        }
+
+    def layout(self) -> dict:
+        """Shard, replica and HNSW parameters for new indexes
+
+        Values chosen by scripts/tune_index.py are stored in the index
+        template and take precedence over Settings.
+        """
+        if self._layout is None:
+            layout = {
+                "shards": settings.opensearch_shards,
+                "replicas": settings.opensearch_replicas,
+                "m": settings.knn_m,
+                "ef_construction": settings.knn_ef_construction,
+                "ef_search": settings.knn_ef_search,
+            }
+            try:
+                response = self.client.indices.get_index_template(name=self.template_name)
+                template = response["index_templates"][0]["index_template"]
+                layout.update(template.get("_meta", {}).get("layout", {}))
+            except NotFoundError:
+                pass
+            self._layout = layout
+        return self._layout
+
+    def put_index_template(self, layout: dict) -> None:
+        """Store a tuned layout in the index template applied to new index versions"""
+        self.client.indices.put_index_template(
+            name=self.template_name,
+            body={
+                "index_patterns": [f"{self.index_name}-2*"],
+                "template": {
+                    "settings": {
+                        "index": {
+                            "number_of_shards": layout["shards"],
+                            "number_of_replicas": layout["replicas"],
+                        }
+                    }
+                },
+                "_meta": {"layout": layout},
+            },
+        )
+        self._layout = None
+
+    def apply_search_settings(self) -> None:
+        """Apply the dynamic part of the layout (replicas, ef_search) to the live indexes"""
+        layout = self.layout()
+        self.client.indices.put_settings(
+            index=self.index_name,
+            body={
+                "index": {
+                    "number_of_replicas": layout["replicas"],
+                    "knn.algo_param.ef_search": layout["ef_search"],
                 }
             },
+        )
+        self.client.indices.put_settings(
+            index=self.parent_index_name,
+            body={"index": {"number_of_replicas": layout["replicas"]}},
+        )
+
+    def index_settings(self) -> dict:
+        """Shard and replica settings shared by the chunk and parent indexes"""
+        layout = self.layout()
+        return {
+            "number_of_shards": layout["shards"],
+            "number_of_replicas": layout["replicas"],
         }
 
-        self.client.indices.create(index=self.index_name, body=mappings)
+    def parent_index_body(self) -> dict:
+        """Settings and mappings of a parent document index"""
+        return {
+            "settings": {"index": self.index_settings()},
+            "mappings": {
+                "properties": {
+                    "page_id": {"type": "keyword"},
+                    "title": {"type": "keyword", "index": False},
+                    "url": {"type": "keyword", "index": False},
+                    "parent_content": {"type": "text", "index": False},
+                    "content_hash": {"type": "keyword", "index": False},
+                }
+            },
+        }
+
+    def vector_field_mapping(self, model_id: str | None = None) -> dict:
+        """knn_vector mapping for the configured engine, space type and compression
+
+        "fp16" stores faiss HNSW vectors as half floats (2x smaller), "byte"
+        stores vectors quantized to int8 here (4x), and "pq" uses a trained
+        faiss product quantization model (KNN_PQ_M bytes per vector).
+        """
+        engine = settings.knn_engine
+        compression = settings.knn_compression
+        space_type = settings.knn_space_type
+
+        if compression == "pq":
+            if not model_id:
+                raise ValueError(
+                    "PQ compression needs a trained model; "
+                    "migrate an existing index with scripts/migrate_index.py"
+                )
+            return {"type": "knn_vector", "model_id": model_id}
+
+        layout = self.layout()
+        method = {
+            "name": "hnsw",
+            "space_type": space_type,
+            "engine": engine,
+            "parameters": {"m": layout["m"], "ef_construction": layout["ef_construction"]},
+        }
+        mapping = {
+            "type": "knn_vector",
+            "dimension": self.embeddings.dimension,
+            "method": method,
+        }
+
+        if compression == "fp16":
+            if engine != "faiss":
+                raise ValueError("fp16 compression requires the faiss engine")
+            method["parameters"]["encoder"] = {"name": "sq", "parameters": {"type": "fp16"}}
+        elif compression == "byte":
+            if engine not in ("faiss", "lucene"):
+                raise ValueError("byte compression requires the faiss or lucene engine")
+            mapping["data_type"] = "byte"
+        elif compression != "none":
+            raise ValueError(f"Unknown vector compression: {compression}")
+
+        return mapping
+
+    def pq_training_body(self, training_index: str) -> dict:
+        """Request training a faiss HNSW/PQ model on the vectors of an index"""
+        return {
+            "training_index": training_index,
+            "training_field": "content_embedding",
+            "dimension": self.embeddings.dimension,
+            "description": f"PQ model for {self.index_name}",
+            "method": {
+                "name": "hnsw",
+                "engine": "faiss",
+                "space_type": settings.knn_space_type,
+                "parameters": {
+                    "m": self.layout()["m"],
+                    "ef_construction": self.layout()["ef_construction"],
+                    "encoder": {
+                        "name": "pq",
+                        "parameters": {"m": settings.knn_pq_m, "code_size": 8},
+                    },
+                },
+            },
+        }
+
+    def byte_scale(self) -> float:
+        """int8 scale of the chunk index, 0 while a new byte index is uncalibrated"""
+        if self._byte_scale is None:
+            self.get_meta()
+        return self._byte_scale
+
+    @staticmethod
+    def fit_byte_scale(vectors: list[list[float]]) -> float:
+        """int8 scale mapping the largest component of unit-length vectors to 127
+
+        Components of normalized high-dimensional embeddings are small (about
+        0.1 at most for 1024 dimensions), so scaling by 127 alone would use
+        only a few int8 values.
+        """
+        array = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(array, axis=1, keepdims=True)
+        max_abs = float(np.abs(array / np.where(norms > 0, norms, 1)).max(initial=0.0))
+        return 127.0 / max_abs if max_abs > 0 else DEFAULT_BYTE_SCALE
+
+    def calibrate(self, embeddings: list[list[float]]) -> None:
+        """Fix the int8 scale of a new byte index from the first vectors written"""
+        if settings.knn_compression != "byte" or not embeddings or self.byte_scale():
+            return
+        scale = self.fit_byte_scale(embeddings)
+        self.put_meta(byte_scale=scale)
+        self._byte_scale = scale
+        logger.info(f"Calibrated int8 scale of {self.index_name}: {scale:.1f}")
+
+    def encode_vector(self, embedding: list[float]) -> list[float] | list[int]:
+        """Convert a unit-length embedding to the stored representation"""
+        if settings.knn_compression == "byte":
+            scale = self.byte_scale() or DEFAULT_BYTE_SCALE
+            scaled = np.rint(np.asarray(embedding, dtype=np.float32) * scale)
+            return np.clip(scaled, -128, 127).astype(int).tolist()
+        return embedding
+
+    def build_index_action(
+        self,
+        chunk: DocumentChunk,
+        embedding: list[float],
+    ) -> tuple[dict, dict]:
+        """Build the bulk action and document for a chunk, encoding its vector"""
+        return super().build_index_action(chunk, self.encode_vector(embedding))
+
+    def create_parent_index(self) -> bool:
+        """Create the parent document index (page markdown, fetched by id only)
+
+        Returns:
+            True if the index was created, False if it already existed
+        """
+        if self.client.indices.exists(index=self.parent_index_name):
+            return False
+
+        self.client.indices.create(index=self.parent_index_name, body=self.parent_index_body())
+        return True
 
     def delete_index(self) -> None:
-        """Delete the index"""
-        if self.client.indices.exists(index=self.index_name):
-            self.client.indices.delete(index=self.index_name)
+        """Delete the chunk and parent indexes"""
+        for index in (self.index_name, self.parent_index_name):
+            if self.client.indices.exists(index=index):
+                # A migrated index is an alias; delete the index behind it
+                self.client.indices.delete(index=",".join(self.concrete_indexes(index)))
+
+    def concrete_indexes(self, name: str) -> list[str]:
+        """Resolve an index name or alias to the indexes behind it"""
+        return list(self.client.indices.get(index=name))
+
+    def version(self, index_name: str) -> "OpenSearchClient":
+        """Client for another chunk index sharing this client's connection, embeddings and layout"""
+        store = OpenSearchClient(index_name, client=self.client, embeddings=self.embeddings)
+        store._layout = self.layout()
+        return store
+
+    def live_model_id(self) -> str | None:
+        """PQ model of the live index, reused by indexes built next to it"""
+        if settings.knn_compression != "pq":
+            return None
+        if not self.client.indices.exists(index=self.index_name):
+            return None
+        mappings = next(iter(self.client.indices.get_mapping(index=self.index_name).values()))
+        return mappings["mappings"]["properties"]["content_embedding"].get("model_id")
+
+    def index_versions(self) -> list[str]:
+        """Versioned chunk indexes created by rebuilds and migrations, oldest first"""
+        pattern = re.compile(rf"{re.escape(self.index_name)}-\d{{14}}")
+        indexes = self.client.indices.get(index=f"{self.index_name}-*", expand_wildcards="all")
+        return sorted(index for index in indexes if pattern.fullmatch(index))
+
+    def create_staging(self) -> "OpenSearchClient":
+        """Create empty versioned indexes to rebuild into, tuned for bulk loading
 
-    def index_chunks(self, chunks: list[DocumentChunk]) -> None:
-        """Index document chunks with embeddings"""
-        if not chunks:
+        The new chunk index is named "<index>-<UTC timestamp>" with its parent
+        index next to it. Refresh is disabled and replicas are 0 until
+        ``switch_to`` finalizes them.
+        """
+        staging = self.version(f"{self.index_name}-{datetime.now(timezone.utc):%Y%m%d%H%M%S}")
+        live_exists = self.client.indices.exists(index=self.index_name)
+
+        # Generations keep increasing across versions so bot caches are invalidated
+        live_generation = self.get_generation() if live_exists else 0
+        body = staging.index_body(model_id=self.live_model_id(), generation=live_generation + 1)
+        parent_body = staging.parent_index_body()
+        for index_body in (body, parent_body):
+            index_body["settings"]["index"].update(BULK_LOAD_SETTINGS)
+
+        self.client.indices.create(index=staging.index_name, body=body)
+        self.client.indices.create(index=staging.parent_index_name, body=parent_body)
+        logger.info(f"Created staging indexes {staging.index_name}, {staging.parent_index_name}")
+        return staging
+
+    def switch_to(self, staging: "OpenSearchClient") -> None:
+        """Finalize staging indexes and point the aliases at them
+
+        Restores refresh and replicas, force-merges the chunk index, then moves
+        both aliases in one atomic update. A legacy index occupying the alias
+        name is deleted in that same update, since the name must become an
+        alias. Old versions are left for ``prune_versions``.
+        """
+        indexes = [staging.index_name, staging.parent_index_name]
+        restored = {key: self.index_settings().get(key) for key in BULK_LOAD_SETTINGS}
+        self.client.indices.put_settings(index=",".join(indexes), body={"index": restored})
+        self.client.indices.refresh(index=",".join(indexes))
+        self.client.indices.forcemerge(
+            index=staging.index_name,
+            max_num_segments=settings.index_force_merge_segments,
+            request_timeout=settings.index_force_merge_timeout,
+        )
+
+        actions = []
+        for alias, target in (
+            (self.index_name, staging.index_name),
+            (self.parent_index_name, staging.parent_index_name),
+        ):
+            actions.extend(self._alias_actions(alias, target))
+        self.client.indices.update_aliases(body={"actions": actions})
+        logger.info(f"Switched {self.index_name} to {staging.index_name}")
+
+    def _alias_actions(self, alias: str, target: str) -> list[dict]:
+        """Alias update actions serving ``target`` under ``alias``"""
+        actions = [{"add": {"index": target, "alias": alias}}]
+        if not self.client.indices.exists(index=alias):
+            return actions
+
+        for index in self.concrete_indexes(alias):
+            if index == alias:
+                logger.warning(f"Deleting {index} to turn its name into an alias")
+                actions.insert(0, {"remove_index": {"index": index}})
+            else:
+                actions.insert(0, {"remove": {"index": index, "alias": alias}})
+        return actions
+
+    def prune_versions(self) -> None:
+        """Delete versions older than the newest INDEX_KEEP_VERSIONS behind the live one
+
+        Runs after a switch, when the new version is already live, so failures
+        are logged rather than raised; the next prune retries them.
+        """
+        try:
+            live = set(self.concrete_indexes(self.index_name))
+            previous = [version for version in self.index_versions() if version not in live]
+        except Exception as e:
+            logger.warning(f"Could not list versions of {self.index_name} to prune: {e}")
             return
 
-        # Generate embeddings in batch
-        texts = [chunk.content for chunk in chunks]
-        embeddings = self.embeddings.embed_documents(texts)
+        keep = settings.index_keep_versions
+        for version in previous[: max(len(previous) - keep, 0)]:
+            try:
+                self.discard(self.version(version))
+            except Exception as e:
+                logger.warning(f"Could not delete old version {version}: {e}")
+
+    def discard(self, staging: "OpenSearchClient") -> None:
+        """Delete a version's chunk and parent indexes"""
+        self.client.indices.delete(
+            index=f"{staging.index_name},{staging.parent_index_name}",
+            ignore_unavailable=True,
+        )
+        logger.info(f"Deleted index version {staging.index_name}")
+
+    def rollback(self) -> str:
+        """Serve the newest version older than the live one again
+
+        Returns:
+            Name of the chunk index now served
+        """
+        live = set(self.concrete_indexes(self.index_name))
+        candidates = [
+            version
+            for version in self.index_versions()
+            if version not in live
+            and version < max(live)
+            and self.client.indices.exists(index=f"{version}-parents")
+        ]
+        if not candidates:
+            raise RuntimeError(f"No previous version of {self.index_name} to roll back to")
+
+        previous = self.version(candidates[-1])
+        # Move the generation forward so caches filled from the live version are dropped
+        previous.put_meta(generation=self.get_generation() + 1)
 
-        # Bulk index
         actions = []
-        for chunk, embedding in zip(chunks, embeddings):
-            doc_id = f"{chunk.page_id}_{chunk.chunk_index}"
-
-            action = {"index": {"_index": self.index_name, "_id": doc_id}}
-            document = {
-                "page_id": chunk.page_id,
-                "chunk_index": chunk.chunk_index,
-                "title": chunk.title,
-                "url": chunk.url,
-                "content": chunk.content,
-                "parent_content": chunk.parent_content,
-                "content_embedding": embedding,
-            }
+        for alias, target in (
+            (self.index_name, previous.index_name),
+            (self.parent_index_name, previous.parent_index_name),
+        ):
+            actions.extend(self._alias_actions(alias, target))
+        self.client.indices.update_aliases(body={"actions": actions})
+        logger.info(f"Rolled {self.index_name} back to {previous.index_name}")
+        return previous.index_name
 
-            actions.append(action)
-            actions.append(document)
+    def bulk(self, body: str | list[dict], refresh: bool = False) -> dict:
+        """Send a bulk request"""
+        return self.client.bulk(body=body, refresh=refresh)
 
-        if actions:
-            self.client.bulk(body=actions, refresh=True)
+    def refresh(self) -> None:
+        """Refresh the indexes so recent writes become searchable"""
+        self.client.indices.refresh(index=f"{self.index_name},{self.parent_index_name}")
 
     def delete_by_page_id(self, page_id: str) -> None:
-        """Delete all chunks for a page"""
+        """Delete all chunks and the parent document for a page"""
         query = {"query": {"term": {"page_id": page_id}}}
         self.client.delete_by_query(index=self.index_name, body=query)
+        self.client.delete(index=self.parent_index_name, id=page_id, ignore=[404])
 
-    def hybrid_search(
-        self,
-        query: str,
-        top_k: int | None = None,
-    ) -> list[dict[str, Any]]:
-        """Perform hybrid search (lexical + neural)"""
-        top_k = top_k or settings.search_top_k
+    def get_parents(self, page_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Fetch parent documents for many pages with a single multi-get"""
+        if not page_ids:
+            return {}
 
-        # Get query embedding
-        query_embedding = self.embeddings.embed_query(query)
+        try:
+            response = self.client.mget(index=self.parent_index_name, body={"ids": page_ids})
+        except NotFoundError:
+            # Parent index not created yet; the retriever falls back to chunk content
+            return {}
+        return {
+            doc["_id"]: doc["_source"]
+            for doc in response.get("docs", [])
+            if doc.get("found")
+        }
 
-        # Hybrid query
-        search_query = {
-            "_source": ["page_id", "chunk_index", "title", "url", "content", "parent_content"],
-            "size": top_k,
-            "query": {
-                "hybrid": {
-                    "queries": [
-                        # Lexical search
-                        {
-                            "multi_match": {
-                                "query": query,
-                                "fields": ["title", "content"],
-                                "analyzer": "korean_analyzer",
-                                "minimum_should_match": "80%",
-                                "operator": "or",
-                            }
-                        },
-                        # Neural search
-                        {
-                            "knn": {
-                                "content_embedding": {
-                                    "vector": query_embedding,
-                                    "k": top_k,
-                                }
-                            }
-                        },
-                    ]
-                }
-            },
+    def get_page_hashes(self, page_ids: list[str]) -> dict[str, str]:
+        """Fetch the content hash of many pages without their markdown"""
+        if not page_ids:
+            return {}
+
+        response = self.client.mget(
+            index=self.parent_index_name,
+            body={"docs": [{"_id": page_id, "_source": ["content_hash"]} for page_id in page_ids]},
+        )
+        return {
+            doc["_id"]: doc["_source"].get("content_hash", "")
+            for doc in response.get("docs", [])
+            if doc.get("found")
         }
 
-        try:
-            response = self.client.search(
-                index=self.index_name,
-                body=search_query,
-            )
-        except Exception:
-            # Fallback: if hybrid not supported, use separate queries
-            response = self._fallback_search(query, query_embedding, top_k)
+    def get_chunk_ids(self, page_ids: list[str]) -> list[tuple[str, str]]:
+        """Return (page_id, doc_id) of all indexed chunks for many pages in one scan"""
+        query = {"query": {"terms": {"page_id": page_ids}}, "_source": ["page_id"]}
+        return [
+            (hit["_source"]["page_id"], hit["_id"])
+            for hit in helpers.scan(self.client, index=self.index_name, query=query)
+        ]
 
-        return self._parse_results(response)
+    def count_chunks(self) -> int:
+        """Number of indexed chunks, 0 if the index does not exist yet"""
+        if not self.client.indices.exists(index=self.index_name):
+            return 0
+        return self.client.count(index=self.index_name)["count"]
 
-    def _fallback_search(
-        self,
-        query: str,
-        query_embedding: list[float],
-        top_k: int,
-    ) -> dict:
-        """Fallback search without hybrid query"""
-        # KNN search only
-        search_query = {
-            "_source": ["page_id", "chunk_index", "title", "url", "content", "parent_content"],
-            "size": top_k,
-            "query": {
+    def get_meta(self) -> dict:
+        """Read the chunk index mapping metadata (generation, int8 scale)"""
+        response = self.client.indices.get_mapping(index=self.index_name)
+        mappings = next(iter(response.values()), {}).get("mappings", {})
+        meta = mappings.get("_meta", {})
+        # Re-read with the generation, so a switched index brings its own scale
+        self._byte_scale = meta.get("byte_scale", DEFAULT_BYTE_SCALE)
+        return meta
+
+    def put_meta(self, **values: Any) -> None:
+        """Update mapping metadata keys; OpenSearch replaces _meta as a whole"""
+        meta = {**self.get_meta(), **values}
+        self.client.indices.put_mapping(index=self.index_name, body={"_meta": meta})
+
+    def get_generation(self) -> int:
+        """Read the index generation counter stored in the mapping metadata"""
+        return self.get_meta().get("generation", 0)
+
+    def bump_generation(self) -> int:
+        """Increment the index generation so query caches are invalidated"""
+        generation = self.get_generation() + 1
+        self.put_meta(generation=generation)
+        return generation
+
+    def _hybrid_search(self, query: str, top_k: int) -> list[dict[str, Any]]:
+        """Run the hybrid search query against OpenSearch
+
+        Scores are fused server-side by the index's search pipeline when the
+        cluster supports it, otherwise client-side from a lexical and a
+        vector sub-query sent together in one multi-search.
+        """
+        # Get query embedding
+        query_embedding = self.embeddings.embed_query(query)
+        candidates = max(top_k, settings.hybrid_candidates)
+
+        sub_queries = [
+            # Lexical search
+            {
+                "multi_match": {
+                    "query": query,
+                    "fields": ["title", "content"],
+                    "analyzer": "korean_analyzer",
+                    "minimum_should_match": "80%",
+                    "operator": "or",
+                }
+            },
+            # Neural search
+            {
                 "knn": {
                     "content_embedding": {
-                        "vector": query_embedding,
-                        "k": top_k,
+                        "vector": self.encode_vector(query_embedding),
+                        "k": candidates,
                     }
                 }
             },
+        ]
+
+        with metrics.span("opensearch_search") as span:
+            if self._ensure_search_pipeline():
+                span["fusion"] = "server"
+                try:
+                    return self._pipeline_search(sub_queries, top_k)
+                except Exception as e:
+                    logger.warning(f"Hybrid search failed, fusing scores client-side: {e}")
+                    span["fallback"] = True
+
+            span["fusion"] = "client"
+            return self._fused_search(sub_queries, top_k, candidates)
+
+    def _search_pipeline_body(self) -> dict:
+        """Search pipeline fusing hybrid query scores as configured"""
+        weights = fusion_weights()
+        if settings.hybrid_fusion == "rrf":
+            combination = {
+                "technique": "rrf",
+                "rank_constant": settings.hybrid_rrf_rank_constant,
+            }
+            # Older clusters only take equal weights, which is the default
+            if weights[0] != weights[1]:
+                combination["parameters"] = {"weights": weights}
+            return {
+                "phase_results_processors": [
+                    {"score-ranker-processor": {"combination": combination}}
+                ]
+            }
+
+        if settings.hybrid_fusion not in FUSION_METHODS:
+            raise ValueError(f"Unknown fusion method: {settings.hybrid_fusion}")
+        return {
+            "phase_results_processors": [
+                {
+                    "normalization-processor": {
+                        "normalization": {"technique": settings.hybrid_fusion},
+                        "combination": {
+                            "technique": "arithmetic_mean",
+                            "parameters": {"weights": weights},
+                        },
+                    }
+                }
+            ]
+        }
+
+    def _ensure_search_pipeline(self) -> bool:
+        """Create or update the search pipeline once; False if the cluster lacks it"""
+        if self._server_fusion is None:
+            if not settings.hybrid_server_fusion:
+                self._server_fusion = False
+                return False
+            try:
+                self.client.search_pipeline.put(
+                    id=self.search_pipeline_name, body=self._search_pipeline_body()
+                )
+                self._server_fusion = True
+            except Exception as e:
+                logger.warning(f"Search pipeline unavailable, fusing scores client-side: {e}")
+                self._server_fusion = False
+        return self._server_fusion
+
+    def _pipeline_search(self, sub_queries: list[dict], top_k: int) -> list[dict[str, Any]]:
+        """Hybrid query fused by the search pipeline"""
+        search_query = {
+            "_source": list(SOURCE_FIELDS),
+            "size": top_k,
+            "query": {"hybrid": {"queries": sub_queries}},
         }
+        response = self.client.search(
+            index=self.index_name,
+            body=search_query,
+            search_pipeline=self.search_pipeline_name,
+        )
+        results = self._parse_results(response)
+
+        if settings.hybrid_fusion == "rrf":
+            # Rescale to [0, 1] like client-side fusion so SCORE_THRESHOLD keeps its meaning
+            weights = fusion_weights()
+            weight_sum = 1.0 if weights[0] != weights[1] else 2.0
+            scale = (settings.hybrid_rrf_rank_constant + 1) / weight_sum
+            for result in results:
+                result["_score"] *= scale
+        return results
+
+    def _fused_search(
+        self,
+        sub_queries: list[dict],
+        top_k: int,
+        candidates: int,
+    ) -> list[dict[str, Any]]:
+        """Run the sub-queries in one multi-search and fuse their scores here"""
+        body = []
+        for sub_query in sub_queries:
+            body.append({"index": self.index_name})
+            body.append({"_source": list(SOURCE_FIELDS), "size": candidates, "query": sub_query})
+        response = self.client.msearch(body=body)
+
+        sources: dict[str, dict] = {}
+        result_sets = []
+        for name, item in zip(("lexical", "vector"), response.get("responses", [])):
+            if "error" in item:
+                # Keep the other side rather than failing the whole search
+                logger.warning(f"Hybrid {name} sub-query failed: {item['error']}")
+                result_sets.append({})
+                continue
+            hits = item.get("hits", {}).get("hits", [])
+            result_sets.append({hit["_id"]: hit.get("_score") or 0.0 for hit in hits})
+            for hit in hits:
+                sources.setdefault(hit["_id"], hit["_source"])
+
+        if not any(result_sets):
+            if all("error" in item for item in response.get("responses", [])):
+                raise RuntimeError("All hybrid sub-queries failed")
+            return []
 
-        return self.client.search(index=self.index_name, body=search_query)
+        scores = fuse(result_sets)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [{**sources[doc_id], "_score": score} for doc_id, score in ranked]
 
     def _parse_results(self, response: dict) -> list[dict[str, Any]]:
         """Parse search response into list of results"""
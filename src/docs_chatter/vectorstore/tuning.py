@@ -0,0 +1,305 @@
+"""Choose the shard, replica and HNSW layout of the chunk index from measurements"""
+
+import logging
+import math
+import statistics
+import time
+from dataclasses import asdict, dataclass
+
+import numpy as np
+from opensearchpy import helpers
+
+from docs_chatter.config import settings
+from docs_chatter.vectorstore.opensearch import BULK_LOAD_SETTINGS, OpenSearchClient
+
+logger = logging.getLogger(__name__)
+
+# Stored bytes per vector dimension for each compression ("pq" is per sub-vector)
+VECTOR_BYTES = {"none": 4, "fp16": 2, "byte": 1}
+
+# Unmeasured queries run first so graphs are loaded into memory
+WARMUP_QUERIES = 10
+
+
+@dataclass
+class Trial:
+    """Recall and latency of one HNSW parameter combination"""
+
+    m: int
+    ef_construction: int
+    ef_search: int
+    recall: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+    build_seconds: float
+
+
+def sample_vectors(store: OpenSearchClient, size: int) -> np.ndarray:
+    """Read up to ``size`` stored chunk vectors from the live index"""
+    vectors = []
+    for hit in helpers.scan(
+        store.client,
+        index=store.index_name,
+        query={"query": {"match_all": {}}, "_source": ["content_embedding"]},
+    ):
+        vectors.append(hit["_source"]["content_embedding"])
+        if len(vectors) >= size:
+            break
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def as_stored(vector: np.ndarray) -> list[float] | list[int]:
+    """Sampled vector back in the index's stored representation"""
+    if settings.knn_compression == "byte":
+        return vector.astype(int).tolist()
+    return vector.tolist()
+
+
+def exact_neighbours(data: np.ndarray, queries: np.ndarray, k: int) -> list[set[int]]:
+    """Brute-force top-k row indexes of ``data`` for each query"""
+    scores = queries @ data.T
+    if settings.knn_space_type == "l2":
+        # Smaller distance is better: -|q - d|^2 without the constant |q|^2
+        scores = 2 * scores - (data**2).sum(axis=1)
+    k = min(k, len(data))
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return [set(row.tolist()) for row in top]
+
+
+def build_trial_index(
+    store: OpenSearchClient,
+    data: np.ndarray,
+    m: int,
+    ef_construction: int,
+) -> tuple[OpenSearchClient, float]:
+    """Load the sample into a temporary single-shard index with the given graph parameters
+
+    Returns:
+        Client for the temporary index and the seconds its build took
+    """
+    trial = store.version(f"{store.index_name}-tune-m{m}-efc{ef_construction}")
+    trial._layout = {
+        **store.layout(),
+        "shards": 1,
+        "replicas": 0,
+        "m": m,
+        "ef_construction": ef_construction,
+    }
+    # Sampled vectors are already encoded with the live index's int8 scale
+    body = trial.index_body(model_id=store.live_model_id(), byte_scale=store.byte_scale())
+    body["settings"]["index"].update(BULK_LOAD_SETTINGS)
+
+    client = store.client
+    client.indices.delete(index=trial.index_name, ignore_unavailable=True)
+    client.indices.create(index=trial.index_name, body=body)
+
+    start = time.monotonic()
+    try:
+        batch_size = settings.index_bulk_max_docs
+        for offset in range(0, len(data), batch_size):
+            actions = []
+            for row, vector in enumerate(data[offset : offset + batch_size], offset):
+                actions.append({"index": {"_index": trial.index_name, "_id": str(row)}})
+                actions.append({"content_embedding": as_stored(vector)})
+            response = trial.bulk(actions)
+            if response.get("errors"):
+                raise RuntimeError(f"Loading {trial.index_name} failed: {response['items'][:1]}")
+        client.indices.put_settings(
+            index=trial.index_name, body={"index": {"refresh_interval": None}}
+        )
+        client.indices.refresh(index=trial.index_name)
+        client.indices.forcemerge(
+            index=trial.index_name,
+            max_num_segments=1,
+            request_timeout=settings.index_force_merge_timeout,
+        )
+    except Exception:
+        client.indices.delete(index=trial.index_name, ignore_unavailable=True)
+        raise
+    return trial, time.monotonic() - start
+
+
+def measure(
+    trial: OpenSearchClient,
+    queries: np.ndarray,
+    truth: list[set[int]],
+    k: int,
+) -> tuple[float, list[float]]:
+    """Run k-NN queries against a trial index
+
+    Returns:
+        Recall@k against the exact neighbours and per-query latencies in ms
+    """
+
+    def search(vector: np.ndarray) -> set[int]:
+        response = trial.client.search(
+            index=trial.index_name,
+            body={
+                "size": k,
+                "_source": False,
+                "query": {"knn": {"content_embedding": {"vector": as_stored(vector), "k": k}}},
+            },
+        )
+        return {int(hit["_id"]) for hit in response["hits"]["hits"]}
+
+    for vector in queries[:WARMUP_QUERIES]:
+        search(vector)
+
+    found = 0
+    latencies = []
+    for vector, expected in zip(queries, truth):
+        start = time.perf_counter()
+        hits = search(vector)
+        latencies.append((time.perf_counter() - start) * 1000)
+        found += len(hits & expected)
+    return found / max(sum(len(expected) for expected in truth), 1), latencies
+
+
+def run_trials(
+    store: OpenSearchClient,
+    data: np.ndarray,
+    queries: np.ndarray,
+    k: int,
+    m_values: list[int],
+    ef_construction_values: list[int],
+    ef_search_values: list[int],
+) -> list[Trial]:
+    """Measure every parameter combination, one temporary index per graph build"""
+    truth = exact_neighbours(data, queries, k)
+    trials = []
+    for m in m_values:
+        for ef_construction in ef_construction_values:
+            logger.info(f"Building trial index m={m} ef_construction={ef_construction}")
+            trial, build_seconds = build_trial_index(store, data, m, ef_construction)
+            try:
+                # ef_search is dynamic, so one build serves all its values
+                for ef_search in ef_search_values:
+                    store.client.indices.put_settings(
+                        index=trial.index_name,
+                        body={"index": {"knn.algo_param.ef_search": ef_search}},
+                    )
+                    recall, latencies = measure(trial, queries, truth, k)
+                    result = Trial(
+                        m=m,
+                        ef_construction=ef_construction,
+                        ef_search=ef_search,
+                        recall=recall,
+                        latency_p50_ms=statistics.median(latencies),
+                        latency_p95_ms=float(np.percentile(latencies, 95)),
+                        build_seconds=build_seconds,
+                    )
+                    logger.info(
+                        f"m={m} ef_construction={ef_construction} ef_search={ef_search}: "
+                        f"recall@{k}={recall:.3f} p95={result.latency_p95_ms:.1f}ms"
+                    )
+                    trials.append(result)
+            finally:
+                store.client.indices.delete(index=trial.index_name)
+    return trials
+
+
+def choose(trials: list[Trial], target_recall: float) -> Trial:
+    """Fastest combination reaching the target recall, else the most accurate one
+
+    Ties prefer a smaller graph (m), which needs less memory.
+    """
+    passing = [trial for trial in trials if trial.recall >= target_recall]
+    if passing:
+        return min(passing, key=lambda t: (t.latency_p95_ms, t.m, t.ef_construction))
+    return max(trials, key=lambda t: (t.recall, -t.latency_p95_ms, -t.m))
+
+
+def size_cluster(store: OpenSearchClient, m: int, shard_size_gb: float) -> dict:
+    """Estimate shards, replicas and k-NN memory for the live index
+
+    Shards keep each primary under ``shard_size_gb``; every data node beyond
+    the first holds a replica (up to 2) so all nodes serve searches.
+    """
+    client = store.client
+    chunks = store.count_chunks()
+    stats = client.indices.stats(index=store.index_name, metric="store")
+    store_bytes = stats["_all"]["primaries"]["store"]["size_in_bytes"]
+    data_nodes = client.cluster.health()["number_of_data_nodes"]
+
+    if settings.knn_compression == "pq":
+        vector_bytes = settings.knn_pq_m
+    else:
+        vector_bytes = VECTOR_BYTES[settings.knn_compression] * store.embeddings.dimension
+    # faiss HNSW: vectors plus 2m 4-byte links per vector, ~10% overhead
+    graph_bytes = 1.1 * (vector_bytes + 8 * m) * chunks
+
+    shards = max(1, math.ceil(store_bytes / (shard_size_gb * 1024**3)))
+    replicas = max(0, min(data_nodes - 1, 2))
+    return {
+        "chunks": chunks,
+        "store_size_gb": round(store_bytes / 1024**3, 3),
+        "data_nodes": data_nodes,
+        "shards": shards,
+        "replicas": replicas,
+        "knn_memory_gb": round(graph_bytes * (1 + replicas) / 1024**3, 3),
+        "knn_memory_per_node_gb": round(graph_bytes * (1 + replicas) / data_nodes / 1024**3, 3),
+    }
+
+
+def tune_index(
+    store: OpenSearchClient | None = None,
+    sample: int = 10000,
+    queries: int = 200,
+    k: int = 10,
+    m_values: list[int] | None = None,
+    ef_construction_values: list[int] | None = None,
+    ef_search_values: list[int] | None = None,
+    target_recall: float = 0.95,
+    shard_size_gb: float = 30.0,
+) -> dict:
+    """Measure recall vs latency on a sample of the index and pick its layout
+
+    Sampled vectors are split into documents and held-out queries; exact
+    neighbours come from brute force. Each (m, ef_construction) pair is built
+    into a temporary index, deleted afterwards, and searched with every
+    ef_search value.
+
+    Returns:
+        Report with the chosen layout, the sizing estimate and all trials
+    """
+    store = store or OpenSearchClient()
+    vectors = sample_vectors(store, sample + queries)
+    if len(vectors) <= queries:
+        raise RuntimeError(
+            f"{store.index_name} has {len(vectors)} chunks, more than {queries} are needed"
+        )
+
+    # Held-out queries: neighbours of stored chunks, like real questions
+    rng = np.random.default_rng(0)
+    order = rng.permutation(len(vectors))
+    query_vectors, data = vectors[order[:queries]], vectors[order[queries:]]
+
+    trials = run_trials(
+        store,
+        data,
+        query_vectors,
+        k,
+        m_values or [settings.knn_m],
+        ef_construction_values or [settings.knn_ef_construction],
+        ef_search_values or [settings.knn_ef_search],
+    )
+    best = choose(trials, target_recall)
+    sizing = size_cluster(store, best.m, shard_size_gb)
+
+    return {
+        "index": store.index_name,
+        "sample": len(data),
+        "queries": len(query_vectors),
+        "k": k,
+        "target_recall": target_recall,
+        "target_met": best.recall >= target_recall,
+        "layout": {
+            "shards": sizing["shards"],
+            "replicas": sizing["replicas"],
+            "m": best.m,
+            "ef_construction": best.ef_construction,
+            "ef_search": best.ef_search,
+        },
+        "sizing": sizing,
+        "trials": [asdict(trial) for trial in trials],
+    }